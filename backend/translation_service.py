@@ -6,6 +6,7 @@ Translation service that integrates the optimized translator model.
 import os
 import sys
 import time
+import threading
 import torch
 from pathlib import Path
 
@@ -13,20 +14,37 @@ from pathlib import Path
 TRANSLATOR_DIR = Path(__file__).parent.parent / "translator"
 sys.path.append(str(TRANSLATOR_DIR))
 
+from services.local_model import BatchedGenerator
+
 class TranslationService:
     def __init__(self):
         self.model = None
         self.tokenizer = None
+        self.generator = None
         self.model_loaded = False
+        # Concurrent first requests wait for one load instead of each starting their own
+        self._load_lock = threading.Lock()
+        self._warmup_thread = None
+        self.load_stage = None
+        self.load_error = None
         
     def load_model(self):
         """Load the translation model if not already loaded."""
         if self.model_loaded:
             return
-            
+
+        with self._load_lock:
+            # Another caller may have finished loading while this one waited
+            if self.model_loaded:
+                return
+            self._load_model()
+
+    def _load_model(self):
         try:
             print("Loading translation model...")
             from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+            self.load_stage = "loading tokenizer"
+            self.load_error = None
             
             model_name = "JungZoona/T3Q-qwen2.5-14b-v1.0-e3"
             
@@ -42,6 +60,7 @@ class TranslationService:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
             
             # Load model with aggressive optimizations
+            self.load_stage = "loading weights"
             self.model = AutoModelForCausalLM.from_pretrained(
                 model_name,
                 quantization_config=bnb_config,
@@ -51,12 +70,55 @@ class TranslationService:
                 low_cpu_mem_usage=True,
             )
             
+            # Concurrent requests are grouped into padded batches
+            # Each request gets a budget sized from its input; 1024 only caps very long texts
+            self.generator = BatchedGenerator(self.model, self.tokenizer, max_new_tokens=1024)
+            
             self.model_loaded = True
             print("Translation model loaded successfully!")
             
         except Exception as e:
             print(f"Error loading model: {str(e)}")
+            self.load_error = str(e)
             raise e
+        finally:
+            self.load_stage = None
+
+    def start_warmup(self):
+        """Load the model on a background thread instead of on the first request."""
+        with self._load_lock:
+            if self._warmup_thread is not None or self.model_loaded:
+                return False
+            self._warmup_thread = threading.Thread(target=self._warmup, name="translation-warmup", daemon=True)
+            self._warmup_thread.start()
+            return True
+
+    def _warmup(self):
+        try:
+            self.load_model()
+        except Exception:
+            pass  # Recorded in load_error; the next request tries again
+
+    def get_readiness(self):
+        """Get whether requests can be served yet, with load progress."""
+        if self.model_loaded:
+            state = 'ready'
+        elif self.load_stage is not None:
+            state = 'loading'
+        elif self.load_error is not None:
+            state = 'failed'
+        else:
+            state = 'pending'
+        return {
+            'ready': self.model_loaded,
+            'warmup': {
+                'started': self._warmup_thread is not None,
+                'finished': self._warmup_thread is not None and not self._warmup_thread.is_alive(),
+                'backends': {
+                    'legacy': {'state': state, 'stage': self.load_stage, 'error': self.load_error},
+                },
+            },
+        }
     
     def translate(self, text, target_language):
         """
@@ -73,45 +135,8 @@ class TranslationService:
             self.load_model()
         
         try:
-            # Create prompt with the specific format you requested
-            prompt = f'Only output the translated words. Translate "{text}" to {target_language}'
-            
-            messages = [{"role": "user", "content": prompt}]
-            
-            # Apply chat template
-            inputs = self.tokenizer.apply_chat_template(
-                messages,
-                add_generation_prompt=True,
-                tokenize=True,
-                return_dict=True,
-                return_tensors="pt",
-            ).to(self.model.device)
-            
-            # Generate with optimized settings
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=50,  # Slightly more tokens for longer sentences
-                    do_sample=False,
-                    temperature=0.1,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    use_cache=True,
-                )
-            
-            # Decode only the new tokens
-            generated_text = self.tokenizer.decode(
-                outputs[0][inputs["input_ids"].shape[-1]:], 
-                skip_special_tokens=True
-            )
-            
-            # Clean up the output - only return the translated text
-            translated_text = generated_text.strip()
-            
-            # Remove any extra explanations or formatting
-            if translated_text.startswith('"') and translated_text.endswith('"'):
-                translated_text = translated_text[1:-1]
-            
-            return translated_text
+            # Shares a generate() call with requests arriving in the same batching window
+            return self.generator.translate(text, target_language)
             
         except Exception as e:
             print(f"Translation error: {str(e)}")
@@ -119,3 +144,14 @@ class TranslationService:
 
 # Global instance
 translation_service = TranslationService()
+
+
+def start_warmup():
+    """
+    Start loading the model in the background (server start-up).
+
+    TRANSLATION_WARMUP=0 leaves the model to load on the first request.
+    """
+    if os.environ.get('TRANSLATION_WARMUP', '1') == '0':
+        return False
+    return translation_service.start_warmup()
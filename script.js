@@ -470,7 +470,8 @@ async function performTranslation() {
                     },
             body: JSON.stringify({
                 text: text,
-                target_language: targetLanguage.options[targetLanguage.selectedIndex].text
+                target_language: targetLanguage.options[targetLanguage.selectedIndex].text,
+                stream: true
             })
                 });
 
@@ -480,14 +481,24 @@ async function performTranslation() {
                     throw new Error(`HTTP error! status: ${response.status}`);
                 }
 
-        const data = await response.json();
-                console.log('Response data:', data);
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.includes('text/event-stream') && response.body) {
+            // Show partial output as soon as the first tokens arrive
+            outputText.value = '';
+            await readTranslationStream(response, (delta) => {
+                outputText.value += delta;
+                outputText.scrollTop = outputText.scrollHeight;
+            });
+        } else {
+            const data = await response.json();
+            console.log('Response data:', data);
 
-        if (data.error) {
-            throw new Error(data.error);
-        }
+            if (data.error) {
+                throw new Error(data.error);
+            }
 
-        outputText.value = data.translated_text;
+            outputText.value = data.translated_text;
+        }
         outputText.classList.add('success');
 
         // Animate the output
@@ -512,6 +523,47 @@ async function performTranslation() {
     }
 }
 
+// Read a server-sent events translation stream, calling onDelta for each piece
+async function readTranslationStream(response, onDelta) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventType = 'message';
+            let payload = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event:')) {
+                    eventType = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    payload += line.slice(5).trim();
+                }
+            }
+
+            const data = payload ? JSON.parse(payload) : {};
+            if (eventType === 'error') {
+                throw new Error(data.error || 'Translation failed');
+            }
+            if (eventType === 'done') {
+                return;
+            }
+            if (data.delta) {
+                onDelta(data.delta);
+            }
+        }
+    }
+}
+
 // Helper function to get CSRF token
 function getCsrfToken() {
     const cookieValue = document.cookie
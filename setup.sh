@@ -66,7 +66,7 @@ print_green "✅ Google Gemini API installed"
 # Optional: Install local transformer dependencies (commented out by default)
 print_yellow "🤖 Local Transformer dependencies (optional):"
 echo "   To install local AI model support, run:"
-echo "   pip install torch==2.1.0 transformers==4.35.0 accelerate==0.24.0 bitsandbytes==0.41.2"
+echo "   pip install torch==2.1.0 transformers==4.44.2 accelerate==0.24.0 bitsandbytes==0.41.2"
 echo ""
 
 # Install Tesseract OCR
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the CPU translation backend.
+Compares fp32 and int8 dynamic quantization across thread counts, in
+sentences per second through the batching generator.
+
+By default a tiny random-weight model is used so the benchmark runs
+anywhere; pass --model (e.g. Qwen/Qwen2.5-0.5B-Instruct) for real numbers.
+
+Usage:
+    python3 translator/benchmark_cpu_backend.py --sentences 64 --threads 1,4
+    python3 translator/benchmark_cpu_backend.py --model Qwen/Qwen2.5-0.5B-Instruct --max-new-tokens 48
+"""
+
+import argparse
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_model_bench import DEFAULT_TOKENIZER, build_tiny_model, make_sentences
+from services.local_model import BatchedGenerator, load_cpu_model, quantize_for_cpu
+
+
+def model_megabytes(model):
+    """Serialized size of the model's weights."""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+
+def sentences_per_second(model, tokenizer, sentences, batch_size, max_new_tokens, target_language):
+    generator = BatchedGenerator(model, tokenizer, max_new_tokens, max_batch_size=batch_size, max_wait=0.005)
+    generator.translate(sentences[0], target_language)  # warm-up
+    start = time.perf_counter()
+    # Enough concurrent callers to keep every batch full
+    with ThreadPoolExecutor(max_workers=batch_size * 2) as pool:
+        list(pool.map(lambda sentence: generator.translate(sentence, target_language), sentences))
+    elapsed = time.perf_counter() - start
+    generator.close()
+    return len(sentences) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU backend throughput benchmark")
+    parser.add_argument('--model', default=None, help="model to load (default: tiny random-weight model)")
+    parser.add_argument('--tokenizer', default=DEFAULT_TOKENIZER, help="shapes the tiny model")
+    parser.add_argument('--sentences', type=int, default=64)
+    parser.add_argument('--threads', default="1,4", help="torch thread counts to compare")
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--max-new-tokens', type=int, default=24)
+    parser.add_argument('--target-language', default="French")
+    args = parser.parse_args()
+
+    import torch
+
+    if args.model:
+        fp32_model, tokenizer = load_cpu_model(args.model, quantize=False)
+    else:
+        fp32_model, tokenizer = build_tiny_model(args.tokenizer, hidden_size=256, layers=4, heads=8)
+    int8_model = quantize_for_cpu(fp32_model)  # Quantizes a copy
+    sentences = make_sentences(args.sentences, max_words=25)
+
+    print(f"Model: {args.model or 'tiny random-weight'}  fp32 {model_megabytes(fp32_model):.0f} MiB, "
+          f"int8 {model_megabytes(int8_model):.0f} MiB")
+    print(f"{args.sentences} sentences, batch size {args.batch_size}, {args.max_new_tokens} new tokens max\n")
+    print(f"{'threads':>7} {'fp32 sent/s':>12} {'int8 sent/s':>12} {'speed-up':>9}")
+
+    for threads in [int(count) for count in args.threads.split(',')]:
+        torch.set_num_threads(threads)
+        rates = [
+            sentences_per_second(model, tokenizer, sentences, args.batch_size, args.max_new_tokens, args.target_language)
+            for model in (fp32_model, int8_model)
+        ]
+        print(f"{threads:>7} {rates[0]:>12.2f} {rates[1]:>12.2f} {rates[1] / rates[0]:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for dynamic batching of local-model requests.
+Concurrent clients send translations to a BatchedGenerator backed by a tiny
+random-weight model on CPU; throughput and latency are compared across
+maximum batch sizes (1 = one prompt per generate() call).
+
+Usage:
+    python3 translator/benchmark_dynamic_batching.py --clients 16 --requests 128 --batch-sizes 1,4,8,16
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_model_bench import DEFAULT_TOKENIZER, build_tiny_model, make_sentences, percentile
+from services.local_model import BatchedGenerator
+
+
+def run_clients(generator, sentences, clients, target_language):
+    """Send every sentence from `clients` threads; returns (elapsed seconds, per-request latencies)."""
+    work = queue.Queue()
+    for sentence in sentences:
+        work.put(sentence)
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            try:
+                sentence = work.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            generator.translate(sentence, target_language)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dynamic batching benchmark")
+    parser.add_argument('--tokenizer', default=DEFAULT_TOKENIZER, help="tokenizer/config to shape the tiny model")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent callers")
+    parser.add_argument('--requests', type=int, default=128, help="translations per configuration")
+    parser.add_argument('--batch-sizes', default="1,4,8,16", help="maximum batch sizes to compare")
+    parser.add_argument('--max-wait-ms', type=float, default=10, help="batching window")
+    parser.add_argument('--max-new-tokens', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model, tokenizer = build_tiny_model(args.tokenizer)
+    sentences = make_sentences(args.requests)
+    print(f"Tiny model: {sum(p.numel() for p in model.parameters()) / 1e6:.1f}M parameters, "
+          f"{torch.get_num_threads()} threads, {args.clients} clients, {args.requests} requests")
+
+    # Warm-up so the first configuration does not pay one-off allocation costs
+    warm = BatchedGenerator(model, tokenizer, args.max_new_tokens, max_batch_size=4, max_wait=0)
+    warm.translate(sentences[0], "French")
+    warm.close()
+
+    print(f"\n{'batch':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>11} {'queue wait ms':>14}")
+    baseline = None
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        generator = BatchedGenerator(
+            model, tokenizer, args.max_new_tokens,
+            max_batch_size=batch_size, max_wait=args.max_wait_ms / 1000,
+        )
+        elapsed, latencies = run_clients(generator, sentences, args.clients, "French")
+        stats = generator.get_stats()
+        generator.close()
+
+        throughput = len(latencies) / elapsed
+        baseline = baseline or throughput
+        print(f"{batch_size:>5} {throughput:>8.1f} {percentile(latencies, 0.5) * 1000:>8.0f} "
+              f"{percentile(latencies, 0.95) * 1000:>8.0f} {stats['mean_batch_size']:>11.1f} "
+              f"{stats['mean_queue_wait'] * 1000:>14.1f}   ({throughput / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the fuzzy translation-memory lookup.
+Fills a translation cache with synthetic clauses, then measures exact and
+near-duplicate lookup latency, recall and the memory/disk footprint.
+
+Usage:
+    python3 translator/benchmark_fuzzy_memory.py --size 1000000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import resource
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.fuzzy_index import jaccard, shingles
+from services.translation_cache import TranslationCache, normalize_text
+
+MODEL = "benchmark-model"
+PROMPT_VERSION = "1"
+LANGUAGE = "French"
+
+
+def make_vocabulary(rng, size=5000):
+    """Random lowercase pseudo-words."""
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_clause(rng, vocabulary):
+    """A contract-like clause of 20-40 words (~150-300 characters)."""
+    words = rng.choices(vocabulary, k=rng.randint(20, 40))
+    return " ".join(words).capitalize() + "."
+
+
+def near_duplicate(rng, clause):
+    """Change one word for a name and insert a date, as in a re-used contract clause."""
+    words = clause.split()
+    words[rng.randrange(len(words))] = rng.choice(["Alice", "Bob", "Carol", "Dmitri", "Eun-ji"])
+    words.insert(rng.randrange(len(words)), f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/20{rng.randint(10, 30)}")
+    return " ".join(words)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(name, timings):
+    micros = [t * 1e6 for t in timings]
+    print(f"  {name:<22} p50 {percentile(micros, 0.5):8.1f} µs   p95 {percentile(micros, 0.95):8.1f} µs   "
+          f"p99 {percentile(micros, 0.99):8.1f} µs")
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy translation-memory benchmark")
+    parser.add_argument('--size', type=int, default=1000000, help="stored segments")
+    parser.add_argument('--queries', type=int, default=2000, help="lookups per query type")
+    parser.add_argument('--threshold', type=float, default=0.8, help="minimum similarity")
+    parser.add_argument('--batch', type=int, default=5000, help="segments per insert transaction")
+    parser.add_argument('--db', default=None, help="SQLite file (default: temporary file)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="fuzzy_tm_"), "tm.sqlite3")
+    cache = TranslationCache(db_path, max_entries=args.size * 2, memory_entries=1000, fuzzy=True)
+    cache.clear()
+
+    print(f"Filling {args.size} segments into {db_path}...")
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    sample = []
+    stored = 0
+    while stored < args.size:
+        count = min(args.batch, args.size - stored)
+        clauses = [make_clause(rng, vocabulary) for _ in range(count)]
+        cache.put_many([(c, f"[{LANGUAGE}] {c}") for c in clauses], LANGUAGE, MODEL, PROMPT_VERSION)
+        sample.extend(rng.sample(clauses, min(len(clauses), max(1, args.queries * args.batch // args.size + 1))))
+        stored += count
+        if stored % (args.batch * 20) == 0:
+            print(f"  {stored} stored ({time.perf_counter() - start:.0f}s)")
+    build_time = time.perf_counter() - start
+    print(f"Built in {build_time:.1f}s ({build_time / args.size * 1e6:.0f} µs per segment)")
+
+    sample = rng.sample(sample, min(args.queries, len(sample)))
+    exact_timings, fuzzy_timings, miss_timings = [], [], []
+    found = 0
+    eligible = 0
+    eligible_found = 0
+
+    for clause in sample:
+        t0 = time.perf_counter()
+        cache.get(clause, LANGUAGE, MODEL, PROMPT_VERSION)
+        exact_timings.append(time.perf_counter() - t0)
+
+    for clause in sample:
+        query = near_duplicate(rng, clause)
+        t0 = time.perf_counter()
+        match = cache.find_similar(query, LANGUAGE, MODEL, PROMPT_VERSION, args.threshold)
+        fuzzy_timings.append(time.perf_counter() - t0)
+        hit = bool(match and match.source == clause)
+        found += hit
+        # LSH recall, counting only queries that really are above the threshold
+        if jaccard(shingles(normalize_text(query)), shingles(normalize_text(clause))) >= args.threshold:
+            eligible += 1
+            eligible_found += hit
+
+    false_hits = 0
+    for _ in sample:
+        query = make_clause(rng, vocabulary)
+        t0 = time.perf_counter()
+        if cache.find_similar(query, LANGUAGE, MODEL, PROMPT_VERSION, args.threshold):
+            false_hits += 1
+        miss_timings.append(time.perf_counter() - t0)
+
+    db_bytes = sum(os.path.getsize(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))
+    conn = cache._connect()
+    bands = conn.execute("SELECT COUNT(*) FROM fuzzy_bands").fetchone()[0]
+
+    print(f"\nLookups over {args.size} stored segments ({len(sample)} queries each):")
+    report("exact (LRU cold)", exact_timings)
+    report("fuzzy near-duplicate", fuzzy_timings)
+    report("fuzzy unrelated", miss_timings)
+    print(f"\nNear-duplicates found: {found / len(sample):.1%}")
+    if eligible:
+        print(f"Recall among pairs with similarity >= {args.threshold}: {eligible_found / eligible:.1%} ({eligible} pairs)")
+    print(f"Unrelated texts matched: {false_hits}")
+    print("\nFootprint:")
+    print(f"  SQLite file (with WAL): {db_bytes / 2**20:.1f} MiB ({db_bytes / args.size:.0f} bytes per segment)")
+    print(f"  LSH band rows:          {bands}")
+    print(f"  Process max RSS:        {max_rss_mb():.1f} MiB (before fill: {rss_before:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
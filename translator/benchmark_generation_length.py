@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark for adaptive generation length.
+Compares the tokens a translation actually needs (its reference translation)
+with the decode budget each strategy allows, over a mixed-length corpus:
+
+    fixed-50     the old hardcoded max_new_tokens=50
+    fixed-8192   the legacy limit
+    adaptive     generation_budget() from input length and language pair
+
+Without --model only the tokenizer is loaded: a model that keeps talking
+after its answer decodes up to its budget, so "worst-case decoded" is what
+a fixed limit costs without the end-of-answer stop. With --model the
+strategies are run for real and the generated tokens are counted.
+
+Usage:
+    python3 translator/benchmark_generation_length.py
+    python3 translator/benchmark_generation_length.py --model Qwen/Qwen2.5-0.5B-Instruct
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_model_bench import DEFAULT_TOKENIZER
+from services.language_id import detect_language
+from services.local_model.generation import generation_budget
+
+# English source with reference translations, from a one-word label to a long paragraph
+CORPUS = [
+    ("Invoice", {
+        'French': "Facture", 'German': "Rechnung", 'Japanese': "請求書"}),
+    ("Table of contents", {
+        'French': "Table des matières", 'German': "Inhaltsverzeichnis", 'Japanese': "目次"}),
+    ("Please sign and return one copy.", {
+        'French': "Veuillez signer et renvoyer un exemplaire.",
+        'German': "Bitte unterschreiben Sie ein Exemplar und senden Sie es zurück.",
+        'Japanese': "1部に署名してご返送ください。"}),
+    ("All payments must be made within thirty days of receiving the invoice.", {
+        'French': "Tous les paiements doivent être effectués dans les trente jours suivant la réception de la facture.",
+        'German': "Alle Zahlungen müssen innerhalb von dreißig Tagen nach Erhalt der Rechnung erfolgen.",
+        'Japanese': "すべての支払いは、請求書の受領から30日以内に行う必要があります。"}),
+    ("The company is not responsible for any damage caused by the improper use of the product, "
+     "including damage to third-party equipment.", {
+        'French': "La société n'est pas responsable des dommages causés par une utilisation incorrecte du produit, "
+                  "y compris les dommages causés aux équipements de tiers.",
+        'German': "Das Unternehmen haftet nicht für Schäden, die durch unsachgemäße Verwendung des Produkts "
+                  "entstehen, einschließlich Schäden an Geräten Dritter.",
+        'Japanese': "当社は、第三者の機器への損害を含め、製品の不適切な使用によって生じたいかなる損害についても責任を負いません。"}),
+    ("This report describes the results of the study and the main recommendations for the coming year. "
+     "It was prepared by the research team with the support of our regional partners, who collected the data "
+     "in twelve countries over a period of eighteen months.", {
+        'French': "Ce rapport décrit les résultats de l'étude et les principales recommandations pour l'année à venir. "
+                  "Il a été préparé par l'équipe de recherche avec le soutien de nos partenaires régionaux, qui ont "
+                  "collecté les données dans douze pays sur une période de dix-huit mois.",
+        'German': "Dieser Bericht beschreibt die Ergebnisse der Studie und die wichtigsten Empfehlungen für das "
+                  "kommende Jahr. Er wurde vom Forschungsteam mit Unterstützung unserer regionalen Partner erstellt, "
+                  "die die Daten über einen Zeitraum von achtzehn Monaten in zwölf Ländern erhoben haben.",
+        'Japanese': "本報告書では、調査の結果と来年に向けた主な提言について説明します。本報告書は、18か月にわたり12か国で"
+                    "データを収集した地域パートナーの協力を得て、研究チームが作成しました。"}),
+    ("The parties agree that this contract shall remain in force for a period of two years from the date of "
+     "signature. Either party may terminate the contract by giving three months' written notice to the other "
+     "party. In the event of termination, all outstanding invoices shall become due immediately, and each party "
+     "shall return any confidential information received from the other party within fourteen days. The "
+     "provisions concerning confidentiality, liability and governing law shall survive the termination of this "
+     "contract.", {
+        'French': "Les parties conviennent que le présent contrat restera en vigueur pendant une période de deux ans "
+                  "à compter de la date de signature. Chaque partie peut résilier le contrat moyennant un préavis "
+                  "écrit de trois mois adressé à l'autre partie. En cas de résiliation, toutes les factures impayées "
+                  "deviennent immédiatement exigibles et chaque partie restitue, dans un délai de quatorze jours, "
+                  "toute information confidentielle reçue de l'autre partie. Les dispositions relatives à la "
+                  "confidentialité, à la responsabilité et au droit applicable survivent à la résiliation du présent "
+                  "contrat.",
+        'German': "Die Parteien vereinbaren, dass dieser Vertrag für einen Zeitraum von zwei Jahren ab dem Datum der "
+                  "Unterzeichnung in Kraft bleibt. Jede Partei kann den Vertrag mit einer Frist von drei Monaten "
+                  "schriftlich gegenüber der anderen Partei kündigen. Im Falle einer Kündigung werden alle offenen "
+                  "Rechnungen sofort fällig, und jede Partei gibt innerhalb von vierzehn Tagen alle vertraulichen "
+                  "Informationen zurück, die sie von der anderen Partei erhalten hat. Die Bestimmungen über "
+                  "Vertraulichkeit, Haftung und anwendbares Recht gelten über die Beendigung dieses Vertrags hinaus.",
+        'Japanese': "両当事者は、本契約が署名日から2年間有効であることに合意する。いずれの当事者も、相手方に3か月前までに"
+                    "書面で通知することにより、本契約を解除することができる。解除の場合、未払いの請求書はすべて直ちに"
+                    "支払期日を迎え、各当事者は相手方から受領した機密情報を14日以内に返還するものとする。機密保持、責任"
+                    "および準拠法に関する規定は、本契約の終了後も存続する。"}),
+]
+STRATEGIES = ('fixed-50', 'fixed-8192', 'adaptive')
+
+
+def budget_for(strategy, tokenizer, text, target_language, cap):
+    if strategy == 'fixed-50':
+        return 50
+    if strategy == 'fixed-8192':
+        return 8192
+    input_tokens = len(tokenizer(text, add_special_tokens=False)["input_ids"])
+    return generation_budget(input_tokens, detect_language(text)[0], target_language, cap)
+
+
+def report_budgets(tokenizer, cap):
+    """Budgets against reference lengths; no model needed."""
+    totals = {strategy: {'decoded': 0, 'truncated': 0} for strategy in STRATEGIES}
+    needed_total = 0
+    ratios = []
+    rows = 0
+    for text, references in CORPUS:
+        for target_language, reference in references.items():
+            needed = len(tokenizer(reference, add_special_tokens=False)["input_ids"]) + 1  # + end of sequence
+            needed_total += needed
+            rows += 1
+            for strategy in STRATEGIES:
+                budget = budget_for(strategy, tokenizer, text, target_language, cap)
+                totals[strategy]['decoded'] += budget
+                totals[strategy]['truncated'] += needed > budget
+                if strategy == 'adaptive':
+                    ratios.append(budget / needed)
+
+    print(f"{rows} translations, {needed_total} tokens needed in total\n")
+    print(f"{'strategy':<11} {'worst-case decoded':>19} {'x needed':>9} {'truncated':>10}")
+    for strategy in STRATEGIES:
+        decoded = totals[strategy]['decoded']
+        print(f"{strategy:<11} {decoded:>19} {decoded / needed_total:>9.1f} {totals[strategy]['truncated']:>10}")
+    print(f"\nAdaptive budget / needed: min {min(ratios):.2f}, max {max(ratios):.2f}")
+    print("With the end-of-answer stop, decoding ends near the needed length whatever the budget; "
+          "the budget bounds what a rambling model can cost.")
+
+
+def report_generation(model_name, cap):
+    """Run each strategy through the model and count what was generated."""
+    from services.local_model import generate_batch, load_cpu_model, prepare_tokenizer
+
+    model, tokenizer = load_cpu_model(model_name)
+    prepare_tokenizer(tokenizer)
+    requests = [(text, language) for text, references in CORPUS for language in references]
+    needed = [
+        len(tokenizer(reference, add_special_tokens=False)["input_ids"]) + 1
+        for _, references in CORPUS for reference in references.values()
+    ]
+
+    print(f"\n{model_name}: {len(requests)} translations, {sum(needed)} tokens in the references\n")
+    print(f"{'strategy':<11} {'generated':>10} {'truncated':>10} {'seconds':>8}")
+    for strategy in STRATEGIES:
+        budgets = [budget_for(strategy, tokenizer, text, language, cap) for text, language in requests]
+        start = time.perf_counter()
+        results = [generate_batch(model, tokenizer, [request], cap, [budget])[0]
+                   for request, budget in zip(requests, budgets)]
+        elapsed = time.perf_counter() - start
+        print(f"{strategy:<11} {sum(r.tokens for r in results):>10} {sum(r.truncated for r in results):>10} "
+              f"{elapsed:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive generation length benchmark")
+    parser.add_argument('--tokenizer', default=DEFAULT_TOKENIZER)
+    parser.add_argument('--model', default=None, help="also run generation with this model")
+    parser.add_argument('--cap', type=int, default=8192, help="max_new_tokens upper bound")
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer, trust_remote_code=True)
+    report_budgets(tokenizer, args.cap)
+    if args.model:
+        report_generation(args.model, args.cap)
+
+
+if __name__ == "__main__":
+    main()
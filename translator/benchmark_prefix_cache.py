@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Prefill benchmark for the instruction prefix cache.
+Times prompt prefill (generation of a single token) with and without the
+cached per-language prefix, across batch sizes, and checks that greedy
+outputs are the same either way.
+
+By default a tiny random-weight model is used so the benchmark runs
+anywhere; pass --model (e.g. Qwen/Qwen2.5-0.5B-Instruct) for real numbers.
+
+Usage:
+    python3 translator/benchmark_prefix_cache.py --sentences 64 --batch-sizes 1,8
+    python3 translator/benchmark_prefix_cache.py --model Qwen/Qwen2.5-0.5B-Instruct --threads 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_model_bench import DEFAULT_TOKENIZER, build_tiny_model, make_sentences
+from services.local_model import PrefixCache, build_prompt, generate_batch, load_cpu_model, prepare_tokenizer
+
+
+def prefill_seconds(model, tokenizer, sentences, batch_size, target_language, prefix_cache):
+    """Total time to prefill every sentence, batch by batch."""
+    start = time.perf_counter()
+    for i in range(0, len(sentences), batch_size):
+        batch = [(sentence, target_language) for sentence in sentences[i:i + batch_size]]
+        generate_batch(model, tokenizer, batch, 1, budgets=[1] * len(batch), prefix_cache=prefix_cache)
+    return time.perf_counter() - start
+
+
+def matching_outputs(model, tokenizer, sentences, target_language, prefix_cache, max_new_tokens):
+    """Sentences whose greedy translation is the same with and without the cache."""
+    requests = [(sentence, target_language) for sentence in sentences]
+    budgets = [max_new_tokens] * len(requests)
+    plain = generate_batch(model, tokenizer, requests, max_new_tokens, budgets)
+    cached = generate_batch(model, tokenizer, requests, max_new_tokens, budgets, prefix_cache)
+    return sum(a.text == b.text for a, b in zip(plain, cached))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruction prefix cache benchmark")
+    parser.add_argument('--model', default=None, help="model to load (default: tiny random-weight model)")
+    parser.add_argument('--tokenizer', default=DEFAULT_TOKENIZER, help="shapes the tiny model")
+    parser.add_argument('--sentences', type=int, default=64)
+    parser.add_argument('--batch-sizes', default="1,8")
+    parser.add_argument('--max-words', type=int, default=12, help="longest synthetic sentence")
+    parser.add_argument('--threads', type=int, default=0, help="torch threads (default: torch's choice)")
+    parser.add_argument('--target-language', default="French")
+    args = parser.parse_args()
+
+    import torch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.model:
+        model, tokenizer = load_cpu_model(args.model, quantize=False)
+    else:
+        model, tokenizer = build_tiny_model(args.tokenizer, hidden_size=256, layers=4, heads=8)
+    prepare_tokenizer(tokenizer)
+    sentences = make_sentences(args.sentences, max_words=args.max_words)
+
+    prefix_cache = PrefixCache(model, tokenizer, build_prompt)
+    start = time.perf_counter()
+    prefix_ids, _, _ = prefix_cache.get(args.target_language)
+    encode_ms = (time.perf_counter() - start) * 1000
+    text_tokens = sum(len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"])
+
+    print(f"Model: {args.model or 'tiny random-weight'}, {torch.get_num_threads()} threads")
+    print(f"Prefix: {prefix_ids.shape[-1]} tokens, encoded once in {encode_ms:.1f} ms; "
+          f"texts average {text_tokens / len(sentences):.1f} tokens\n")
+    print(f"{'batch':>5} {'full ms/sent':>13} {'cached ms/sent':>15} {'saved':>7}")
+
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        # Warm up both paths
+        prefill_seconds(model, tokenizer, sentences[:batch_size], batch_size, args.target_language, None)
+        prefill_seconds(model, tokenizer, sentences[:batch_size], batch_size, args.target_language, prefix_cache)
+        full = prefill_seconds(model, tokenizer, sentences, batch_size, args.target_language, None)
+        cached = prefill_seconds(model, tokenizer, sentences, batch_size, args.target_language, prefix_cache)
+        print(f"{batch_size:>5} {full * 1000 / len(sentences):>13.2f} {cached * 1000 / len(sentences):>15.2f} "
+              f"{1 - cached / full:>6.0%}")
+
+    same = matching_outputs(model, tokenizer, sentences[:8], args.target_language, prefix_cache, 16)
+    print(f"\nGreedy outputs identical with and without the cache: {same}/8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent API.
+Lets the translation pipeline be benchmarked and load-tested offline with
+configurable latency and injected 429/500 errors.
+
+Usage:
+    python3 translator/gemini_stand_in.py --port 8090 --latency lognormal:0.4,0.5 --error-429 0.05
+    GEMINI_API_BASE=http://127.0.0.1:8090 python3 manage.py runserver
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MARKER_PATTERN = re.compile(r"(__BLOCK_\d+__)")
+TARGET_PATTERN = re.compile(r"\bto ([^.:\n]+)[.:]")
+
+
+class LatencyModel:
+    """
+    Samples response latency in seconds.
+
+    Specs:
+        fixed:S             always S
+        uniform:LO,HI       uniform between LO and HI
+        normal:MEAN,SD      normal, clamped at 0
+        lognormal:MEDIAN,SIGMA
+    """
+
+    def __init__(self, spec, per_char=0.0, rng=None):
+        kind, _, params = spec.partition(':')
+        self.kind = kind
+        self.params = [float(p) for p in params.split(',') if p]
+        self.per_char = per_char
+        self.rng = rng or random.Random()
+
+    def sample(self, chars=0):
+        """Latency for a response of `chars` characters."""
+        p = self.params
+        if self.kind == 'fixed':
+            base = p[0] if p else 0.0
+        elif self.kind == 'uniform':
+            base = self.rng.uniform(p[0], p[1])
+        elif self.kind == 'normal':
+            base = max(0.0, self.rng.gauss(p[0], p[1]))
+        elif self.kind == 'lognormal':
+            base = self.rng.lognormvariate(math.log(p[0]), p[1])
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        return base + chars * self.per_char
+
+
+def fake_translate(text, target_language, mode):
+    """
+    Deterministic stand-in translation that keeps __BLOCK_n__ markers intact.
+
+    Modes:
+        tag      prefix each piece with [target language]
+        reverse  reverse the word order of each piece
+        echo     return the text unchanged
+    """
+    def convert(piece):
+        if not piece.strip():
+            return piece
+        # Keep the surrounding whitespace so marker layout survives
+        stripped = piece.strip()
+        lead = piece[:len(piece) - len(piece.lstrip())]
+        trail = piece[len(piece.rstrip()):]
+        if mode == 'reverse':
+            return lead + " ".join(reversed(stripped.split())) + trail
+        if mode == 'tag':
+            return f"{lead}[{target_language}] {stripped}{trail}"
+        return piece
+
+    parts = MARKER_PATTERN.split(text)
+    return "".join(part if MARKER_PATTERN.fullmatch(part) else convert(part) for part in parts)
+
+
+def translate_prompt(prompt, generation_config, mode):
+    """Recover the source text from a service prompt and build the fake reply text."""
+    match = TARGET_PATTERN.search(prompt)
+    target_language = match.group(1).strip() if match else "Target"
+
+    if generation_config.get('responseMimeType') == 'application/json' and 'Segments:\n' in prompt:
+        segments = json.loads(prompt.split('Segments:\n', 1)[1])
+        return json.dumps([
+            {"id": seg["id"], "text": fake_translate(seg["text"], target_language, mode)}
+            for seg in segments
+        ], ensure_ascii=False)
+
+    if 'Text to translate:\n' in prompt:
+        text = prompt.split('Text to translate:\n', 1)[1]
+    else:
+        text = prompt.split('\n\n', 1)[-1]
+    return fake_translate(text, target_language, mode)
+
+
+class StandInStats:
+    """Thread-safe counters reported at GET /stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'ok': 0, 'injected_429': 0, 'injected_500': 0, 'streamed': 0}
+        self.output_chars = 0
+
+    def add(self, key, chars=0):
+        with self._lock:
+            self.counts[key] += 1
+            self.output_chars += chars
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.counts, 'output_chars': self.output_chars}
+
+
+def make_handler(config, latency, stats, rng):
+    """Build the request handler class bound to one server configuration."""
+    rng_lock = threading.Lock()
+
+    class GeminiStandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+        def log_message(self, format, *args):
+            if config.verbose:
+                super().log_message(format, *args)
+
+        def _send_json(self, status, payload, extra_headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (extra_headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                self._send_json(200, stats.snapshot())
+            else:
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            raw = self.rfile.read(length)
+            stats.add('requests')
+
+            if ':generateContent' not in self.path and ':streamGenerateContent' not in self.path:
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+                return
+
+            try:
+                request = json.loads(raw)
+                prompt = request['contents'][0]['parts'][0]['text']
+                generation_config = request.get('generationConfig', {})
+            except (ValueError, KeyError, IndexError):
+                self._send_json(400, {'error': {'code': 400, 'message': 'Invalid request body'}})
+                return
+
+            with rng_lock:
+                roll = rng.random()
+            if roll < config.error_429:
+                stats.add('injected_429')
+                time.sleep(latency.sample())
+                self._send_json(429, {
+                    'error': {
+                        'code': 429,
+                        'message': 'Resource has been exhausted (stand-in).',
+                        'status': 'RESOURCE_EXHAUSTED',
+                    }
+                }, {'Retry-After': str(config.retry_after)})
+                return
+            if roll < config.error_429 + config.error_500:
+                stats.add('injected_500')
+                time.sleep(latency.sample())
+                self._send_json(500, {'error': {'code': 500, 'message': 'Internal error (stand-in).', 'status': 'INTERNAL'}})
+                return
+
+            text = translate_prompt(prompt, generation_config, config.mode)
+            time.sleep(latency.sample(len(text)))
+
+            if ':streamGenerateContent' in self.path:
+                self._stream(text)
+                stats.add('streamed', len(text))
+                return
+
+            stats.add('ok', len(text))
+            self._send_json(200, {
+                'candidates': [{
+                    'content': {'parts': [{'text': text}], 'role': 'model'},
+                    'finishReason': 'STOP',
+                    'index': 0,
+                }],
+                'usageMetadata': {
+                    'promptTokenCount': len(prompt) // 4,
+                    'candidatesTokenCount': len(text) // 4,
+                },
+                'modelVersion': 'stand-in',
+            })
+
+        def _stream(self, text):
+            """Send the reply as server-sent events, a few words per event."""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            words = re.findall(r'\S+\s*', text) or [text]
+            for i in range(0, len(words), config.stream_words):
+                event = {'candidates': [{'content': {'parts': [{'text': ''.join(words[i:i + config.stream_words])}]}}]}
+                data = f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode('utf-8')
+                self.wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+                self.wfile.flush()
+                time.sleep(config.stream_interval)
+            self.wfile.write(b'0\r\n\r\n')
+
+    return GeminiStandInHandler
+
+
+def make_server(host='127.0.0.1', port=8090, latency='fixed:0', latency_per_char=0.0,
+                error_429=0.0, error_500=0.0, retry_after=1.0, mode='tag',
+                stream_words=3, stream_interval=0.02, seed=None, verbose=False):
+    """Create (but do not start) a stand-in server. Returns (server, stats)."""
+    config = argparse.Namespace(
+        error_429=error_429, error_500=error_500, retry_after=retry_after, mode=mode,
+        stream_words=stream_words, stream_interval=stream_interval, verbose=verbose,
+    )
+    rng = random.Random(seed)
+    stats = StandInStats()
+    latency_model = LatencyModel(latency, latency_per_char, random.Random(seed))
+    server = ThreadingHTTPServer((host, port), make_handler(config, latency_model, stats, rng))
+    server.daemon_threads = True
+    return server, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini API stand-in for offline benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', default='fixed:0',
+                        help="fixed:S | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument('--latency-per-char', type=float, default=0.0,
+                        help="extra seconds per output character")
+    parser.add_argument('--error-429', type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument('--error-500', type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--mode', choices=['tag', 'reverse', 'echo'], default='tag')
+    parser.add_argument('--stream-words', type=int, default=3, help="words per streamed event")
+    parser.add_argument('--stream-interval', type=float, default=0.02, help="seconds between streamed events")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server, _ = make_server(
+        args.host, args.port, args.latency, args.latency_per_char, args.error_429, args.error_500,
+        args.retry_after, args.mode, args.stream_words, args.stream_interval, args.seed, args.verbose,
+    )
+    print(f"Gemini stand-in listening on http://{args.host}:{args.port}")
+    print(f"Point the service at it with: GEMINI_API_BASE=http://{args.host}:{args.port}")
+    print(f"Counters: GET http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
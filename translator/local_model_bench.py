@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the local-model benchmarks.
+Builds a tiny random-weight model with the real Qwen tokenizer and chat
+template, so batching, generation and caching code paths can be timed on
+CPU without downloading any weights.
+"""
+
+import random
+import string
+from pathlib import Path
+
+DEFAULT_TOKENIZER = str(Path(__file__).parent / "models" / "JungZoona_T3Q-qwen2.5-14b-v1.0-e3")
+
+
+def build_tiny_model(tokenizer_path=DEFAULT_TOKENIZER, hidden_size=64, layers=2, heads=4, seed=0):
+    """
+    Random-weight causal LM shaped like the production model, but tiny.
+
+    Returns:
+        tuple: (model, tokenizer)
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForCausalLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_path, trust_remote_code=True)
+    config = AutoConfig.from_pretrained(tokenizer_path, trust_remote_code=True)
+    config.hidden_size = hidden_size
+    config.intermediate_size = hidden_size * 2
+    config.num_hidden_layers = layers
+    config.max_window_layers = layers
+    config.num_attention_heads = heads
+    config.num_key_value_heads = max(1, heads // 2)
+    config.vocab_size = len(tokenizer)
+    config.max_position_embeddings = 4096
+    config.sliding_window = 4096
+    config.torch_dtype = "float32"
+
+    torch.manual_seed(seed)
+    model = AutoModelForCausalLM.from_config(config, torch_dtype=torch.float32)
+    model.eval()
+    return model, tokenizer
+
+
+def make_sentences(count, min_words=4, max_words=40, seed=1):
+    """Synthetic sentences of mixed length."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2000)]
+    return [
+        " ".join(rng.choices(vocabulary, k=rng.randint(min_words, max_words))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Out-of-process model worker.
+Loads the local CPU model once and serves it to every web worker over a Unix
+socket, so N web workers share one copy of the weights and their requests
+are batched together.
+
+Usage:
+    python3 translator/model_worker.py --socket /tmp/transverse-model-worker.sock
+    MODEL_WORKER_SOCKET=/tmp/transverse-model-worker.sock python3 manage.py runserver
+
+The model is configured with the usual LOCAL_TRANSLATION_* and LOCAL_MAX_BATCH_* variables.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.local_model import LocalTranslationService
+from services.model_worker import DEFAULT_SOCKET, ModelWorkerServer
+
+
+async def run(server):
+    """Serve until SIGINT or SIGTERM, then remove the socket."""
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        print("[Model Worker] Stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the local translation model to web workers")
+    parser.add_argument('--socket', default=os.environ.get('MODEL_WORKER_SOCKET', DEFAULT_SOCKET))
+    parser.add_argument('--model', default=None, help="model id or folder (default: LOCAL_TRANSLATION_MODEL)")
+    args = parser.parse_args()
+
+    asyncio.run(run(ModelWorkerServer(LocalTranslationService(args.model), args.socket)))
+
+
+if __name__ == "__main__":
+    main()
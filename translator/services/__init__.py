@@ -4,14 +4,50 @@ Translation services package.
 Contains different translation service implementations.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 
+from .segments import join_with_markers, split_by_markers
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+def _get_background_loop():
+    """Get the shared event loop thread used to run async calls from sync code."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            _background_loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_background_loop.run_forever,
+                name="translation-event-loop",
+                daemon=True,
+            )
+            thread.start()
+        return _background_loop
+
+def run_async(coro):
+    """
+    Run a coroutine from synchronous code and return its result.
+
+    The coroutine runs on a long-lived background event loop, so async
+    resources such as HTTP sessions survive between calls.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result()
+
 class BaseTranslationService(ABC):
     """Abstract base class for translation services."""
     
     def __init__(self):
         self.service_name = "base"
         self.is_loaded = False
+        # What load_service() is doing right now, for readiness reports (None when idle)
+        self.load_stage = None
+        self.max_concurrency = 4  # In-flight limit for translate_batch_async
+        # Part of the translation cache key; bump it when prompts change
+        self.prompt_version = "1"
     
     @abstractmethod
     def load_service(self):
@@ -32,6 +68,117 @@ class BaseTranslationService(ABC):
         """
         pass
     
+    def translate_stream(self, text, target_language):
+        """
+        Translate text, yielding partial output as it becomes available.
+
+        The default yields the complete translation once; services with a
+        streaming API should override it.
+        """
+        yield self.translate(text, target_language)
+
+    async def translate_async(self, text, target_language):
+        """
+        Async counterpart of translate().
+
+        The default runs the blocking translate() in a worker thread;
+        services with a native async client should override it.
+        """
+        return await asyncio.to_thread(self.translate, text, target_language)
+
+    def translate_with_reference(self, text, target_language, reference):
+        """
+        Translate text given a similar, previously translated text.
+
+        Args:
+            text (str): Text to translate
+            target_language (str): Target language
+            reference (tuple): (source, translation) of a near-duplicate text
+
+        The default ignores the reference; services whose prompts can use
+        it to keep terminology consistent should override it.
+        """
+        return self.translate(text, target_language)
+
+    async def translate_with_reference_async(self, text, target_language, reference):
+        """Async counterpart of translate_with_reference()."""
+        return await asyncio.to_thread(self.translate_with_reference, text, target_language, reference)
+
+    async def translate_batch_async(self, texts, target_language, max_concurrency=None):
+        """
+        Translate several independent texts concurrently.
+
+        Args:
+            texts (list): Texts to translate
+            target_language (str): Target language
+            max_concurrency (int, optional): Maximum requests in flight
+
+        Returns:
+            list: Translated texts, in the same order as the input
+        """
+        limit = max_concurrency or self.max_concurrency
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def translate_one(text):
+            async with semaphore:
+                return await self.translate_async(text, target_language)
+
+        return list(await asyncio.gather(*(translate_one(text) for text in texts)))
+
+    def translate_batch(self, segments, target_language):
+        """
+        Translate a list of segments.
+
+        The default sends each segment as its own request through
+        translate_batch_async(); services that can carry several segments
+        per request should override translate_batch_async() to pack them.
+
+        Args:
+            segments (list): Segment texts
+            target_language (str): Target language
+
+        Returns:
+            list: Translated segments, aligned one-to-one with the input
+        """
+        if not segments:
+            return []
+        return run_async(self.translate_batch_async(list(segments), target_language))
+    
+    async def translate_segments_async(self, segments, target_language):
+        """
+        Translate several segments of one document in a single request.
+
+        The default packs them with "__BLOCK_n__" markers; segments whose
+        marker does not come back are translated again on their own.
+
+        Args:
+            segments (list): Segment texts
+            target_language (str): Target language
+
+        Returns:
+            list: Translated segments, aligned one-to-one with the input
+        """
+        pending = [i for i, text in enumerate(segments) if text.strip()]
+        results = [""] * len(segments)
+        if not pending:
+            return results
+
+        batch = [segments[i] for i in pending]
+        translated = await self.translate_async(join_with_markers(batch), target_language)
+        parsed = split_by_markers(translated or "", len(batch))
+
+        missing = []
+        for i, text in zip(pending, parsed):
+            if text:
+                results[i] = text
+            else:
+                missing.append(i)
+
+        retried = await asyncio.gather(*(self.translate_async(segments[i], target_language) for i in missing))
+        for i, text in zip(missing, retried):
+            results[i] = text
+        return results
+    
     @abstractmethod
     def is_available(self):
         """Check if the service is available/configured."""
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Fast-path bypass for segments that need no translation.
+Page numbers, bare figures, URLs, e-mail addresses, code, chemical formulas
+and text already in the target language are copied through untranslated.
+"""
+
+import re
+import threading
+from collections import Counter
+
+from .chunking import estimate_tokens
+from .language_id import detect_language, language_code
+
+_URL = re.compile(r"^(?:https?://|ftp://|www\.)\S+$", re.IGNORECASE)
+_EMAIL = re.compile(r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$")
+# "12", "Page 3", "p. 4", "3 / 20", "Page 3 of 20", and front-matter roman numerals up to xxxix
+_PAGE_NUMBER = re.compile(
+    r"^(?:(?i:page|p\.|pp\.)\s*)?(?:\d{1,6}|(?=[ivx])x{0,3}(?:ix|iv|v?i{0,3}))(?:\s*(?:/|of)\s*\d{1,6})?$"
+)
+# Element symbols with counts, optionally charged: H2O, C6H12O6, Ca(OH)2, SO4^2-, NH4+.
+# Each digit run can only be matched one way, so failing matches stay linear
+_FORMULA = re.compile(r"^(?:\(?[A-Z][a-z]?\d*(?:\)\d*)?)+(?:\^\d*[+-]|[+-])?$")
+_CODE_TOKENS = re.compile(r"[{};]|=>|==|!=|::|->|\w\(\S*\)|^\s*(?:def|class|import|return|function|var|const|let)\s")
+# snake_case, camelCase and slash-separated paths with at least two separators
+_IDENTIFIER = re.compile(r"^(?:[a-z]+(?:_[a-z0-9]+)+|[a-z]+(?:[A-Z][a-z0-9]*)+|[\w.~-]*(?:/[\w.-]+){2,}/?)$")
+
+# Below this many letters a segment is always sent for translation
+MIN_LANGUAGE_ID_LETTERS = 4
+# URLs, formulas and identifiers are short; longer segments skip the pattern checks
+MAX_PATTERN_CHARS = 200
+
+# Pages with this many spans and almost no text per span are maps or diagrams
+PATHOLOGICAL_MIN_SPANS = 1000
+PATHOLOGICAL_MAX_CHARS_PER_SPAN = 3
+
+
+def classify_segment(text, target_language=None):
+    """
+    Decide whether a segment can skip translation.
+
+    Args:
+        text (str): Segment text
+        target_language (str, optional): Target language name or code
+
+    Returns:
+        str or None: Reason for the bypass, or None if it must be translated
+    """
+    stripped = text.strip()
+    if not stripped:
+        return 'empty'
+
+    letters = sum(1 for char in stripped if char.isalpha())
+    if _PAGE_NUMBER.match(stripped):
+        return 'page_number'
+    if letters == 0:
+        return 'no_letters'
+    if len(stripped) <= MAX_PATTERN_CHARS:
+        if _URL.match(stripped):
+            return 'url'
+        if _EMAIL.match(stripped):
+            return 'email'
+        if any(char.isdigit() for char in stripped) and _FORMULA.match(stripped):
+            return 'formula'
+        if _IDENTIFIER.match(stripped):
+            return 'code'
+
+        symbols = sum(1 for char in stripped if not char.isalnum() and not char.isspace())
+        if symbols / len(stripped) > 0.15 and len(_CODE_TOKENS.findall(stripped)) >= 2:
+            return 'code'
+
+    target = language_code(target_language) if target_language else None
+    if target and target != 'zh' and letters >= MIN_LANGUAGE_ID_LETTERS:
+        language, confidence = detect_language(stripped)
+        if language == target and confidence >= 0.5:
+            return 'target_language'
+
+    return None
+
+
+def is_pathological_page(span_count, char_count):
+    """True for pages made of thousands of tiny spans (maps, diagrams, charts)."""
+    return span_count >= PATHOLOGICAL_MIN_SPANS and char_count / span_count <= PATHOLOGICAL_MAX_CHARS_PER_SPAN
+
+
+class SegmentBypass:
+    """classify_segment() with counters of bypassed segments and tokens saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reasons = Counter()
+        self._checked = 0
+        self._tokens_saved = 0
+        self._pages_skipped = 0
+
+    def check(self, text, target_language=None):
+        """Classify one segment and record the outcome. Returns the bypass reason or None."""
+        reason = classify_segment(text, target_language)
+        with self._lock:
+            self._checked += 1
+            if reason:
+                self._reasons[reason] += 1
+                self._tokens_saved += estimate_tokens(text)
+        return reason
+
+    def record_skipped_page(self, char_count):
+        """Count a page left untranslated by is_pathological_page()."""
+        with self._lock:
+            self._pages_skipped += 1
+            self._tokens_saved += char_count // 4
+
+    def get_stats(self):
+        """Get bypass counters."""
+        with self._lock:
+            return {
+                'checked': self._checked,
+                'bypassed': sum(self._reasons.values()),
+                'by_reason': dict(self._reasons),
+                'pages_skipped': self._pages_skipped,
+                'tokens_saved': self._tokens_saved,
+            }
+
+
+# Global instance shared by the manager and the PDF pipeline
+segment_bypass = SegmentBypass()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted chunking of translation payloads.
+Packs ordered segments into request-sized chunks on segment boundaries so
+that no request overflows the model's output limit and none is nearly empty.
+"""
+
+# Gemini's generateContent output limit used by the service
+DEFAULT_MAX_OUTPUT_TOKENS = 8192
+# Translations can come out longer than the source (e.g. English -> German)
+OUTPUT_EXPANSION_FACTOR = 1.6
+# Per-segment overhead of the "__BLOCK_n__" marker and separators
+SEGMENT_OVERHEAD_TOKENS = 8
+# A last chunk below this size takes segments from the chunk before it
+DEFAULT_MIN_CHUNK_TOKENS = 256
+
+
+def _is_wide_char(char):
+    """True for scripts that tokenize at roughly one token per character."""
+    code = ord(char)
+    return (
+        0x3040 <= code <= 0x30FF      # Hiragana, Katakana
+        or 0x3400 <= code <= 0x9FFF   # CJK ideographs
+        or 0xAC00 <= code <= 0xD7AF   # Hangul syllables
+        or 0xF900 <= code <= 0xFAFF   # CJK compatibility ideographs
+    )
+
+
+def estimate_tokens(text):
+    """
+    Cheaply estimate the token count of a text.
+
+    Latin-script text averages about four characters per token, while CJK
+    and Hangul characters are close to one token each.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+    wide = sum(1 for char in text if _is_wide_char(char))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def max_input_tokens(max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS, expansion=OUTPUT_EXPANSION_FACTOR):
+    """Largest source payload whose translation should fit in max_output_tokens."""
+    return int(max_output_tokens / expansion)
+
+
+class TokenBudgetChunker:
+    """Splits an ordered list of segments into request-sized chunks."""
+
+    def __init__(self, max_tokens=None, min_tokens=DEFAULT_MIN_CHUNK_TOKENS):
+        self.max_tokens = max_tokens or max_input_tokens()
+        self.min_tokens = min(min_tokens, self.max_tokens)
+
+    def segment_cost(self, text):
+        """Estimated tokens a segment adds to a request."""
+        return estimate_tokens(text) + SEGMENT_OVERHEAD_TOKENS
+
+    def plan(self, texts):
+        """
+        Group segments into chunks without reordering or splitting them.
+
+        A single segment larger than the budget gets a chunk of its own.
+
+        Args:
+            texts (list): Segment texts, in document order
+
+        Returns:
+            list: Chunks, each a list of indices into `texts`
+        """
+        chunks = []
+        sizes = []
+        current = []
+        current_size = 0
+
+        for index, text in enumerate(texts):
+            cost = self.segment_cost(text)
+            if current and current_size + cost > self.max_tokens:
+                chunks.append(current)
+                sizes.append(current_size)
+                current = []
+                current_size = 0
+            current.append(index)
+            current_size += cost
+
+        if current:
+            chunks.append(current)
+            sizes.append(current_size)
+
+        self._rebalance_tail(chunks, sizes, texts)
+        return chunks
+
+    def _rebalance_tail(self, chunks, sizes, texts):
+        """
+        Grow an undersized last chunk with trailing segments of the one before.
+
+        Greedy packing fills every chunk but the last, which can end up with
+        a few tokens while still costing a full request. Segments move while
+        the last chunk is below min_tokens and stays no larger than the one
+        it takes from.
+        """
+        if len(chunks) < 2:
+            return
+        previous, last = chunks[-2], chunks[-1]
+        while sizes[-1] < self.min_tokens and len(previous) > 1:
+            cost = self.segment_cost(texts[previous[-1]])
+            if sizes[-1] + cost > sizes[-2] - cost:
+                break
+            last.insert(0, previous.pop())
+            sizes[-2] -= cost
+            sizes[-1] += cost
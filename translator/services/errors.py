@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Typed errors raised by translation services.
+"""
+
+
+class TranslationError(Exception):
+    """Base class for translation failures."""
+
+    # Whether repeating the same request may succeed
+    retryable = False
+    # Status code the web API should answer with
+    http_status = 502
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TranslationRateLimitError(TranslationError):
+    """The backend rejected the request because of quota (HTTP 429)."""
+    retryable = True
+    http_status = 429
+
+
+class TranslationServerError(TranslationError):
+    """The backend failed while handling the request (HTTP 5xx)."""
+    retryable = True
+    http_status = 502
+
+
+class TranslationTimeoutError(TranslationError):
+    """The backend did not answer in time."""
+    retryable = True
+    http_status = 504
+
+
+class TranslationConnectionError(TranslationError):
+    """The backend could not be reached."""
+    retryable = True
+    http_status = 503
+
+
+class TranslationAuthError(TranslationError):
+    """The API key is invalid or not allowed to call the backend (HTTP 401/403)."""
+    http_status = 503
+
+
+class TranslationRequestError(TranslationError):
+    """The backend rejected the request itself (other HTTP 4xx)."""
+    http_status = 400
+
+
+class TranslationResponseError(TranslationError):
+    """The backend answered with a response that could not be parsed."""
+    http_status = 502
+
+
+class RetriesExhaustedError(TranslationError):
+    """A retryable error persisted through every allowed attempt."""
+
+    def __init__(self, message, last_error, attempts):
+        super().__init__(message, status_code=last_error.status_code)
+        self.last_error = last_error
+        self.attempts = attempts
+        self.http_status = last_error.http_status
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for the translation memory.
+Texts are reduced to character shingles and a MinHash signature; banding the
+signature (LSH) turns "find similar texts" into a few exact index lookups.
+"""
+
+import hashlib
+import struct
+import zlib
+
+SHINGLE_SIZE = 5
+# 6 bands of 5 rows: ~90% recall at 0.8 Jaccard similarity, ~99.5% at 0.9,
+# while unrelated texts almost never share a band
+NUM_BANDS = 6
+ROWS_PER_BAND = 5
+NUM_HASHES = NUM_BANDS * ROWS_PER_BAND
+# Shorter texts are too small for a meaningful similarity score
+MIN_FUZZY_CHARS = 30
+
+_MASK = 0xFFFFFFFF
+_EMPTY = _MASK + 1
+
+
+def shingles(normalized_text):
+    """Set of character shingles of an already normalized text."""
+    text = normalized_text.lower()
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingle_set):
+    """
+    One-permutation MinHash signature of a shingle set.
+
+    Each shingle is hashed once and kept as the minimum of one of
+    NUM_HASHES bins, so the cost is linear in the text length instead of
+    NUM_HASHES times it. Empty bins borrow from the next filled bin.
+
+    Returns:
+        list: NUM_HASHES integers
+    """
+    bins = [_EMPTY] * NUM_HASHES
+    for shingle in shingle_set:
+        value = (zlib.crc32(shingle.encode('utf-8')) * 0x9E3779B1) & _MASK
+        index = value % NUM_HASHES
+        if value < bins[index]:
+            bins[index] = value
+
+    # Rotation densification: an empty bin takes the next filled bin's value,
+    # offset by the distance so that different empty bins stay distinct
+    if _EMPTY in bins:
+        filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+        if not filled:
+            return bins
+        for i in range(NUM_HASHES):
+            if bins[i] == _EMPTY:
+                distance = 1
+                while bins[(i + distance) % NUM_HASHES] == _EMPTY:
+                    distance += 1
+                bins[i] = bins[(i + distance) % NUM_HASHES] + distance * _EMPTY
+    return bins
+
+
+def band_keys(signature, scope):
+    """
+    LSH bucket keys of a signature.
+
+    Args:
+        signature (list): MinHash signature
+        scope (str): Keeps buckets of different languages/models apart
+
+    Returns:
+        list: NUM_BANDS signed 64-bit integers (SQLite INTEGER range)
+    """
+    scope_bytes = scope.encode('utf-8')
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            struct.pack(f'>B{ROWS_PER_BAND}Q', band, *rows) + scope_bytes, digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
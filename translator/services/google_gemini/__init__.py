@@ -7,6 +7,7 @@ try:
     gemini_service = GeminiTranslationService()
 except ImportError as e:
     print(f"Failed to import GeminiTranslationService: {e}")
+    GeminiTranslationService = None
     # Create a mock service for fallback
     class MockGeminiService:
         def __init__(self):
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client for the Gemini API.
+Keeps TLS connections alive between requests so consecutive pages reuse
+an open socket instead of paying a new handshake each time.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttpClient:
+    """Long-lived, thread-safe HTTP client with a keep-alive connection pool."""
+
+    def __init__(self, pool_connections=4, pool_maxsize=32, connect_timeout=5.0, read_timeout=30.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # Retries are handled by the service, not by urllib3
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+            pool_block=False,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+        self._lock = threading.Lock()
+        self._total_requests = 0
+        self._failed_requests = 0
+
+    @property
+    def timeout(self):
+        """(connect, read) timeout tuple passed to requests."""
+        return (self.connect_timeout, self.read_timeout)
+
+    def post(self, url, **kwargs):
+        """POST through the shared session, applying the default timeouts."""
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.post(url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._total_requests += 1
+                self._failed_requests += 1
+            raise
+        with self._lock:
+            self._total_requests += 1
+        return response
+
+    def get_stats(self):
+        """
+        Get connection reuse counters.
+
+        Returns:
+            dict: Requests sent, connections opened and connections reused
+        """
+        opened = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        with pools.lock:
+            connection_pools = list(pools._container.values())
+        for pool in connection_pools:
+            opened += getattr(pool, 'num_connections', 0)
+            pooled_requests += getattr(pool, 'num_requests', 0)
+
+        with self._lock:
+            total = self._total_requests
+            failed = self._failed_requests
+
+        reused = max(pooled_requests - opened, 0)
+        return {
+            'requests': total,
+            'failed_requests': failed,
+            'connections_opened': opened,
+            'connections_reused': reused,
+            'reuse_ratio': (reused / pooled_requests) if pooled_requests else 0.0,
+            'pool_maxsize': self.pool_maxsize,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout,
+        }
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
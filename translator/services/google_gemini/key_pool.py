@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+API key pool for the Gemini service.
+Spreads requests across several keys by remaining quota and benches keys
+that the API rejects with 429 or 403.
+"""
+
+import hashlib
+import threading
+import time
+
+from ..rate_limiter import TokenBucketRateLimiter
+
+
+class ApiKeyState:
+    """Quota, bench status and counters for one API key."""
+
+    def __init__(self, api_key, limiter):
+        self.api_key = api_key
+        # Stable, non-secret identifier for logs, stats and shared limiter state
+        self.key_id = hashlib.sha256(api_key.encode()).hexdigest()[:8]
+        self.limiter = limiter
+        self.benched_until = 0.0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.forbidden = 0
+
+
+class ApiKeyPool:
+    """Thread-safe pool of API keys, each with its own token buckets."""
+
+    def __init__(self, api_keys, max_per_second, max_per_minute, backend=None,
+                 rate_limit_bench=30.0, forbidden_bench=300.0, max_bench=900.0):
+        self.rate_limit_bench = rate_limit_bench
+        self.forbidden_bench = forbidden_bench
+        self.max_bench = max_bench
+        self._lock = threading.Lock()
+        self.keys = []
+        for api_key in dict.fromkeys(api_keys):  # Drop duplicates, keep order
+            state = ApiKeyState(api_key, None)
+            state.limiter = TokenBucketRateLimiter(
+                max_per_second, max_per_minute, backend=backend, name=f"gemini:{state.key_id}"
+            )
+            self.keys.append(state)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def acquire(self, max_wait=None):
+        """
+        Pick the key with the most remaining quota and reserve one request on it.
+
+        Benched keys are skipped while any other key is active; if every key
+        is benched, the one that comes back first is used.
+
+        Args:
+            max_wait (float, optional): Reserve nothing if every key stays
+                benched for longer than this
+
+        Returns:
+            tuple: (ApiKeyState, seconds to wait before sending)
+        """
+        now = time.monotonic()
+        with self._lock:
+            active = [key for key in self.keys if key.benched_until <= now]
+            if active:
+                # Most remaining quota wins; ties go to the least used key
+                key = max(active, key=lambda k: (k.limiter.available(), -k.requests))
+                bench_wait = 0.0
+            else:
+                key = min(self.keys, key=lambda k: k.benched_until)
+                bench_wait = key.benched_until - now
+                if max_wait is not None and bench_wait > max_wait:
+                    return key, bench_wait
+            key.requests += 1
+        return key, bench_wait + key.limiter.reserve()
+
+    def report_success(self, key):
+        """Record a successful request on a key."""
+        with self._lock:
+            key.consecutive_failures = 0
+
+    def report_error(self, key, error):
+        """
+        Record a failed request and bench the key on 429/403.
+
+        Returns:
+            bool: True if another key is active, so a retry need not back off
+        """
+        now = time.monotonic()
+        with self._lock:
+            key.errors += 1
+            if error.status_code in (429, 401, 403):
+                key.consecutive_failures += 1
+                if error.status_code == 429:
+                    key.rate_limited += 1
+                    base = error.retry_after or self.rate_limit_bench
+                else:
+                    key.forbidden += 1
+                    base = self.forbidden_bench
+                # Keys that keep failing stay out longer
+                bench = min(self.max_bench, base * (2 ** (key.consecutive_failures - 1)))
+                key.benched_until = max(key.benched_until, now + bench)
+                print(f"[Gemini API] Key {key.key_id} benched for {bench:.0f}s after {error.status_code}")
+            return any(k is not key and k.benched_until <= now for k in self.keys)
+
+    def get_stats(self):
+        """Per-key request, error and bench counters."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'key_id': key.key_id,
+                    'requests': key.requests,
+                    'errors': key.errors,
+                    'rate_limited': key.rate_limited,
+                    'forbidden': key.forbidden,
+                    'benched_for_seconds': round(max(0.0, key.benched_until - now), 1),
+                    'available_quota': round(key.limiter.available(), 1),
+                }
+                for key in self.keys
+            ]
@@ -4,36 +4,98 @@ Google Gemini API Translation Service.
 Uses Google's Gemini API for translation.
 """
 
+import os
 import sys
 import json
+import asyncio
 import requests
+import threading
 import time
-import random
+import weakref
 from pathlib import Path
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Add the translator directory to Python path
 translator_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(translator_dir))
 
 from services import BaseTranslationService
+from .http_client import PooledHttpClient
+from .key_pool import ApiKeyPool
+from ..rate_limiter import SqliteBucketBackend
+from ..chunking import DEFAULT_MAX_OUTPUT_TOKENS, TokenBudgetChunker, max_input_tokens
+from ..segments import SEGMENTS_RESPONSE_SCHEMA, segments_to_json, parse_segments_json
+from ..retry import RetryPolicy, parse_retry_after
+from ..errors import (
+    TranslationAuthError,
+    TranslationConnectionError,
+    TranslationRateLimitError,
+    TranslationRequestError,
+    TranslationResponseError,
+    TranslationServerError,
+    TranslationTimeoutError,
+    RetriesExhaustedError,
+)
 
 class GeminiTranslationService(BaseTranslationService):
-    def __init__(self):
+    def __init__(self, model=None):
         super().__init__()
         self.service_name = "Google Gemini 2.5 Flash"
         self.api_key = None
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+        self.api_keys = []
+        # GEMINI_API_BASE points the service at another host, e.g. the local stand-in server
+        self.model = model or os.environ.get('GEMINI_MODEL', 'gemini-2.5-flash')
+        if model:
+            self.service_name = f"Google Gemini ({model})"
+        self.set_api_base(os.environ.get('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com'))
+        self.max_output_tokens = DEFAULT_MAX_OUTPUT_TOKENS
+        # Send multi-segment payloads as JSON with a response schema instead of __BLOCK_n__ markers
+        self.structured_output = os.environ.get('GEMINI_STRUCTURED_OUTPUT', '1') != '0'
+        # Bump when the prompts below change so cached translations are not reused
+        self.prompt_version = "gemini-1"
 
-        # Minimal rate limiting - only one request per page now
+        # Per-key token-bucket rate limiting, created on first use
         self.max_requests_per_minute = 4000  # User's reported quota
         self.max_requests_per_second = 50    # Very conservative
-        self.request_history = []
-        self.last_request_time = 0
-        self.min_request_interval = 1.0      # 1 second between requests
+        # Set to a file path to share one quota across all worker processes on this host
+        self.rate_limit_db = os.environ.get('GEMINI_RATE_LIMIT_DB')
+        self._key_pool = None
+        self._key_pool_lock = threading.Lock()
+
+        # Keep-alive connection pool, created on first use
+        self.pool_maxsize = int(os.environ.get('GEMINI_POOL_MAXSIZE', 32))
+        self.connect_timeout = float(os.environ.get('GEMINI_CONNECT_TIMEOUT', 5.0))
+        self.read_timeout = float(os.environ.get('GEMINI_READ_TIMEOUT', 30.0))
+        self._http_client = None
+        self._http_client_lock = threading.Lock()
+
+        # Retries for 429/5xx/timeouts - jittered exponential backoff honouring Retry-After
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.environ.get('GEMINI_MAX_ATTEMPTS', 5)),
+            max_total_delay=float(os.environ.get('GEMINI_RETRY_BUDGET', 60.0)),
+        )
+
+        # Native asyncio path - one session and in-flight limiter per event loop
+        self.max_concurrency = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 32))
+        self._async_sessions = weakref.WeakKeyDictionary()
+        self._async_semaphores = weakref.WeakKeyDictionary()
         
     def load_api_key(self):
-        """Load API key from file."""
+        """
+        Load API keys from the environment or the key file.
+
+        GEMINI_API_KEYS may hold several comma-separated keys; the key file
+        may hold one key per line. All keys found are pooled.
+        """
         try:
+            keys = []
+            for var in ('GEMINI_API_KEYS', 'GEMINI_API_KEY', 'GOOGLE_API_KEY'):
+                keys.extend(k.strip() for k in os.environ.get(var, '').split(',') if k.strip())
+
             # Try the most common path first
             api_key_file = Path.cwd() / "translator" / "config" / "gemini_api_key.txt"
             if not api_key_file.exists():
@@ -42,13 +104,26 @@ class GeminiTranslationService(BaseTranslationService):
 
             if api_key_file.exists():
                 with open(api_key_file, 'r') as f:
-                    self.api_key = f.read().strip()
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith('#'):
+                            keys.append(line)
+
+            if keys:
+                self.api_keys = list(dict.fromkeys(keys))
+                self.api_key = self.api_keys[0]
+                print(f"[Gemini API] Loaded {len(self.api_keys)} API key(s)")
                 return True
             return False
         except Exception as e:
             print(f"Error loading API key: {e}")
             return False
     
+    def set_api_base(self, base_url):
+        """Send requests to `base_url` (scheme and host) instead of the Google endpoint."""
+        self.api_base = base_url.rstrip('/')
+        self.api_url = f"{self.api_base}/v1beta/models/{self.model}:generateContent"
+
     def is_available(self):
         """Check if the Gemini API service is available."""
         if not self.api_key:
@@ -61,63 +136,115 @@ class GeminiTranslationService(BaseTranslationService):
             raise Exception("Gemini API key not available")
         self.is_loaded = True
 
-    def _wait_for_rate_limit(self):
-        """Wait if necessary to respect rate limits."""
-        current_time = time.time()
-
-        # Clean old request history (older than 1 minute)
-        self.request_history = [t for t in self.request_history if current_time - t < 60]
-
-        wait_time = 0
-
-        # Check per-second rate limit
-        recent_requests = [t for t in self.request_history if current_time - t < 1]
-        if len(recent_requests) >= self.max_requests_per_second:
-            # Calculate wait time to stay under per-second limit
-            oldest_recent = min(recent_requests)
-            second_wait = 1.0 - (current_time - oldest_recent)
-            if second_wait > 0:
-                print(f"[Gemini API] Rate limit: Per-second limit hit ({len(recent_requests)} requests in last second)")
-                print(f"[Gemini API] Waiting {second_wait:.2f} seconds for per-second limit")
-                wait_time = max(wait_time, second_wait)
-
-        # Check per-minute rate limit
-        if len(self.request_history) >= self.max_requests_per_minute:
-            # Calculate wait time to stay under per-minute limit
-            oldest_request = min(self.request_history)
-            minute_wait = 60.0 - (current_time - oldest_request)
-            if minute_wait > 0:
-                print(f"[Gemini API] Rate limit: Per-minute limit hit ({len(self.request_history)} requests in last minute)")
-                print(f"[Gemini API] Waiting {minute_wait:.2f} seconds for per-minute limit")
-                wait_time = max(wait_time, minute_wait)
-
-        # Also enforce minimum interval between requests
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            interval_wait = self.min_request_interval - time_since_last_request
-            print(f"[Gemini API] Enforcing minimum interval: Waiting {interval_wait:.3f} seconds")
-            wait_time = max(wait_time, interval_wait)
+    def _get_http_client(self):
+        """Get the shared pooled HTTP client, creating it on first use."""
+        if self._http_client is None:
+            with self._http_client_lock:
+                if self._http_client is None:
+                    self._http_client = PooledHttpClient(
+                        pool_maxsize=self.pool_maxsize,
+                        connect_timeout=self.connect_timeout,
+                        read_timeout=self.read_timeout,
+                    )
+        return self._http_client
+
+    def get_connection_stats(self):
+        """Get keep-alive connection reuse counters."""
+        if self._http_client is None:
+            return {'requests': 0, 'connections_opened': 0, 'connections_reused': 0}
+        return self._http_client.get_stats()
+
+    def get_service_info(self):
+        """Get information about this service, including connection and key stats."""
+        info = super().get_service_info()
+        info['connections'] = self.get_connection_stats()
+        info['keys'] = self._get_key_pool().get_stats() if self.api_key else []
+        return info
+
+    def _get_key_pool(self):
+        """Get the API key pool, creating it on first use."""
+        if self._key_pool is None:
+            with self._key_pool_lock:
+                if self._key_pool is None:
+                    backend = SqliteBucketBackend(self.rate_limit_db) if self.rate_limit_db else None
+                    self._key_pool = ApiKeyPool(
+                        self.api_keys or [self.api_key],
+                        self.max_requests_per_second,
+                        self.max_requests_per_minute,
+                        backend=backend,
+                    )
+        return self._key_pool
+
+    def _reserve_key(self, attempt, waited, last_error):
+        """
+        Pick an API key and the wait its bench or rate limits require.
+
+        The wait comes out of the same retry budget as backoff delays.
 
+        Returns:
+            tuple: (ApiKeyState, seconds to wait before sending)
+
+        Raises:
+            TranslationError: If the wait does not fit in what is left of the budget
+        """
+        budget = max(0.0, self.retry_policy.max_total_delay - waited)
+        key, wait_time = self._get_key_pool().acquire(max_wait=budget)
+        if wait_time > budget:
+            error = TranslationRateLimitError(
+                f"Rate limit: no API key free for {wait_time:.0f}s", 429, retry_after=wait_time
+            )
+            print(f"[Gemini API] {error} - over the {self.retry_policy.max_total_delay:.0f}s retry budget")
+            if last_error is None:
+                raise error
+            raise self._give_up(last_error, attempt - 1)
+        if wait_time > 0:
+            print(f"[Gemini API] Rate limit: waiting {wait_time:.2f} seconds (key {key.key_id})")
+        return key, wait_time
+
+    def _wait_for_rate_limit(self, attempt=1, waited=0.0, last_error=None):
+        """Pick an API key and wait if necessary to respect its rate limits. Returns (key, seconds waited)."""
+        key, wait_time = self._reserve_key(attempt, waited, last_error)
         if wait_time > 0:
-            print(f"[Gemini API] Total wait time: {wait_time:.2f} seconds")
             time.sleep(wait_time)
+        return key, wait_time
 
-        self.last_request_time = time.time()
-        self.request_history.append(time.time())
+    async def _wait_for_rate_limit_async(self, attempt=1, waited=0.0, last_error=None):
+        """Async counterpart of _wait_for_rate_limit() that does not block the event loop."""
+        if self.rate_limit_db:
+            # SQLite buckets lock the file (waiting up to 10s) - keep that off the event loop
+            key, wait_time = await asyncio.to_thread(self._reserve_key, attempt, waited, last_error)
+        else:
+            key, wait_time = self._reserve_key(attempt, waited, last_error)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return key, wait_time
 
-        print(f"[Gemini API] Request allowed - {len(self.request_history)} total requests in last minute")
+    def _handle_failure(self, key, error, attempt, waited):
+        """
+        Record a failed attempt against its key and decide on a retry.
 
-    def translate(self, text, target_language):
-        """Translate text using Google Gemini API with rate limiting."""
-        if not self.is_available():
-            return "Translation failed: Gemini API not available - check API key"
+        Returns:
+            float: Seconds to back off before the next attempt
 
-        if not text or text.strip() == "":
-            return ""
+        Raises:
+            TranslationError: If the call should stop retrying
+        """
+        other_key_ready = self._get_key_pool().report_error(key, error)
+        if other_key_ready and isinstance(error, (TranslationRateLimitError, TranslationAuthError)) \
+                and attempt < self.retry_policy.max_attempts:
+            # This key is benched - move straight on to a healthy one
+            print(f"[Gemini API] {error} on key {key.key_id} - retrying with another key")
+            return 0.0
+
+        delay = self.retry_policy.next_delay(attempt, error, waited)
+        if delay is None:
+            raise self._give_up(error, attempt)
 
-                # Wait for rate limiting before making request
-        self._wait_for_rate_limit()
+        print(f"[Gemini API] {error} - retrying in {delay:.2f}s")
+        return delay
 
+    def _build_request(self, text, target_language, reference=None):
+        """Build the URL, headers and JSON body for a generateContent call."""
         # Check if this is a batch translation (contains block markers)
         if "__BLOCK_" in text and "__" in text:
             prompt = f"""Translate the following text to {target_language}.
@@ -128,55 +255,375 @@ IMPORTANT: This text contains special markers like "__BLOCK_1__", "__BLOCK_2__",
 - Preserve the structure and formatting
 - Do not add explanations or additional text
 
+Text to translate:
+{text}"""
+        elif reference:
+            reference_source, reference_translation = reference
+            prompt = f"""Translate the following text to {target_language}. Only return the translated text, no explanations.
+
+A very similar text was translated before. Keep its wording and terminology wherever the two texts agree, and translate the differences.
+
+Similar text:
+{reference_source}
+
+Its translation:
+{reference_translation}
+
 Text to translate:
 {text}"""
         else:
             prompt = f"Translate the following text to {target_language}. Only return the translated text, no explanations:\n\n{text}"
 
+        return self._build_generate_request(prompt, {})
+
+    def _build_segments_request(self, segments, target_language):
+        """Build a generateContent call that returns schema-constrained JSON segments."""
+        prompt = f"""Translate the "text" of every segment in the JSON array below to {target_language}.
+
+Return a JSON array with exactly one object per input segment:
+- Keep each segment's "id" unchanged
+- Put the translation in "text"
+- Do not merge, split, skip or reorder segments
+- Do not add explanations
+
+Segments:
+{segments_to_json(segments)}"""
+
+        return self._build_generate_request(prompt, {
+            "responseMimeType": "application/json",
+            "responseSchema": SEGMENTS_RESPONSE_SCHEMA,
+        })
+
+    def _build_generate_request(self, prompt, extra_config):
+        """Wrap a prompt in the generateContent URL, headers and body."""
         headers = {'Content-Type': 'application/json'}
         data = {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {
                 "temperature": 0.1,
-                "maxOutputTokens": 8192,
+                "maxOutputTokens": self.max_output_tokens,
+                **extra_config,
             }
         }
+        # The API key is added per attempt by _send(), since it depends on the pool
+        return self.api_url, headers, data
 
-        print(f"[Gemini API] Making translation request - {len(text)} characters to {target_language}")
+    def _parse_response(self, result, text):
+        """Extract the translated text from a successful generateContent body."""
+        if result and 'candidates' in result and len(result['candidates']) > 0:
+            candidate = result['candidates'][0]
+            if 'content' in candidate and 'parts' in candidate['content']:
+                parts = candidate['content']['parts']
+                if len(parts) > 0 and 'text' in parts[0]:
+                    translated_text = parts[0]['text'].strip()
+                    print(f"[Gemini API] Translation successful - {len(text)} → {len(translated_text)} characters")
+                    return translated_text
 
-        try:
-            url = f"{self.api_url}?key={self.api_key}"
-            start_time = time.time()
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            request_time = time.time() - start_time
-
-            print(f"[Gemini API] Request completed in {request_time:.2f}s - Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        parts = candidate['content']['parts']
-                        if len(parts) > 0 and 'text' in parts[0]:
-                            translated_text = parts[0]['text'].strip()
-                            print(f"[Gemini API] Translation successful - {len(text)} → {len(translated_text)} characters")
-                            return translated_text
-
-                print(f"[Gemini API] Unexpected API response format")
-                return "Translation failed: Unexpected API response format"
-            elif response.status_code == 429:
-                return f"Translation failed: Rate limit exceeded (429). Your API quota may be exceeded. Please wait and try again."
-            elif response.status_code == 403:
-                return f"Translation failed: API key invalid or quota exceeded (403). Please check your API key and billing."
-            elif response.status_code == 500:
-                return f"Translation failed: Server error (500). Please try again later."
+        print("[Gemini API] Unexpected API response format")
+        raise TranslationResponseError("Unexpected API response format", status_code=200)
+
+    def _error_for_status(self, status_code, retry_after_header=None, body=None):
+        """Map a non-200 generateContent status to a typed translation error."""
+        retry_after = parse_retry_after(retry_after_header)
+        if retry_after is None and isinstance(body, dict):
+            # Gemini also reports the delay as a RetryInfo detail, e.g. "retryDelay": "30s"
+            for detail in body.get('error', {}).get('details', []):
+                delay = str(detail.get('retryDelay', '')).rstrip('s')
+                if delay:
+                    retry_after = parse_retry_after(delay)
+
+        if status_code == 429:
+            return TranslationRateLimitError("Rate limit exceeded (429)", status_code, retry_after)
+        elif status_code in (401, 403):
+            return TranslationAuthError(f"API key invalid or quota exceeded ({status_code})", status_code)
+        elif status_code >= 500:
+            return TranslationServerError(f"Server error ({status_code})", status_code, retry_after)
+        else:
+            return TranslationRequestError(f"API request failed with status {status_code}", status_code)
+
+    def _give_up(self, error, attempts):
+        """Build the error raised once a call stops retrying."""
+        if not error.retryable:
+            return error
+        print(f"[Gemini API] Giving up after {attempts} attempts: {error}")
+        return RetriesExhaustedError(f"Translation failed after {attempts} attempts: {error}", error, attempts)
+
+    def _send(self, url, headers, data, description, stream=False):
+        """
+        POST a generateContent request, retrying transient failures.
+
+        With stream=True the open response is returned as soon as the
+        status line is 200, so retries only happen before any output.
+
+        Returns:
+            dict: Parsed JSON body of the successful response, or the
+                open requests.Response when streaming
+
+        Raises:
+            TranslationError: If the request fails permanently or keeps
+                failing after the retry budget is spent
+        """
+        waited = 0.0
+        attempt = 0
+        error = None
+
+        while True:
+            attempt += 1
+
+            # Wait for rate limiting before making request
+            key, wait_time = self._wait_for_rate_limit(attempt, waited, error)
+            waited += wait_time
+
+            print(f"[Gemini API] Making translation request - {description} (attempt {attempt})")
+
+            try:
+                start_time = time.time()
+                response = self._get_http_client().post(
+                    url, headers={**headers, 'x-goog-api-key': key.api_key}, json=data, stream=stream
+                )
+                request_time = time.time() - start_time
+
+                print(f"[Gemini API] Request completed in {request_time:.2f}s - Status: {response.status_code}")
+
+                if stream and response.status_code == 200:
+                    self._get_key_pool().report_success(key)
+                    return response
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = None
+                if response.status_code == 200:
+                    self._get_key_pool().report_success(key)
+                    return body
+                error = self._error_for_status(response.status_code, response.headers.get('Retry-After'), body)
+
+            except requests.exceptions.Timeout:
+                error = TranslationTimeoutError("Request timeout. The translation service is taking too long to respond.")
+            except requests.exceptions.ConnectionError:
+                error = TranslationConnectionError("Connection error. Please check your internet connection.")
+
+            delay = self._handle_failure(key, error, attempt, waited)
+            time.sleep(delay)
+            waited += delay
+
+    def translate(self, text, target_language, reference=None):
+        """
+        Translate text using Google Gemini API with rate limiting and retries.
+
+        Args:
+            reference (tuple, optional): (source, translation) of a similar text
+
+        Raises:
+            TranslationError: If the request fails permanently or keeps
+                failing after the retry budget is spent
+        """
+        if not self.is_available():
+            return "Translation failed: Gemini API not available - check API key"
+
+        if not text or text.strip() == "":
+            return ""
+
+        url, headers, data = self._build_request(text, target_language, reference)
+        body = self._send(url, headers, data, f"{len(text)} characters to {target_language}")
+        return self._parse_response(body, text)
+
+    def translate_with_reference(self, text, target_language, reference):
+        """Translate text, passing a similar earlier translation to the prompt."""
+        return self.translate(text, target_language, reference)
+
+    def translate_stream(self, text, target_language):
+        """
+        Translate text with streamGenerateContent, yielding output as it arrives.
+
+        Yields:
+            str: Successive pieces of the translation
+
+        Raises:
+            TranslationError: If the stream cannot be opened after retries
+        """
+        if not self.is_available():
+            yield "Translation failed: Gemini API not available - check API key"
+            return
+
+        if not text or text.strip() == "":
+            return
+
+        url, headers, data = self._build_request(text, target_language)
+        url = url.replace(':generateContent', ':streamGenerateContent', 1) + '?alt=sse'
+        # Skip the thinking phase so the first tokens arrive quickly
+        data['generationConfig']['thinkingConfig'] = {'thinkingBudget': 0}
+
+        response = self._send(url, headers, data, f"{len(text)} characters to {target_language} (stream)", stream=True)
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                try:
+                    event = json.loads(line[5:])
+                except ValueError:
+                    continue
+                for candidate in event.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+
+    def _get_async_session(self):
+        """Get the aiohttp session bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._async_sessions[loop] = session
+        return session
+
+    def _get_async_semaphore(self):
+        """Get the in-flight request limiter bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    async def _send_async(self, url, headers, data, description):
+        """Async counterpart of _send()."""
+        waited = 0.0
+        attempt = 0
+        error = None
+
+        while True:
+            attempt += 1
+
+            # Hold an in-flight slot only while the request is outstanding, not while backing off
+            async with self._get_async_semaphore():
+                key, wait_time = await self._wait_for_rate_limit_async(attempt, waited, error)
+                waited += wait_time
+
+                print(f"[Gemini API] Making async translation request - {description} (attempt {attempt})")
+
+                try:
+                    start_time = time.time()
+                    request_headers = {**headers, 'x-goog-api-key': key.api_key}
+                    async with self._get_async_session().post(url, headers=request_headers, json=data) as response:
+                        status_code = response.status
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            body = None
+                        retry_after_header = response.headers.get('Retry-After')
+                    request_time = time.time() - start_time
+
+                    print(f"[Gemini API] Async request completed in {request_time:.2f}s - Status: {status_code}")
+
+                    if status_code == 200:
+                        self._get_key_pool().report_success(key)
+                        return body
+                    error = self._error_for_status(status_code, retry_after_header, body)
+
+                except asyncio.TimeoutError:
+                    error = TranslationTimeoutError("Request timeout. The translation service is taking too long to respond.")
+                except aiohttp.ClientConnectionError:
+                    error = TranslationConnectionError("Connection error. Please check your internet connection.")
+
+            delay = self._handle_failure(key, error, attempt, waited)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def translate_async(self, text, target_language, reference=None):
+        """Translate text using a native asyncio request to the Gemini API."""
+        if aiohttp is None:
+            # No async HTTP client installed - run the blocking path in a thread
+            return await asyncio.to_thread(self.translate, text, target_language, reference)
+
+        if not self.is_available():
+            return "Translation failed: Gemini API not available - check API key"
+
+        if not text or text.strip() == "":
+            return ""
+
+        url, headers, data = self._build_request(text, target_language, reference)
+        body = await self._send_async(url, headers, data, f"{len(text)} characters to {target_language}")
+        return self._parse_response(body, text)
+
+    async def translate_with_reference_async(self, text, target_language, reference):
+        """Async counterpart of translate_with_reference()."""
+        return await self.translate_async(text, target_language, reference)
+
+    async def translate_segments_async(self, segments, target_language):
+        """
+        Translate segments in one request using schema-constrained JSON output.
+
+        Segments the model drops, merges or duplicates are detected by id and
+        requested again on their own. Falls back to the marker protocol when
+        structured output is disabled.
+        """
+        if not self.structured_output or aiohttp is None:
+            return await super().translate_segments_async(segments, target_language)
+
+        if not self.is_available():
+            return ["Translation failed: Gemini API not available - check API key"] * len(segments)
+
+        results = [None if text.strip() else "" for text in segments]
+        pending = [i for i, text in enumerate(segments) if text.strip()]
+        if not pending:
+            return results
+
+        batch = [segments[i] for i in pending]
+        url, headers, data = self._build_segments_request(batch, target_language)
+        body = await self._send_async(
+            url, headers, data,
+            f"{len(batch)} segments ({sum(len(t) for t in batch)} characters) to {target_language}",
+        )
+        parsed = parse_segments_json(self._parse_response(body, ''), len(batch))
+
+        missing = []
+        for i, translated in zip(pending, parsed):
+            if translated:
+                results[i] = translated
             else:
-                return f"Translation failed: API request failed with status {response.status_code}"
+                missing.append(i)
 
-        except requests.exceptions.Timeout:
-            return "Translation failed: Request timeout. The translation service is taking too long to respond."
-        except requests.exceptions.ConnectionError:
-            return "Translation failed: Connection error. Please check your internet connection."
-        except Exception as e:
-            return f"Translation failed: {str(e)}"
+        if missing:
+            # Only the affected segments are re-requested, each on its own
+            print(f"[Gemini API] {len(missing)} of {len(batch)} segments missing from JSON response - re-requesting")
+            retried = await asyncio.gather(*(self.translate_async(segments[i], target_language) for i in missing))
+            for i, translated in zip(missing, retried):
+                results[i] = translated
+
+        return results
+
+    async def translate_batch_async(self, texts, target_language, max_concurrency=None):
+        """
+        Translate a list of segments in as few requests as the token budget allows.
+
+        Segments are packed in order into chunks that fit the output limit and
+        each chunk is sent through translate_segments_async(), with up to
+        max_concurrency chunks in flight.
+        """
+        if not texts:
+            return []
+        chunks = TokenBudgetChunker(max_input_tokens(self.max_output_tokens)).plan(texts)
+        if len(chunks) == len(texts):
+            # Nothing to pack: one segment per request either way
+            return await super().translate_batch_async(texts, target_language, max_concurrency)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+
+        async def translate_chunk(chunk):
+            async with semaphore:
+                return await self.translate_segments_async([texts[i] for i in chunk], target_language)
+
+        results = [""] * len(texts)
+        translated_chunks = await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        for chunk, translated in zip(chunks, translated_chunks):
+            for i, text in zip(chunk, translated):
+                results[i] = text
+        return results
+
+    async def close_async(self):
+        """Close the aiohttp session bound to the running event loop."""
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
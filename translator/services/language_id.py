@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Small local language identifier.
+Writing-system detection for scripts used by one language, and
+character-trigram naive Bayes models for Latin script and for scripts shared
+by several languages, trained at import on the short parallel samples below.
+No network calls and no model files.
+"""
+
+import math
+import unicodedata
+from collections import Counter
+
+# Parallel samples (same content in each language) so the model learns the
+# language rather than the topic
+_SAMPLES = {
+    'en': (
+        "The parties agree that this contract shall remain in force for a period of two years from the date of "
+        "signature. All payments must be made within thirty days of receiving the invoice. The company is not "
+        "responsible for any damage caused by the improper use of the product. This report describes the results "
+        "of the study and the main recommendations for the coming year. If you have any questions, please contact "
+        "our customer service team by email or by phone. Information in this document may change without notice "
+        "and should not be considered a commitment. We would like to thank everyone who took part in the survey "
+        "and shared their experience with us."
+    ),
+    'fr': (
+        "Les parties conviennent que le présent contrat restera en vigueur pendant une période de deux ans à "
+        "compter de la date de signature. Tous les paiements doivent être effectués dans les trente jours suivant "
+        "la réception de la facture. La société n'est pas responsable des dommages causés par une utilisation "
+        "incorrecte du produit. Ce rapport décrit les résultats de l'étude et les principales recommandations pour "
+        "l'année à venir. Si vous avez des questions, veuillez contacter notre service client par courriel ou par "
+        "téléphone. Les informations contenues dans ce document peuvent changer sans préavis et ne doivent pas être "
+        "considérées comme un engagement. Nous remercions toutes les personnes qui ont participé à l'enquête et qui "
+        "ont partagé leur expérience avec nous."
+    ),
+    'es': (
+        "Las partes acuerdan que el presente contrato permanecerá en vigor durante un período de dos años a partir "
+        "de la fecha de la firma. Todos los pagos deben realizarse dentro de los treinta días siguientes a la "
+        "recepción de la factura. La empresa no se hace responsable de los daños causados por el uso indebido del "
+        "producto. Este informe describe los resultados del estudio y las principales recomendaciones para el "
+        "próximo año. Si tiene alguna pregunta, póngase en contacto con nuestro equipo de atención al cliente por "
+        "correo electrónico o por teléfono. La información de este documento puede cambiar sin previo aviso y no "
+        "debe considerarse un compromiso. Queremos dar las gracias a todas las personas que participaron en la "
+        "encuesta y compartieron su experiencia con nosotros."
+    ),
+    'de': (
+        "Die Parteien vereinbaren, dass dieser Vertrag für einen Zeitraum von zwei Jahren ab dem Datum der "
+        "Unterzeichnung in Kraft bleibt. Alle Zahlungen müssen innerhalb von dreißig Tagen nach Erhalt der Rechnung "
+        "erfolgen. Das Unternehmen haftet nicht für Schäden, die durch die unsachgemäße Verwendung des Produkts "
+        "entstehen. Dieser Bericht beschreibt die Ergebnisse der Studie und die wichtigsten Empfehlungen für das "
+        "kommende Jahr. Wenn Sie Fragen haben, wenden Sie sich bitte per E-Mail oder telefonisch an unseren "
+        "Kundendienst. Die Informationen in diesem Dokument können sich ohne vorherige Ankündigung ändern und sind "
+        "nicht als Verpflichtung zu verstehen. Wir danken allen, die an der Umfrage teilgenommen und ihre "
+        "Erfahrungen mit uns geteilt haben."
+    ),
+    'it': (
+        "Le parti concordano che il presente contratto rimarrà in vigore per un periodo di due anni dalla data "
+        "della firma. Tutti i pagamenti devono essere effettuati entro trenta giorni dal ricevimento della fattura. "
+        "La società non è responsabile per eventuali danni causati da un uso improprio del prodotto. Questa "
+        "relazione descrive i risultati dello studio e le principali raccomandazioni per il prossimo anno. Se avete "
+        "domande, contattate il nostro servizio clienti via e-mail o per telefono. Le informazioni contenute in "
+        "questo documento possono cambiare senza preavviso e non devono essere considerate un impegno. Ringraziamo "
+        "tutti coloro che hanno partecipato al sondaggio e hanno condiviso con noi la loro esperienza."
+    ),
+    'pt': (
+        "As partes concordam que o presente contrato permanecerá em vigor por um período de dois anos a partir da "
+        "data da assinatura. Todos os pagamentos devem ser efetuados no prazo de trinta dias após o recebimento da "
+        "fatura. A empresa não se responsabiliza por quaisquer danos causados pelo uso indevido do produto. Este "
+        "relatório descreve os resultados do estudo e as principais recomendações para o próximo ano. Se tiver "
+        "alguma dúvida, entre em contato com a nossa equipe de atendimento ao cliente por e-mail ou por telefone. "
+        "As informações contidas neste documento podem mudar sem aviso prévio e não devem ser consideradas um "
+        "compromisso. Agradecemos a todos que participaram da pesquisa e compartilharam a sua experiência conosco."
+    ),
+    'nl': (
+        "De partijen komen overeen dat deze overeenkomst gedurende een periode van twee jaar vanaf de datum van "
+        "ondertekening van kracht blijft. Alle betalingen moeten binnen dertig dagen na ontvangst van de factuur "
+        "worden voldaan. Het bedrijf is niet aansprakelijk voor schade die wordt veroorzaakt door onjuist gebruik "
+        "van het product. Dit rapport beschrijft de resultaten van het onderzoek en de belangrijkste aanbevelingen "
+        "voor het komende jaar. Als u vragen heeft, neem dan per e-mail of telefonisch contact op met onze "
+        "klantenservice. De informatie in dit document kan zonder voorafgaande kennisgeving worden gewijzigd en mag "
+        "niet als een verplichting worden beschouwd. Wij danken iedereen die aan de enquête heeft deelgenomen en "
+        "zijn ervaring met ons heeft gedeeld."
+    ),
+}
+
+# Frequent words, which carry most of the signal in short texts
+_COMMON_WORDS = {
+    'en': "the of and to in is that for it as was with be by on not he this are or his from at which but have an "
+          "they you were her she there been one all we their has would when if will more no out so what up about "
+          "into than them can only other new some could these two may then do first any like now my such our over "
+          "also after should well where most through between each under because while does without however",
+    'fr': "le la les de des du et un une est que qui dans pour pas sur au aux ce cette il elle ils nous vous sont "
+          "avec plus par ont mais comme tout leur bien aussi fait être été sans entre très même deux peut donc "
+          "avant après encore alors toujours depuis chaque autre nos votre notre où ainsi lors selon vers moins",
+    'es': "el la los las de del y en un una es que por para con no se su sus al lo como más pero fue ha son "
+          "este esta entre cuando muy sin sobre también hasta hay donde desde todo nos durante todos uno les ni "
+          "otros ese eso ante ellos esto mí antes algunos qué unos yo otro otras otra él tanto esa estos mucho",
+    'de': "der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als auch es an werden aus "
+          "er hat dass sie nach wird bei einer um am sind noch wie einem über einen so zum war haben nur oder aber "
+          "vor zur bis mehr durch man sein wurde sei hier wenn können ihr schon zwischen immer ohne sehr unter",
+    'it': "il di che la e in un una per è non del della con sono le da si al lo gli dei delle nel alla anche come "
+          "più ma ha questo questa essere sul quando tra già molto fatto stato dopo senza ancora tutti loro fra "
+          "sempre ogni cui perché però mentre degli dalla nella sua suo hanno stata uno due tutto così",
+    'pt': "o a os as de do da dos das e em um uma é que para com não no na por mais se como mas foi ao ele ela "
+          "seu sua ou ser quando muito há nos já está também só pelo pela até isso entre era depois sem mesmo "
+          "aos ter seus quem nas me esse eles estão você tinha foram essa num nem suas meu às minha têm numa",
+    'nl': "de het een van en in is dat op te zijn met voor niet aan er om ook als bij door maar dan nog naar wordt "
+          "uit over tot worden zo kan al heeft meer moet hun deze geen wel heb na wat omdat hebben werd zich "
+          "onder tussen waar zonder tegen haar wij jullie zij mijn zal dit veel hier",
+}
+_SAMPLES = {lang: f"{text} {_COMMON_WORDS[lang]}" for lang, text in _SAMPLES.items()}
+
+# Target language names used by the UI, plus ISO codes
+LANGUAGE_CODES = {
+    'english': 'en', 'french': 'fr', 'spanish': 'es', 'german': 'de', 'italian': 'it',
+    'portuguese': 'pt', 'dutch': 'nl', 'russian': 'ru', 'japanese': 'ja', 'korean': 'ko',
+    'arabic': 'ar', 'hindi': 'hi', 'greek': 'el', 'hebrew': 'he', 'thai': 'th',
+    'chinese': 'zh', 'simplified chinese': 'zh', 'traditional chinese': 'zh',
+    'bulgarian': 'bg', 'ukrainian': 'uk', 'marathi': 'mr', 'nepali': 'ne', 'persian': 'fa', 'urdu': 'ur',
+}
+
+# Languages sharing a script, told apart by trigrams: same parallel content as above, shortened
+_SHARED_SCRIPT_SAMPLES = {
+    # Cyrillic
+    'ru': {
+        'ru': "Стороны соглашаются, что настоящий договор остаётся в силе в течение двух лет с даты подписания. "
+              "Все платежи должны быть произведены в течение тридцати дней с момента получения счёта. В этом "
+              "отчёте описаны результаты исследования и основные рекомендации на следующий год. Если у вас есть "
+              "вопросы, пожалуйста, свяжитесь с нашей службой поддержки клиентов по электронной почте или по "
+              "телефону. Мы благодарим всех, кто принял участие в опросе и поделился с нами своим опытом. "
+              "и в не на что он с как а то все она так его но да к у же вы за бы по только мне было вот от еще "
+              "нет о из ему теперь когда уже или ни быть был до вас там потом себя может они тут где есть надо "
+              "для мы их чем была сам без чего тоже себе под будет тогда кто этот того потому этого какой здесь "
+              "этом один чтобы сейчас были всех можно при два об другой после над больше через эти нас про",
+        'bg': "Страните се съгласяват, че настоящият договор остава в сила за срок от две години от датата на "
+              "подписването. Всички плащания трябва да бъдат извършени в рамките на тридесет дни след "
+              "получаването на фактурата. Този доклад описва резултатите от проучването и основните препоръки "
+              "за следващата година. Ако имате въпроси, моля, свържете се с нашия екип за обслужване на клиенти "
+              "по имейл или по телефона. Благодарим на всички, които участваха в анкетата и споделиха своя опит "
+              "с нас. и в на не да се че е за от с са по това как като той тя те но ще какво което който които "
+              "също още много трябва може има няма бъде беше били или ако когато след преди между без при към "
+              "до във със върху тук там сега само вече всички всичко нещо един една едно тази този тези",
+        'uk': "Сторони погоджуються, що цей договір залишається чинним протягом двох років з дати підписання. "
+              "Усі платежі мають бути здійснені протягом тридцяти днів з моменту отримання рахунку. У цьому "
+              "звіті описано результати дослідження та основні рекомендації на наступний рік. Якщо у вас є "
+              "запитання, будь ласка, зв'яжіться з нашою службою підтримки клієнтів електронною поштою або "
+              "телефоном. Ми дякуємо всім, хто взяв участь в опитуванні та поділився з нами своїм досвідом. "
+              "і в не на що він з як а то все вона так його але та до у же ви за би по тільки мені було від ще "
+              "ні о із йому тепер коли вже або бути був там потім себе може вони тут де є треба для ми їх чим",
+    },
+    # Devanagari
+    'hi': {
+        'hi': "दोनों पक्ष सहमत हैं कि यह अनुबंध हस्ताक्षर की तारीख से दो वर्ष की अवधि तक लागू रहेगा। सभी भुगतान "
+              "चालान प्राप्त होने के तीस दिनों के भीतर किए जाने चाहिए। यह रिपोर्ट अध्ययन के परिणामों और आने वाले "
+              "वर्ष के लिए मुख्य सिफारिशों का वर्णन करती है। यदि आपके कोई प्रश्न हैं, तो कृपया ईमेल या फ़ोन द्वारा "
+              "हमारी ग्राहक सेवा टीम से संपर्क करें। हम सर्वेक्षण में भाग लेने वाले और अपना अनुभव साझा करने वाले "
+              "सभी लोगों को धन्यवाद देते हैं। के है में की और को से एक यह पर कि भी नहीं हैं था लिए ने तो कर जो "
+              "हो गया किया या रहा अपने वह इस उस कुछ होता करने साथ बाद सकता जा दिया थे तक जब कोई",
+        'mr': "दोन्ही पक्ष सहमत आहेत की हा करार स्वाक्षरीच्या तारखेपासून दोन वर्षांच्या कालावधीसाठी लागू राहील. "
+              "सर्व देयके बीजक मिळाल्यापासून तीस दिवसांच्या आत करणे आवश्यक आहे. हा अहवाल अभ्यासाचे निष्कर्ष आणि "
+              "पुढील वर्षासाठीच्या मुख्य शिफारसींचे वर्णन करतो. आपल्याला काही प्रश्न असल्यास, कृपया ईमेल किंवा "
+              "फोनद्वारे आमच्या ग्राहक सेवा संघाशी संपर्क साधा. सर्वेक्षणात सहभागी झालेल्या आणि आपला अनुभव "
+              "सांगणाऱ्या सर्वांचे आम्ही आभार मानतो. आहे आणि या हे की व ते त्या आहेत होते करून केले होता म्हणून "
+              "मी तो ती आम्ही तुम्ही त्यांनी त्यांच्या काही नाही पण किंवा असे असा अशी येथे तेथे सर्व एक दोन झाले",
+        'ne': "दुवै पक्षहरू सहमत छन् कि यो सम्झौता हस्ताक्षर गरेको मितिदेखि दुई वर्षको अवधिसम्म लागू रहनेछ। सबै "
+              "भुक्तानीहरू बीजक प्राप्त भएको तीस दिनभित्र गरिनुपर्छ। यो प्रतिवेदनले अध्ययनका नतिजा र आगामी वर्षका "
+              "लागि मुख्य सिफारिसहरूको वर्णन गर्छ। यदि तपाईंसँग कुनै प्रश्न छ भने, कृपया इमेल वा फोनमार्फत हाम्रो "
+              "ग्राहक सेवा टोलीलाई सम्पर्क गर्नुहोस्। सर्वेक्षणमा भाग लिने र आफ्नो अनुभव बाँड्ने सबैलाई हामी "
+              "धन्यवाद दिन्छौं। र छ हो यो त्यो को का की मा ले लाई पनि छन् थियो गर्न भएको गरेको हुन्छ हुने उनी "
+              "उनको हामी तपाईं यस उक्त भने तर वा सबै एक दुई",
+    },
+}
+
+
+def _words(text):
+    """Lower-cased words; combining marks (e.g. Devanagari vowel signs) stay part of their word."""
+    return "".join(
+        char if char.isalpha() or unicodedata.category(char).startswith('M') else " "
+        for char in text.lower()
+    ).split()
+
+
+def language_code(name):
+    """ISO code for a language name or code, or None if unknown."""
+    key = name.strip().lower()
+    if key in LANGUAGE_CODES.values():
+        return key
+    return LANGUAGE_CODES.get(key)
+
+
+def _trigrams(text):
+    for word in _words(text):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3]
+
+
+class _TrigramModel:
+    """Multinomial naive Bayes over character trigrams with add-one smoothing."""
+
+    def __init__(self, samples):
+        counts = {lang: Counter(_trigrams(text)) for lang, text in samples.items()}
+        vocabulary = set().union(*counts.values())
+        self.log_probs = {}
+        self.unseen = {}
+        for lang, counter in counts.items():
+            total = sum(counter.values()) + len(vocabulary) + 1
+            self.log_probs[lang] = {gram: math.log((n + 1) / total) for gram, n in counter.items()}
+            self.unseen[lang] = math.log(1 / total)
+
+    def scores(self, text):
+        """Average log-probability per trigram for each language."""
+        grams = list(_trigrams(text))
+        if not grams:
+            return {}
+        return {
+            lang: sum(probs.get(gram, self.unseen[lang]) for gram in grams) / len(grams)
+            for lang, probs in self.log_probs.items()
+        }
+
+
+_model = _TrigramModel(_SAMPLES)
+_shared_script_models = {script: _TrigramModel(samples) for script, samples in _SHARED_SCRIPT_SAMPLES.items()}
+
+# Unicode blocks of scripts, named after their main language. Scripts with a
+# model in _SHARED_SCRIPT_SAMPLES or markers in _SCRIPT_VARIANTS are shared by
+# several languages; the others identify their language on their own
+_SCRIPTS = [
+    ('ko', ((0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F))),
+    ('ja', ((0x3040, 0x30FF),)),
+    ('zh', ((0x4E00, 0x9FFF), (0x3400, 0x4DBF))),
+    ('ru', ((0x0400, 0x04FF),)),
+    ('ar', ((0x0600, 0x06FF),)),
+    ('hi', ((0x0900, 0x097F),)),
+    ('el', ((0x0370, 0x03FF),)),
+    ('he', ((0x0590, 0x05FF),)),
+    ('th', ((0x0E00, 0x0E7F),)),
+]
+
+# Letters that set a language apart from the others sharing its script, checked in order
+_SCRIPT_VARIANTS = {
+    # Bulgarian and Ukrainian have no ы, э or ё
+    'ru': (('uk', set("іїєґІЇЄҐ")), ('be', set("ўЎ")), ('sr', set("ђјљњћџЂЈЉЊЋЏ")), ('ru', set("ыэёЫЭЁ"))),
+    # Persian also has its own forms of kaf and yeh
+    'ar': (('ur', set("ٹڈڑںےھ")), ('fa', set("پچژگکی"))),
+}
+
+
+def _script_counts(text):
+    counts = Counter()
+    for char in text:
+        code = ord(char)
+        for lang, ranges in _SCRIPTS:
+            if any(lo <= code <= hi for lo, hi in ranges):
+                counts[lang] += 1
+                break
+        else:
+            if char.isalpha():
+                counts['latin'] += 1
+    return counts
+
+
+def _best_language(model, text, min_margin):
+    """Most likely language under a trigram model, with a 0-1 confidence from its lead."""
+    scores = model.scores(text)
+    if len(scores) < 2:
+        return None, 0.0
+    (best, best_score), (_, second_score) = sorted(scores.items(), key=lambda item: -item[1])[:2]
+    margin = best_score - second_score
+    if margin < min_margin:
+        return None, 0.0
+    return best, min(1.0, margin / (2 * min_margin))
+
+
+def detect_language(text, min_margin=0.15, min_latin_letters=20):
+    """
+    Identify the language of a text.
+
+    Args:
+        text (str): Text to identify
+        min_margin (float): Required lead of the best language over the
+            runner-up when trigrams decide, in average log-probability per trigram
+        min_latin_letters (int): Latin-script texts shorter than this are
+            not identified, since a few trigrams cannot tell the languages apart
+
+    Returns:
+        tuple: (ISO code or None, confidence between 0 and 1)
+    """
+    counts = _script_counts(text)
+    letters = sum(counts.values())
+    if not letters:
+        return None, 0.0
+
+    script, count = counts.most_common(1)[0]
+    share = count / letters
+    if script != 'latin':
+        # Kana decides Japanese even when Han characters are the majority
+        if script == 'zh' and counts['ja'] / letters > 0.1:
+            script = 'ja'
+        for variant, marker_letters in _SCRIPT_VARIANTS.get(script, ()):
+            if any(char in marker_letters for char in text):
+                return variant, share
+        model = _shared_script_models.get(script)
+        if model is None:
+            return script, share
+        # Cyrillic is also Bulgarian, Devanagari also Marathi, ...: the script alone proves nothing
+        language, confidence = _best_language(model, text, min_margin)
+        return language, share * confidence
+
+    if count < min_latin_letters:
+        return None, 0.0
+    language, confidence = _best_language(_model, text, min_margin)
+    return language, share * confidence
@@ -0,0 +1,9 @@
+"""Local transformer inference: dynamic batching, prefix caching, generation helpers and the CPU service"""
+
+from .batcher import DynamicBatcher
+from .generation import BatchedGenerator, build_prompt, clean_output, generate_batch, prepare_tokenizer
+from .prefix_cache import PrefixCache, split_prompt
+from .service import LocalTranslationService, load_cpu_model, quantize_for_cpu
+
+# Create global instance
+local_service = LocalTranslationService()
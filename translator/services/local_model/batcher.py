@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Dynamic request batching for local models.
+Requests from concurrent callers are queued and grouped into batches: a
+batch is run as soon as it is full or when its oldest request has waited
+max_wait seconds, whichever comes first.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DynamicBatcher:
+    """Feeds queued requests to a batch function on one worker thread."""
+
+    def __init__(self, process_batch, max_batch_size=8, max_wait=0.01, name="local-model-batcher"):
+        """
+        Args:
+            process_batch (callable): Takes a list of requests and returns one result per request;
+                a result that is an exception instance is raised to that request's caller alone
+            max_batch_size (int): Largest batch handed to process_batch
+            max_wait (float): Seconds the first request of a batch waits for others to join
+            name (str): Worker thread name
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+        self._batches = 0
+        self._requests = 0
+        self._largest_batch = 0
+        self._queue_wait = 0.0
+
+    def submit(self, request):
+        """
+        Queue one request.
+
+        Args:
+            request: Passed to process_batch as one element of its list
+
+        Returns:
+            concurrent.futures.Future: Resolves to the request's result
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Batcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((request, future, time.monotonic()))
+        return future
+
+    def run(self, request, timeout=None):
+        """Submit one request and wait for its result."""
+        return self.submit(request).result(timeout)
+
+    def _next_batch(self):
+        """Block for the first request, then collect more until the batch is full or the window closes."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Closing: finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            started = time.monotonic()
+            with self._lock:
+                self._batches += 1
+                self._requests += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._queue_wait += sum(started - enqueued for _, _, enqueued in batch)
+
+            try:
+                results = self.process_batch([request for request, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} requests")
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def close(self):
+        """Stop the worker after the queued requests have been served."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+    def get_stats(self):
+        """Batching counters."""
+        with self._lock:
+            return {
+                'batches': self._batches,
+                'requests': self._requests,
+                'queued': self._queue.qsize(),
+                'largest_batch': self._largest_batch,
+                'mean_batch_size': round(self._requests / self._batches, 2) if self._batches else 0.0,
+                'mean_queue_wait': round(self._queue_wait / self._requests, 4) if self._requests else 0.0,
+                'max_batch_size': self.max_batch_size,
+                'max_wait': self.max_wait,
+            }
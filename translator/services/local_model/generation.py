@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Batched generation for local causal translation models.
+Prompts from several callers are left-padded into one batch and decoded
+together in a single model.generate() call. Each prompt gets a generation
+budget sized from its input and language pair, decoding stops at the end of
+the answer, and outputs cut off by their budget are rejected. With a
+PrefixCache, the instruction prefix shared by one language's prompts is not
+encoded again.
+"""
+
+import math
+import os
+import re
+from collections import namedtuple
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    from transformers import StoppingCriteria, StoppingCriteriaList
+except ImportError:
+    StoppingCriteria = object
+    StoppingCriteriaList = list
+
+from ..errors import TranslationResponseError
+from ..language_id import detect_language, language_code
+from .batcher import DynamicBatcher
+from .prefix_cache import PrefixCache
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_BATCH_WAIT_MS = 10
+
+# Tokens per English-equivalent token in each language (Qwen tokenizer); the
+# target/source ratio estimates how long a translation comes out
+TOKEN_RATIOS = {
+    'en': 1.0, 'fr': 1.25, 'es': 1.2, 'pt': 1.2, 'it': 1.25, 'de': 1.3, 'nl': 1.25,
+    'ru': 1.5, 'uk': 1.6, 'ar': 1.4, 'he': 1.4, 'hi': 1.8, 'el': 1.9, 'th': 1.6,
+    'ko': 1.1, 'ja': 1.0, 'zh': 0.8,
+}
+DEFAULT_TOKEN_RATIO = 1.3
+# Headroom over the estimate, plus a fixed allowance for short inputs
+BUDGET_MARGIN = 1.5
+BUDGET_SLACK = 8
+MIN_BUDGET = 16
+
+# What a chatty model writes after the translation: a blank line, or a
+# "Note:"/"Explanation:" style remark on a new line
+END_OF_ANSWER = re.compile(
+    r"\n\s*\n|\n\s*\(?(?:Note|Notes|Explanation|Translation|Translated text|Original|Alternatively)\b",
+    re.IGNORECASE,
+)
+# Tokens decoded per row when looking for END_OF_ANSWER
+_STOP_WINDOW_TOKENS = 8
+
+GenerationResult = namedtuple('GenerationResult', 'text tokens budget truncated')
+
+
+def build_prompt(text, target_language):
+    """
+    Instruction the local models are prompted with.
+
+    The target language comes before the text, so everything up to the text
+    is shared by all prompts to one language (see PrefixCache).
+    """
+    return f'Only output the translated words. Translate to {target_language}: "{text}"'
+
+
+def has_paragraphs(text):
+    """True if a source text has blank lines, which its translation will too."""
+    return bool(re.search(r"\n\s*\n", text))
+
+
+def clean_output(generated_text, cut_at_end_of_answer=True):
+    """Cut anything after the answer, then strip whitespace and echoed quotes."""
+    match = END_OF_ANSWER.search(generated_text) if cut_at_end_of_answer else None
+    if match:
+        generated_text = generated_text[:match.start()]
+    translated_text = generated_text.strip()
+    if len(translated_text) >= 2 and translated_text.startswith('"') and translated_text.endswith('"'):
+        translated_text = translated_text[1:-1]
+    return translated_text
+
+
+def generation_budget(input_tokens, source_language, target_language, cap):
+    """
+    Maximum new tokens for one translation.
+
+    Args:
+        input_tokens (int): Tokens in the text to translate (not the prompt)
+        source_language (str or None): ISO code of the text; None counts as English
+        target_language (str): Target language name or code
+        cap (int): Upper bound
+
+    Returns:
+        int: Budget between MIN_BUDGET and cap
+    """
+    source_ratio = TOKEN_RATIOS.get(source_language or 'en', DEFAULT_TOKEN_RATIO)
+    target_ratio = TOKEN_RATIOS.get(language_code(target_language) or '', DEFAULT_TOKEN_RATIO)
+    estimate = input_tokens * target_ratio / source_ratio
+    return max(min(MIN_BUDGET, cap), min(cap, math.ceil(estimate * BUDGET_MARGIN) + BUDGET_SLACK))
+
+
+def prepare_tokenizer(tokenizer):
+    """Set up a tokenizer for batched decoder-only generation (left padding, a pad token)."""
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token_id is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+def render_prompts(tokenizer, requests):
+    """Chat-formatted prompt strings for (text, target_language) pairs."""
+    return [
+        tokenizer.apply_chat_template(
+            [{"role": "user", "content": build_prompt(text, target_language)}],
+            add_generation_prompt=True,
+            tokenize=False,
+        )
+        for text, target_language in requests
+    ]
+
+
+class AnswerStoppingCriteria(StoppingCriteria):
+    """
+    Per-row stop: at the end-of-sequence token, at an END_OF_ANSWER pattern
+    (unless the row's source has paragraphs of its own), or when the row's
+    own budget is spent.
+
+    Records why each row stopped in `reasons` ('eos', 'end_of_answer' or
+    'budget'); rows still running when generate() returns have None.
+    Returns one flag per row, which generate() supports from transformers 4.39.
+    """
+
+    def __init__(self, tokenizer, prompt_length, budgets, stop_at_end_of_answer):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.budgets = budgets
+        self.stop_at_end_of_answer = stop_at_end_of_answer
+        self.eos_token_ids = {token for token in (tokenizer.eos_token_id, tokenizer.pad_token_id) if token is not None}
+        self.reasons = [None] * len(budgets)
+
+    def __call__(self, input_ids, scores, **kwargs):
+        generated = input_ids.shape[-1] - self.prompt_length
+        for row in range(input_ids.shape[0]):
+            if self.reasons[row] is not None:
+                continue
+            if int(input_ids[row, -1]) in self.eos_token_ids:
+                self.reasons[row] = 'eos'
+            elif self.stop_at_end_of_answer[row] and END_OF_ANSWER.search(self.tokenizer.decode(
+                    input_ids[row, -min(generated, _STOP_WINDOW_TOKENS):], skip_special_tokens=True)):
+                self.reasons[row] = 'end_of_answer'
+            elif generated >= self.budgets[row]:
+                self.reasons[row] = 'budget'
+        return torch.tensor([reason is not None for reason in self.reasons], device=input_ids.device)
+
+
+def _prompt_inputs(model, tokenizer, requests, prefix_cache):
+    """
+    Model inputs for a batch. With a prefix cache, input_ids are the cached
+    prefix followed by the left-padded text and tail, and the prefix's
+    key/values are passed along so only the part after it is prefilled.
+    """
+    languages = {target_language for _, target_language in requests}
+    if prefix_cache is None or len(languages) != 1:
+        return dict(tokenizer(
+            render_prompts(tokenizer, requests),
+            return_tensors="pt",
+            padding=True,
+            add_special_tokens=False,
+        ).to(model.device))
+
+    prefix_ids, tail, past_key_values = prefix_cache.for_batch(languages.pop(), len(requests))
+    suffix = tokenizer(
+        [text + tail for text, _ in requests],
+        return_tensors="pt",
+        padding=True,
+        add_special_tokens=False,
+    ).to(model.device)
+    # Padding sits between prefix and text; positions come from the attention mask, so they match an unpadded prompt
+    return {
+        "input_ids": torch.cat([prefix_ids, suffix["input_ids"]], dim=-1),
+        "attention_mask": torch.cat([torch.ones_like(prefix_ids), suffix["attention_mask"]], dim=-1),
+        "past_key_values": past_key_values,
+    }
+
+
+def generate_batch(model, tokenizer, requests, max_new_tokens, budgets=None, prefix_cache=None):
+    """
+    Translate several texts in one padded batch.
+
+    Args:
+        model: Causal language model
+        tokenizer: Its tokenizer, prepared with prepare_tokenizer()
+        requests (list): (text, target_language) pairs
+        max_new_tokens (int): Upper bound on any row's budget
+        budgets (list, optional): Per-request budgets; sized by generation_budget() if omitted
+        prefix_cache (PrefixCache, optional): Reused when all requests share a target language
+
+    Returns:
+        list: GenerationResult per request, in request order
+    """
+    if budgets is None:
+        input_tokens = tokenizer([text for text, _ in requests], add_special_tokens=False)["input_ids"]
+        budgets = [
+            generation_budget(len(tokens), detect_language(text)[0], target_language, max_new_tokens)
+            for tokens, (text, target_language) in zip(input_tokens, requests)
+        ]
+
+    inputs = _prompt_inputs(model, tokenizer, requests, prefix_cache)
+    # With left padding every prompt ends at the same position
+    prompt_length = inputs["input_ids"].shape[-1]
+    single_paragraph = [not has_paragraphs(text) for text, _ in requests]
+    stopping = AnswerStoppingCriteria(tokenizer, prompt_length, budgets, single_paragraph)
+
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=max(budgets),
+            do_sample=False,
+            pad_token_id=tokenizer.pad_token_id,
+            stopping_criteria=StoppingCriteriaList([stopping]),
+            use_cache=True,
+        )
+
+    results = []
+    for row, output in enumerate(outputs):
+        new_tokens = output[prompt_length:]
+        reason = stopping.reasons[row]
+        # A row still running when generate() returned was cut off by the batch limit
+        truncated = reason in (None, 'budget')
+        # Finished rows are padded until the whole batch stops
+        stop_ids = torch.isin(new_tokens, torch.tensor(sorted(stopping.eos_token_ids), device=new_tokens.device))
+        used = len(new_tokens)
+        if stop_ids.any():
+            used = int(stop_ids.nonzero()[0]) + (1 if reason == 'eos' else 0)
+        results.append(GenerationResult(
+            clean_output(tokenizer.decode(new_tokens[:used], skip_special_tokens=True), single_paragraph[row]),
+            used,
+            budgets[row],
+            truncated,
+        ))
+    return results
+
+
+class BatchedGenerator:
+    """
+    Serves translations from one loaded model through a DynamicBatcher.
+
+    Callers on any thread call translate() (or await submit()'s future);
+    requests arriving within the batching window share one generate() call.
+    An output cut off by its budget is generated again with twice the budget
+    (up to max_new_tokens); if that is still not enough it is rejected.
+    Requests are generated in one group per target language, each starting
+    from that language's cached prefix unless prefix_cache is False.
+    """
+
+    def __init__(self, model, tokenizer, max_new_tokens=256, max_batch_size=None, max_wait=None, prefix_cache=None):
+        self.model = model
+        self.tokenizer = prepare_tokenizer(tokenizer)
+        self.max_new_tokens = max_new_tokens
+        if max_batch_size is None:
+            max_batch_size = int(os.environ.get('LOCAL_MAX_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE))
+        if max_wait is None:
+            max_wait = float(os.environ.get('LOCAL_MAX_BATCH_WAIT_MS', DEFAULT_MAX_BATCH_WAIT_MS)) / 1000
+        if prefix_cache is None:
+            prefix_cache = os.environ.get('LOCAL_PREFIX_CACHE', '1') != '0'
+        self.prefix_cache = PrefixCache(model, self.tokenizer, build_prompt) if prefix_cache else None
+        self.batcher = DynamicBatcher(self._run_batch, max_batch_size=max_batch_size, max_wait=max_wait)
+
+    def _generate_group(self, requests):
+        results = generate_batch(self.model, self.tokenizer, requests, self.max_new_tokens,
+                                 prefix_cache=self.prefix_cache)
+
+        retry = [i for i, result in enumerate(results) if result.truncated and result.budget < self.max_new_tokens]
+        if retry:
+            retried = generate_batch(
+                self.model, self.tokenizer, [requests[i] for i in retry], self.max_new_tokens,
+                budgets=[min(self.max_new_tokens, results[i].budget * 2) for i in retry],
+                prefix_cache=self.prefix_cache,
+            )
+            for i, result in zip(retry, retried):
+                results[i] = result
+        return results
+
+    def _run_batch(self, requests):
+        groups = {}
+        for i, (_, target_language) in enumerate(requests):
+            groups.setdefault(target_language, []).append(i)
+        results = [None] * len(requests)
+        for indices in groups.values():
+            for i, result in zip(indices, self._generate_group([requests[i] for i in indices])):
+                results[i] = result
+
+        # A cut-off answer fails its own request only, so the manager can fail over for that text
+        return [
+            TranslationResponseError(f"Local model output truncated at {result.tokens} tokens")
+            if result.truncated else result.text
+            for result in results
+        ]
+
+    def submit(self, text, target_language):
+        """Queue one translation; returns a concurrent.futures.Future."""
+        return self.batcher.submit((text, target_language))
+
+    def translate(self, text, target_language):
+        """Translate one text, sharing a batch with concurrent callers."""
+        return self.submit(text, target_language).result()
+
+    def get_stats(self):
+        stats = self.batcher.get_stats()
+        if self.prefix_cache is not None:
+            stats['prefix_cache'] = self.prefix_cache.get_stats()
+        return stats
+
+    def close(self):
+        self.batcher.close()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cached key/values for the instruction prefix of local translation prompts.
+Everything in a chat-formatted prompt before the user's text (system turn,
+chat markup, instruction and target language) is the same for every request
+to one language. It is encoded once per language, and each batch starts from
+a copy of its past key/values, so prefill only covers the user text.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+# Stands in for the user text when the prompt is split into prefix and tail
+# (a private-use character, so it never occurs in a chat template)
+_TEXT_MARKER = "\ue000"
+
+
+def split_prompt(tokenizer, target_language, build_prompt):
+    """
+    Split the chat-formatted prompt for a language around the user text.
+
+    Returns:
+        tuple: (prefix, tail) strings; a prompt is prefix + text + tail
+    """
+    rendered = tokenizer.apply_chat_template(
+        [{"role": "user", "content": build_prompt(_TEXT_MARKER, target_language)}],
+        add_generation_prompt=True,
+        tokenize=False,
+    )
+    prefix, tail = rendered.split(_TEXT_MARKER)
+    return prefix, tail
+
+
+class PrefixCache:
+    """
+    Per-language prefix key/values for one model, least recently used first out.
+
+    Prefix tokens and their key/values are computed on first use of a
+    language. Callers get a fresh copy repeated to their batch size, because
+    generate() appends to the cache it is given. Needs the DynamicCache API of
+    transformers 4.44 (the version pinned in requirements.txt).
+    """
+
+    def __init__(self, model, tokenizer, build_prompt, max_languages=16):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.build_prompt = build_prompt
+        self.max_languages = max_languages
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _encode(self, target_language):
+        import torch
+        from transformers import DynamicCache
+
+        prefix, tail = split_prompt(self.tokenizer, target_language, self.build_prompt)
+        prefix_ids = self.tokenizer(prefix, return_tensors="pt", add_special_tokens=False)["input_ids"]
+        prefix_ids = prefix_ids.to(self.model.device)
+        with torch.no_grad():
+            past = self.model(input_ids=prefix_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+        return prefix_ids, tail, past
+
+    def get(self, target_language):
+        """
+        Prefix for a language, encoding it if needed.
+
+        Returns:
+            tuple: (prefix_ids tensor of shape (1, n), tail string, past key/values)
+        """
+        with self._lock:
+            entry = self._entries.get(target_language)
+            if entry is not None:
+                self._entries.move_to_end(target_language)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = self._encode(target_language)
+            self._entries[target_language] = entry
+            if len(self._entries) > self.max_languages:
+                self._entries.popitem(last=False)
+            return entry
+
+    def for_batch(self, target_language, batch_size):
+        """
+        Prefix ids, tail and a private copy of the key/values for a batch.
+
+        Returns:
+            tuple: (prefix_ids of shape (batch_size, n), tail string, past key/values)
+        """
+        prefix_ids, tail, past = self.get(target_language)
+        past = copy.deepcopy(past)
+        if batch_size > 1:
+            past.batch_repeat_interleave(batch_size)
+        return prefix_ids.expand(batch_size, -1), tail, past
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'languages': len(self._entries),
+                'prefix_tokens': {language: int(entry[0].shape[-1]) for language, entry in self._entries.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+CPU translation service.
+Runs a small instruction-tuned model on CPU with int8 dynamic quantization,
+so translation keeps working offline and on nodes without a GPU.
+"""
+
+import os
+import sys
+import asyncio
+import importlib.util
+import threading
+from pathlib import Path
+
+# Add the translator directory to Python path
+translator_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(translator_dir))
+
+from services import BaseTranslationService
+from ..errors import TranslationError, TranslationServerError
+from .generation import DEFAULT_MAX_BATCH_SIZE, BatchedGenerator
+
+DEFAULT_LOCAL_MODEL = "Qwen/Qwen2.5-0.5B-Instruct"
+
+
+def quantize_for_cpu(model):
+    """
+    Quantize a model's Linear layers to int8 for CPU inference.
+
+    Weights are stored as int8 and activations are quantized on the fly,
+    which roughly quarters the Linear weights' memory and speeds up the
+    matrix multiplications that dominate decoding on CPU.
+    """
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_cpu_model(model_name, quantize=True, num_threads=None):
+    """
+    Load a causal LM and its tokenizer for CPU inference.
+
+    Returns:
+        tuple: (model, tokenizer)
+    """
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype=torch.float32,
+        trust_remote_code=True,
+        low_cpu_mem_usage=True,
+    )
+    model.eval()
+    if quantize:
+        model = quantize_for_cpu(model)
+    return model, tokenizer
+
+
+class LocalTranslationService(BaseTranslationService):
+    def __init__(self, model=None):
+        super().__init__()
+        # LOCAL_TRANSLATION_MODEL may be a Hugging Face id or a local folder
+        self.model = model or os.environ.get('LOCAL_TRANSLATION_MODEL', DEFAULT_LOCAL_MODEL)
+        self.service_name = f"Local CPU model ({self.model})"
+        self.num_threads = int(os.environ.get('LOCAL_TRANSLATION_THREADS', 0)) or (os.cpu_count() or 1)
+        self.quantize = os.environ.get('LOCAL_TRANSLATION_QUANTIZE', '1') != '0'
+        self.max_new_tokens = int(os.environ.get('LOCAL_TRANSLATION_MAX_NEW_TOKENS', 256))
+        # Concurrent requests share generate() calls, so a full batch may be in flight at once
+        self.max_concurrency = int(os.environ.get('LOCAL_MAX_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE))
+        self.prompt_version = "local-2"
+
+        self.generator = None
+        self._load_lock = threading.Lock()
+
+    def is_available(self):
+        """Available when torch and transformers are installed; the model is loaded on first use."""
+        return all(importlib.util.find_spec(name) is not None for name in ('torch', 'transformers'))
+
+    def load_service(self):
+        """Load and quantize the model (once)."""
+        with self._load_lock:
+            if self.is_loaded:
+                return
+            quantized = "int8" if self.quantize else "fp32"
+            print(f"[Local Model] Loading {self.model} on CPU ({quantized}, {self.num_threads} threads)...")
+            try:
+                self.load_stage = "loading weights"
+                model, tokenizer = load_cpu_model(self.model, quantize=False, num_threads=self.num_threads)
+                if self.quantize:
+                    self.load_stage = "quantizing"
+                    model = quantize_for_cpu(model)
+                self.generator = BatchedGenerator(model, tokenizer, self.max_new_tokens)
+            finally:
+                self.load_stage = None
+            self.is_loaded = True
+            print(f"[Local Model] {self.model} loaded")
+
+    def translate(self, text, target_language):
+        """
+        Translate text with the local model.
+
+        Args:
+            text (str): Text to translate
+            target_language (str): Target language
+
+        Returns:
+            str: Translated text
+
+        Raises:
+            TranslationError: If the model cannot be loaded, fails, or cuts the answer off
+        """
+        try:
+            self.load_service()
+            return self.generator.translate(text, target_language)
+        except Exception as e:
+            raise self._translation_error(e)
+
+    async def translate_async(self, text, target_language):
+        """Queue the text with the batcher without tying up a thread while it waits."""
+        try:
+            if not self.is_loaded:
+                await asyncio.to_thread(self.load_service)
+            return await asyncio.wrap_future(self.generator.submit(text, target_language))
+        except Exception as e:
+            raise self._translation_error(e)
+
+    @staticmethod
+    def _translation_error(error):
+        """Typed error for a failed local translation, so the manager can fail over."""
+        print(f"[Local Model] Translation error: {str(error)}")
+        if isinstance(error, TranslationError):
+            return error
+        return TranslationServerError(f"Local model error: {str(error)}")
+
+    async def translate_segments_async(self, segments, target_language):
+        """
+        Translate segments as separate prompts.
+
+        Small models do not keep "__BLOCK_n__" markers reliably; separate
+        prompts submitted together end up in the same batches anyway.
+        """
+        return list(await asyncio.gather(*(
+            self.translate_async(text, target_language) if text.strip() else asyncio.sleep(0, "")
+            for text in segments
+        )))
+
+    def get_service_info(self):
+        """Get information about this translation service."""
+        info = super().get_service_info()
+        info.update({
+            'model': self.model,
+            'device': 'cpu',
+            'quantization': 'int8 dynamic' if self.quantize else None,
+            'threads': self.num_threads,
+        })
+        if self.generator is not None:
+            info['batching'] = self.generator.get_stats()
+        return info
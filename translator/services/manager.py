@@ -5,22 +5,250 @@ Manages multiple translation services and provides a unified interface.
 """
 
 import os
-import sys
+import time
+import sqlite3
+import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Import the base class and services
-from . import BaseTranslationService
-from .google_gemini import gemini_service
+from . import BaseTranslationService, run_async
+from .errors import TranslationError, TranslationResponseError, TranslationTimeoutError
+from .bypass import segment_bypass
+from .chunking import DEFAULT_MAX_OUTPUT_TOKENS, TokenBudgetChunker, max_input_tokens
+from .router import BackendRouter
+from .single_flight import SingleFlight
+from .translation_cache import TranslationCache, make_cache_key, normalize_text
+from .warmup import ServiceWarmup
+from .google_gemini import GeminiTranslationService, gemini_service
+from .local_model import local_service
+from .model_worker import ModelWorkerTranslationService
+
+DEFAULT_CACHE_DB = Path(__file__).parent.parent / "cache" / "translation_memory.sqlite3"
+
+def _is_failure(translation: str) -> bool:
+    """True for empty results and the "Translation failed..." strings, which must not be cached."""
+    return not translation or translation.startswith("Translation failed")
+
+def _parse_mapping(value: str) -> Dict[str, float]:
+    """Parse "name=1.5,other=2" settings."""
+    mapping = {}
+    for item in value.split(','):
+        name, _, number = item.partition('=')
+        if name.strip() and number.strip():
+            mapping[name.strip()] = float(number)
+    return mapping
 
 class TranslationServiceManager:
     def __init__(self):
-        self.services: Dict[str, BaseTranslationService] = {
-            'gemini': gemini_service,
-        }
-        self.default_service = 'gemini'  # Only Gemini API available
-        self.current_service = 'gemini'  # Force Gemini usage
-        
+        # Requests are routed across every registered backend and fail over between them
+        self.router = BackendRouter(
+            policy=os.environ.get('TRANSLATION_ROUTING_POLICY', 'primary'),
+            failure_threshold=int(os.environ.get('TRANSLATION_FAILURE_THRESHOLD', 3)),
+            cooldown=float(os.environ.get('TRANSLATION_FAILURE_COOLDOWN', 30)),
+        )
+        # Upper bound on one backend attempt on the async paths before failing over (0 = none)
+        self.backend_timeout = float(os.environ.get('TRANSLATION_BACKEND_TIMEOUT', 0))
+        self.services: Dict[str, BaseTranslationService] = {}
+        # Process-wide default for requests that name no backend, set by admins only (set_service);
+        # None leaves it to the router
+        self.default_service: Optional[str] = None
+        self.current_service = 'gemini'
+
+        weights = _parse_mapping(os.environ.get('TRANSLATION_BACKEND_WEIGHTS', ''))
+        costs = _parse_mapping(os.environ.get('TRANSLATION_BACKEND_COSTS', ''))
+        self.register_service('gemini', gemini_service, weights.get('gemini', 1.0), costs.get('gemini', 1.0))
+        # A second Gemini model (e.g. gemini-2.0-flash) to fail over to during an outage of the first
+        fallback_model = os.environ.get('GEMINI_FALLBACK_MODEL')
+        if fallback_model and GeminiTranslationService is not None:
+            self.register_service(
+                'gemini_fallback', GeminiTranslationService(model=fallback_model),
+                weights.get('gemini_fallback', 1.0), costs.get('gemini_fallback', 1.0),
+            )
+        # Local model in a separate worker process (translator/model_worker.py), shared by every web
+        # worker; when it is configured the in-process copy below is not registered
+        worker_socket = os.environ.get('MODEL_WORKER_SOCKET')
+        if worker_socket:
+            self.register_service(
+                'worker', ModelWorkerTranslationService(worker_socket),
+                weights.get('worker', 1.0), costs.get('worker', 0.0),
+            )
+        # Offline CPU model, opt-in with LOCAL_TRANSLATION=1 (needs torch and transformers); it costs nothing per call
+        elif os.environ.get('LOCAL_TRANSLATION', '0') != '0':
+            self.register_service('local', local_service, weights.get('local', 1.0), costs.get('local', 0.0))
+        if os.environ.get('TRANSLATION_BACKEND_ORDER'):
+            self.router.set_order([n.strip() for n in os.environ['TRANSLATION_BACKEND_ORDER'].split(',')])
+
+        # Translation memory checked before any backend call; TRANSLATION_CACHE=0 turns it off
+        self.cache: Optional[TranslationCache] = None
+        if os.environ.get('TRANSLATION_CACHE', '1') != '0':
+            try:
+                self.cache = TranslationCache(
+                    os.environ.get('TRANSLATION_CACHE_DB', DEFAULT_CACHE_DB),
+                    max_entries=int(os.environ.get('TRANSLATION_CACHE_MAX_ENTRIES', 200000)),
+                    ttl=float(os.environ.get('TRANSLATION_CACHE_TTL', 30 * 24 * 3600)),
+                    memory_entries=int(os.environ.get('TRANSLATION_CACHE_MEMORY_ENTRIES', 10000)),
+                    fuzzy=os.environ.get('TRANSLATION_FUZZY', '1') != '0',
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"Translation cache disabled: {str(e)}")
+
+        # Near-duplicate matches: passed to the backend as a reference above the hint
+        # similarity, returned as-is above the reuse similarity (0 never reuses)
+        self.fuzzy_hint_threshold = float(os.environ.get('TRANSLATION_FUZZY_HINT', 0.8))
+        self.fuzzy_reuse_threshold = float(os.environ.get('TRANSLATION_FUZZY_REUSE', 0))
+
+        # Identical concurrent translations share one backend call
+        self.in_flight = SingleFlight()
+
+        # Loads backends in the background once start_warmup() is called (at server start-up)
+        self.warmup = ServiceWarmup(self.services)
+
+    def _flight_key(self, service: BaseTranslationService, texts: List[str], target_language: str) -> str:
+        """Coalescing key for a call translating `texts` with `service`."""
+        model = self._cache_model(service)
+        return "|".join(make_cache_key(text, target_language, model, service.prompt_version) for text in texts)
+
+    def _cache_get(self, service: BaseTranslationService, text: str, target_language: str) -> Optional[str]:
+        """Look up a cached translation for this service's model and prompt version."""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(text, target_language, self._cache_model(service), service.prompt_version)
+        except sqlite3.Error as e:
+            print(f"Translation cache read failed: {str(e)}")
+            return None
+
+    def _cache_put(self, service: BaseTranslationService, text: str, target_language: str, translation: str):
+        """Store a successful translation."""
+        self._cache_put_many(service, [text], target_language, [translation])
+
+    def _cache_put_many(self, service: BaseTranslationService, texts: List[str], target_language: str,
+                        translations: List[str]):
+        """Store the successful translations of several texts in one transaction."""
+        if self.cache is None:
+            return
+        items = [(text, translation) for text, translation in zip(texts, translations) if not _is_failure(translation)]
+        try:
+            self.cache.put_many(items, target_language, self._cache_model(service), service.prompt_version)
+        except sqlite3.Error as e:
+            print(f"Translation cache write failed: {str(e)}")
+
+    def _fuzzy_get(self, service: BaseTranslationService, text: str, target_language: str):
+        """Find a stored translation of a near-duplicate text, or None."""
+        if self.cache is None or not self.cache.fuzzy:
+            return None
+        thresholds = [t for t in (self.fuzzy_hint_threshold, self.fuzzy_reuse_threshold) if t > 0]
+        if not thresholds:
+            return None
+        try:
+            return self.cache.find_similar(
+                text, target_language, self._cache_model(service), service.prompt_version, min(thresholds)
+            )
+        except sqlite3.Error as e:
+            print(f"Translation cache read failed: {str(e)}")
+            return None
+
+    def _fuzzy_reusable(self, match) -> bool:
+        """True if a near-duplicate match is close enough to return without translating."""
+        return bool(match and self.fuzzy_reuse_threshold and match.similarity >= self.fuzzy_reuse_threshold)
+
+    @staticmethod
+    def _cache_model(service: BaseTranslationService) -> str:
+        return getattr(service, 'model', None) or service.service_name
+
+    def register_service(self, name: str, service: BaseTranslationService,
+                         weight: float = 1.0, cost: float = 1.0):
+        """
+        Register a translation backend with the router.
+
+        Args:
+            name (str): Backend name used in requests and stats
+            service (BaseTranslationService): The backend
+            weight (float): Share of traffic under the 'weighted' policy
+            cost (float): Relative cost under the 'cheapest' policy
+        """
+        self.services[name] = service
+        self.router.add_backend(name, weight, cost)
+
+    def _route(self, service_name: Optional[str] = None) -> List[Tuple[str, BaseTranslationService]]:
+        """Available backends in the order this request should try them."""
+        names = [name for name, service in self.services.items() if service.is_available()]
+        names = self.router.order(names, preferred=service_name or self.default_service)
+        # Backends the warm-up is still loading go last: requests use a loaded one
+        # meanwhile, or wait for the load when nothing else is left
+        warming = [name for name in names if self.warmup.is_loading(name)]
+        if warming:
+            names = [name for name in names if name not in warming] + warming
+        return [(name, self.services[name]) for name in names]
+
+    def get_routing_stats(self) -> Dict:
+        """Rolling latency and error statistics per backend."""
+        return self.router.get_stats()
+
+    def _backend_call(self, name: str, fn):
+        """Run one backend call, recording its latency and outcome with the router."""
+        start = time.monotonic()
+        try:
+            result = fn()
+            if isinstance(result, str) and _is_failure(result):
+                raise TranslationResponseError(result or "Empty translation")
+        except Exception:
+            self.router.record(name, False, time.monotonic() - start)
+            raise
+        self.router.record(name, True, time.monotonic() - start)
+        return result
+
+    async def _backend_call_async(self, name: str, coro_fn):
+        """Async counterpart of _backend_call(), bounded by backend_timeout."""
+        start = time.monotonic()
+        try:
+            if self.backend_timeout > 0:
+                try:
+                    result = await asyncio.wait_for(coro_fn(), self.backend_timeout)
+                except asyncio.TimeoutError:
+                    raise TranslationTimeoutError(f"{name} did not answer within {self.backend_timeout:.0f}s")
+            else:
+                result = await coro_fn()
+            if isinstance(result, str) and _is_failure(result):
+                raise TranslationResponseError(result or "Empty translation")
+        except Exception:
+            self.router.record(name, False, time.monotonic() - start)
+            raise
+        self.router.record(name, True, time.monotonic() - start)
+        return result
+
+    @staticmethod
+    def _log_failover(name: str, error: Exception, has_next: bool):
+        action = "trying the next backend" if has_next else "no backend left to try"
+        print(f"[Router] {name} failed: {str(error)} - {action}")
+
+    @staticmethod
+    def _give_up(error: Optional[Exception]) -> str:
+        """Raise a typed failure for the caller, or describe any other one."""
+        if isinstance(error, TranslationError):
+            # Typed failures (retries exhausted, auth, ...) are left to the caller
+            raise error
+        return f"Translation failed: {str(error)}"
+
+    def get_bypass_stats(self) -> Dict:
+        """Counters of segments copied through without translation."""
+        return segment_bypass.get_stats()
+
+    def get_coalescing_stats(self) -> Dict:
+        """Counters of backend calls shared by concurrent identical requests."""
+        return self.in_flight.get_stats()
+
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss counters of the translation cache."""
+        if self.cache is None:
+            return {'enabled': False}
+        try:
+            return {'enabled': True, **self.cache.get_stats()}
+        except sqlite3.Error as e:
+            return {'enabled': True, 'error': str(e)}
+
+    
     def get_available_services(self) -> List[str]:
         """Get list of available services."""
         available = []
@@ -45,93 +273,491 @@ class TranslationServiceManager:
     
     def set_service(self, service_name: str) -> bool:
         """
-        Set the active translation service.
-        
+        Change the process-wide default backend (admin use only).
+
+        Every request that does not name a backend, from any client, tries
+        this one first, so no request handler calls it; per-request choices
+        go through service_name. The shared router's order and policy are
+        left as they are.
+
         Args:
             service_name (str): Name of the service to use
-            
+
         Returns:
             bool: True if service was set successfully
         """
         if service_name not in self.services:
             print(f"Unknown service: {service_name}")
             return False
-            
+
         if not self.services[service_name].is_available():
             print(f"Service not available: {service_name}")
             return False
-            
+
+        self.default_service = service_name
         self.current_service = service_name
         print(f"Translation service set to: {service_name}")
         return True
-    
+
     def get_current_service(self) -> Optional[BaseTranslationService]:
-        """Get the currently active service (always Gemini)."""
-        if self.current_service and self.current_service in self.services:
-            service = self.services[self.current_service]
-            if service.is_available():
-                return service
+        """Get the backend the router would try first."""
+        candidates = self._route()
+        return candidates[0][1] if candidates else None
 
-        # Force Gemini usage
-        if 'gemini' in self.services and self.services['gemini'].is_available():
-            self.current_service = 'gemini'
-            return self.services['gemini']
+    def _translate_with(self, name: str, service: BaseTranslationService, text: str, target_language: str) -> str:
+        """Translate with one backend: cache, near-duplicate reference, then a coalesced call."""
+        cached = self._cache_get(service, text, target_language)
+        if cached is not None:
+            return cached
+
+        match = self._fuzzy_get(service, text, target_language)
+        if self._fuzzy_reusable(match):
+            return match.translation
+
+        def call():
+            if match:
+                translated = service.translate_with_reference(text, target_language, (match.source, match.translation))
+            else:
+                translated = service.translate(text, target_language)
+            self._cache_put(service, text, target_language, translated)
+            return translated
+
+        return self.in_flight.do(
+            self._flight_key(service, [text], target_language), lambda: self._backend_call(name, call)
+        )
+
+    async def _translate_with_async(self, name: str, service: BaseTranslationService, text: str,
+                                    target_language: str) -> str:
+        """Async counterpart of _translate_with()."""
+        cached = self._cache_get(service, text, target_language)
+        if cached is not None:
+            return cached
+
+        match = self._fuzzy_get(service, text, target_language)
+        if self._fuzzy_reusable(match):
+            return match.translation
+
+        async def call():
+            if match:
+                translated = await service.translate_with_reference_async(
+                    text, target_language, (match.source, match.translation)
+                )
+            else:
+                translated = await service.translate_async(text, target_language)
+            self._cache_put(service, text, target_language, translated)
+            return translated
+
+        return await self.in_flight.do_async(
+            self._flight_key(service, [text], target_language), lambda: self._backend_call_async(name, call)
+        )
 
-        return None
-    
     def translate(self, text: str, target_language: str, service_name: Optional[str] = None) -> str:
         """
-        Translate text using Gemini API (only available service).
+        Translate text, failing over between backends.
 
         Args:
             text (str): Text to translate
             target_language (str): Target language
-            service_name (str, optional): Ignored - always uses Gemini
+            service_name (str, optional): Backend to try first
 
         Returns:
             str: Translated text
+
+        Raises:
+            TranslationError: If every backend fails
         """
-        # Always use Gemini
-        service = self.services.get('gemini')
-        if not service or not service.is_available():
-            return "Translation failed: Gemini API not available"
+        # Page numbers, URLs, code, text already in the target language, ...
+        if segment_bypass.check(text, target_language):
+            return text
+
+        candidates = self._route(service_name)
+        if not candidates:
+            return "Translation failed: no translation service available"
+
+        last_error = None
+        for name, service in candidates:
+            try:
+                return self._translate_with(name, service, text, target_language)
+            except Exception as e:
+                last_error = e
+                self._log_failover(name, e, name != candidates[-1][0])
+        return self._give_up(last_error)
+
+    def translate_stream(self, text: str, target_language: str, service_name: Optional[str] = None) -> Iterator[str]:
+        """
+        Translate text, yielding partial output as the backend produces it.
+
+        A backend that fails before producing output is failed over; once
+        output has been sent the error is passed to the caller.
+
+        Args:
+            text (str): Text to translate
+            target_language (str): Target language
+            service_name (str, optional): Backend to try first
+
+        Yields:
+            str: Successive pieces of the translation
+        """
+        if segment_bypass.check(text, target_language):
+            yield text
+            return
+
+        candidates = self._route(service_name)
+        if not candidates:
+            yield "Translation failed: no translation service available"
+            return
+
+        last_error = None
+        for name, service in candidates:
+            cached = self._cache_get(service, text, target_language)
+            if cached is not None:
+                yield cached
+                return
+
+            pieces = []
+            start = time.monotonic()
+            try:
+                for piece in service.translate_stream(text, target_language):
+                    if not pieces and _is_failure(piece):
+                        raise TranslationResponseError(piece or "Empty translation")
+                    pieces.append(piece)
+                    yield piece
+            except Exception as e:
+                self.router.record(name, False, time.monotonic() - start)
+                if pieces:
+                    raise
+                last_error = e
+                self._log_failover(name, e, name != candidates[-1][0])
+                continue
+
+            self.router.record(name, True, time.monotonic() - start)
+            # Only reached when the stream completed
+            self._cache_put(service, text, target_language, "".join(pieces))
+            return
+
+        yield self._give_up(last_error)
+
+    async def _translate_routed_async(self, text: str, target_language: str,
+                                      candidates: List[Tuple[str, BaseTranslationService]]) -> str:
+        """Try each candidate backend in turn for one text."""
+        last_error = None
+        for name, service in candidates:
+            try:
+                return await self._translate_with_async(name, service, text, target_language)
+            except Exception as e:
+                last_error = e
+                self._log_failover(name, e, name != candidates[-1][0])
+        return self._give_up(last_error)
+
+    async def translate_async(self, text: str, target_language: str, service_name: Optional[str] = None) -> str:
+        """
+        Async counterpart of translate().
+
+        Args:
+            text (str): Text to translate
+            target_language (str): Target language
+            service_name (str, optional): Backend to try first
+
+        Returns:
+            str: Translated text
+        """
+        if segment_bypass.check(text, target_language):
+            return text
+
+        candidates = self._route(service_name)
+        if not candidates:
+            return "Translation failed: no translation service available"
+        return await self._translate_routed_async(text, target_language, candidates)
+
+    async def translate_batch_async(self, texts: List[str], target_language: str,
+                                    service_name: Optional[str] = None,
+                                    max_concurrency: Optional[int] = None) -> List[str]:
+        """
+        Translate several independent texts concurrently.
+
+        Args:
+            texts (list): Texts to translate
+            target_language (str): Target language
+            service_name (str, optional): Backend to try first
+            max_concurrency (int, optional): Maximum requests in flight
+
+        Returns:
+            list: Translated texts, in the same order as the input
+        """
+        results = [text if segment_bypass.check(text, target_language) else None for text in texts]
+        # Identical texts in one batch are sent once: normalized text -> input positions
+        missing = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault(normalize_text(texts[i]), []).append(i)
+        if not missing:
+            return results
+
+        candidates = self._route(service_name)
+        if not candidates:
+            return [result if result is not None else "Translation failed: no translation service available"
+                    for result in results]
+
+        unique = list(missing.values())
+        semaphore = asyncio.Semaphore(max_concurrency or candidates[0][1].max_concurrency)
+
+        async def translate_one(text):
+            async with semaphore:
+                return await self._translate_routed_async(text, target_language, candidates)
+
+        translated = await asyncio.gather(*(translate_one(texts[positions[0]]) for positions in unique))
+        for positions, translation in zip(unique, translated):
+            for i in positions:
+                results[i] = translation
+        return results
+
+    def translate_many(self, texts: List[str], target_language: str,
+                       service_name: Optional[str] = None,
+                       max_concurrency: Optional[int] = None) -> List[str]:
+        """Blocking wrapper around translate_batch_async() for synchronous callers."""
+        return run_async(self.translate_batch_async(texts, target_language, service_name, max_concurrency))
+
+    async def translate_segment_groups_async(self, groups: List[List[str]], target_language: str,
+                                             service_name: Optional[str] = None) -> List[List[str]]:
+        """
+        Translate groups of segments concurrently, one request per group.
+
+        Args:
+            groups (list): Lists of segment texts
+            target_language (str): Target language
+            service_name (str, optional): Backend to try first
+
+        Returns:
+            list: Translated groups, aligned one-to-one with the input
+
+        Raises:
+            TranslationError: If every backend fails for a group
+        """
+        candidates = self._route(service_name)
+        if not candidates:
+            return [["Translation failed: no translation service available"] * len(group) for group in groups]
+        _, first_service = candidates[0]
+
+        # Only segments missing from the first choice's cache are sent; a fully cached group makes no request
+        results = [
+            [text if segment_bypass.check(text, target_language) else self._cache_get(first_service, text, target_language)
+             for text in group]
+            for group in groups
+        ]
+        pending = [
+            (group_idx, [i for i, result in enumerate(group_results) if result is None])
+            for group_idx, group_results in enumerate(results)
+        ]
+        pending = [(group_idx, missing) for group_idx, missing in pending if missing]
+        if not pending:
+            return results
+
+        translated_groups = await self._translate_groups_routed_async(
+            [[groups[group_idx][i] for i in missing] for group_idx, missing in pending], target_language, candidates
+        )
+        for (group_idx, missing), translated in zip(pending, translated_groups):
+            for i, translation in zip(missing, translated):
+                results[group_idx][i] = translation
+        return results
+
+    async def _translate_groups_routed_async(self, groups: List[List[str]], target_language: str,
+                                             candidates: List[Tuple[str, BaseTranslationService]]) -> List[List[str]]:
+        """Send each group as one request, failing over between the candidate backends."""
+        async def translate_group_with(name, service, segments):
+            async def call():
+                translated = await service.translate_segments_async(segments, target_language)
+                self._cache_put_many(service, segments, target_language, translated)
+                return translated
+
+            # Identical groups in flight (e.g. the same document uploaded twice) share one request
+            return await self.in_flight.do_async(
+                self._flight_key(service, segments, target_language), lambda: self._backend_call_async(name, call)
+            )
+
+        async def translate_group(segments, remaining):
+            last_error = None
+            for position, (name, service) in enumerate(remaining):
+                try:
+                    translated = await translate_group_with(name, service, segments)
+                except Exception as e:
+                    last_error = e
+                    self._log_failover(name, e, position + 1 < len(remaining))
+                    continue
+
+                # Segments that came back empty or as a failure message go to the next backends on their own
+                failed = [i for i, (text, result) in enumerate(zip(segments, translated))
+                          if text.strip() and _is_failure(result)]
+                if not failed:
+                    return translated
+                error = TranslationResponseError(f"{name} returned no translation for {len(failed)} segment(s)")
+                if position + 1 == len(remaining):
+                    raise error
+                self._log_failover(name, error, True)
+                translated = list(translated)
+                retried = await translate_group([segments[i] for i in failed], remaining[position + 1:])
+                for i, translation in zip(failed, retried):
+                    translated[i] = translation
+                return translated
+            raise last_error
+
+        return list(await asyncio.gather(*(translate_group(segments, candidates) for segments in groups)))
+
+    async def translate_batch_packed_async(self, segments: List[str], target_language: str,
+                                           service_name: Optional[str] = None) -> List[str]:
+        """
+        Translate a list of segments in as few requests as the token budget allows.
+
+        Bypassed, cached and repeated segments are resolved first; the rest
+        are packed in order into chunks sized to the chosen backend's output
+        limit and sent concurrently, one request per chunk.
+
+        Args:
+            segments (list): Segment texts
+            target_language (str): Target language
+            service_name (str, optional): Backend to try first
+
+        Returns:
+            list: Translated segments, aligned one-to-one with the input
+
+        Raises:
+            TranslationError: If every backend fails for a chunk
+        """
+        candidates = self._route(service_name)
+        if not candidates:
+            return ["Translation failed: no translation service available"] * len(segments)
+        _, first_service = candidates[0]
+
+        results = [
+            text if segment_bypass.check(text, target_language) else self._cache_get(first_service, text, target_language)
+            for text in segments
+        ]
+        # Normalized text -> input positions still to translate
+        missing = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault(normalize_text(segments[i]), []).append(i)
+        if not missing:
+            return results
+
+        unique = list(missing.values())
+        unique_texts = [segments[positions[0]] for positions in unique]
+        max_output_tokens = getattr(first_service, 'max_output_tokens', DEFAULT_MAX_OUTPUT_TOKENS)
+        chunks = TokenBudgetChunker(max_input_tokens(max_output_tokens)).plan(unique_texts)
+
+        translated_chunks = await self._translate_groups_routed_async(
+            [[unique_texts[i] for i in chunk] for chunk in chunks], target_language, candidates
+        )
+        for chunk, translated in zip(chunks, translated_chunks):
+            for unique_idx, translation in zip(chunk, translated):
+                for i in unique[unique_idx]:
+                    results[i] = translation
+        return results
+
+    def translate_batch(self, segments: List[str], target_language: str,
+                        service_name: Optional[str] = None) -> List[str]:
+        """Blocking wrapper around translate_batch_packed_async() for synchronous callers."""
+        if not segments:
+            return []
+        return run_async(self.translate_batch_packed_async(list(segments), target_language, service_name))
+
+    def translate_segment_groups(self, groups: List[List[str]], target_language: str,
+                                 service_name: Optional[str] = None) -> List[List[str]]:
+        """Blocking wrapper around translate_segment_groups_async() for synchronous callers."""
+        return run_async(self.translate_segment_groups_async(groups, target_language, service_name))
+
+    def translate_batch_multi(self, segments: List[str], target_languages: List[str],
+                              service_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Translate the same segments into several languages concurrently.
+
+        Args:
+            segments (list): Segment texts
+            target_languages (list): Target languages
+            service_name (str, optional): Backend to try first
+
+        Returns:
+            dict: Target language -> translated segments, aligned with the input
+
+        Raises:
+            TranslationError: If every backend fails for one of the languages
+        """
+        languages = list(dict.fromkeys(target_languages))
+
+        async def translate_all():
+            return await asyncio.gather(*(
+                self.translate_batch_packed_async(list(segments), language, service_name) for language in languages
+            ))
+
+        if not segments:
+            return {language: [] for language in languages}
+        return dict(zip(languages, run_async(translate_all())))
 
-        try:
-            return service.translate(text, target_language)
-        except Exception as e:
-            return f"Translation failed: {str(e)}"
-    
     def load_service(self, service_name: Optional[str] = None) -> bool:
         """
-        Load Gemini service (only available service).
+        Load one backend, or every available backend.
 
         Args:
-            service_name (str, optional): Ignored - always loads Gemini
+            service_name (str, optional): Backend to load; all available ones if omitted
 
         Returns:
-            bool: True if service loaded successfully
+            bool: True if at least one service loaded successfully
         """
-        # Always load Gemini
-        service = self.services.get('gemini')
-        if not service or not service.is_available():
-            print("Gemini API not available - check API key")
-            return False
+        names = [service_name] if service_name else list(self.services)
+        loaded = False
+        for name in names:
+            service = self.services.get(name)
+            if not service or not service.is_available():
+                print(f"Translation service {name} not available")
+                continue
 
-        try:
-            service.load_service()
-            return True
-        except Exception as e:
-            print(f"Failed to load Gemini service: {str(e)}")
-            return False
+            try:
+                service.load_service()
+                loaded = True
+            except Exception as e:
+                print(f"Failed to load translation service {name}: {str(e)}")
+        return loaded
+
+    def start_warmup(self, service_names: Optional[List[str]] = None) -> bool:
+        """
+        Load backends on a background thread instead of on the first request.
+
+        Args:
+            service_names (list, optional): Backends to load; only the one the
+                router tries first if omitted, so fallbacks load on first use
+
+        Returns:
+            bool: True if this call started the warm-up (it only runs once)
+        """
+        if service_names is None:
+            service_names = [name for name, _ in self._route()[:1]]
+        return self.warmup.start(service_names)
+
+    def get_readiness(self) -> Dict:
+        """
+        Whether requests can be served without waiting for a model load.
+
+        Ready once an available backend has loaded. Without a warm-up,
+        backends load on first use, so any available backend counts.
+        """
+        candidates = self._route()
+        if self.warmup.started:
+            ready = any(service.is_loaded for _, service in candidates)
+        else:
+            ready = bool(candidates)
+        return {'ready': ready, 'warmup': self.warmup.get_status()}
 
 # Create global instance
 translation_manager = TranslationServiceManager()
 
-# Backwards compatibility - provide the old interface (always uses Gemini)
+# Backwards compatibility - provide the old interface
 def load_model():
     """Load the Gemini translation service (backwards compatibility)."""
     return translation_manager.load_service()
 
-def translate_text(text: str, target_language: str) -> str:
-    """Translate text using Gemini API (backwards compatibility)."""
-    return translation_manager.translate(text, target_language)
+def translate_text(text: str, target_language: str, service_name: Optional[str] = None) -> str:
+    """Translate text, optionally naming the backend to try first."""
+    return translation_manager.translate(text, target_language, service_name)
+
+def translate_text_stream(text: str, target_language: str, service_name: Optional[str] = None) -> Iterator[str]:
+    """Stream a translation, optionally naming the backend to try first."""
+    return translation_manager.translate_stream(text, target_language, service_name)
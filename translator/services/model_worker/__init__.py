@@ -0,0 +1,4 @@
+"""Out-of-process model worker: one loaded local model shared by every web worker over a Unix socket"""
+
+from .server import ModelWorkerServer
+from .service import DEFAULT_SOCKET, ModelWorkerTranslationService
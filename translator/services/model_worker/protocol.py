@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Wire format between web workers and the model worker.
+Each message is a JSON object preceded by its length as a 4-byte big-endian
+integer. Requests carry an 'id' that the answer repeats, so one connection
+can have many requests in flight.
+"""
+
+import json
+import struct
+
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 2**20
+
+
+async def read_message(reader):
+    """
+    Read one message from an asyncio stream.
+
+    Returns:
+        dict or None: The message, or None if the other side closed the connection
+    """
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except EOFError:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message of {length} bytes is over the {MAX_MESSAGE_BYTES}-byte limit")
+    return json.loads(await reader.readexactly(length))
+
+
+def encode_message(message):
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def write_message(writer, message):
+    writer.write(encode_message(message))
+    await writer.drain()
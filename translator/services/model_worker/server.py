@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Model worker server.
+Holds the one loaded copy of a local model and answers translation requests
+from every web worker over a Unix socket. Requests from all connections go
+to the same service, so its batcher groups them into shared generate() calls.
+"""
+
+import asyncio
+import os
+
+from .protocol import read_message, write_message
+
+
+class ModelWorkerServer:
+    """
+    Serves a translation service on a Unix socket.
+
+    Operations:
+        translate   {'text', 'target_language'} -> {'translation'}
+        info        {} -> {'model', 'prompt_version', 'info'}
+    Any failure is answered with {'error': message}.
+    """
+
+    def __init__(self, service, socket_path):
+        self.service = service
+        self.socket_path = socket_path
+        self.connections = 0
+        self.requests = 0
+
+    async def _answer(self, message, writer, write_lock):
+        try:
+            op = message.get('op')
+            if op == 'translate':
+                self.requests += 1
+                answer = {'translation': await self.service.translate_async(message['text'], message['target_language'])}
+            elif op == 'info':
+                answer = {
+                    'model': getattr(self.service, 'model', None) or self.service.service_name,
+                    'prompt_version': self.service.prompt_version,
+                    'info': self.get_info(),
+                }
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+        except Exception as e:
+            answer = {'error': str(e)}
+        answer['id'] = message.get('id')
+        async with write_lock:
+            await write_message(writer, answer)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while (message := await read_message(reader)) is not None:
+                # Answer in whatever order translations finish
+                task = asyncio.create_task(self._answer(message, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            print(f"[Model Worker] Dropping connection: {str(e)}")
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            self.connections -= 1
+            writer.close()
+
+    def get_info(self):
+        info = self.service.get_service_info()
+        info['worker'] = {'socket': self.socket_path, 'connections': self.connections, 'requests': self.requests}
+        return info
+
+    async def serve_forever(self):
+        """Load the model, then accept connections until cancelled."""
+        # The socket only appears once the model is loaded, so clients never wait on a half-started worker
+        await asyncio.to_thread(self.service.load_service)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Left behind by a previous worker
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        print(f"[Model Worker] Serving {self.service.service_name} on {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
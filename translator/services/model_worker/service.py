@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Translation service backed by the model worker process.
+Web workers send their translations to one model worker over a Unix socket
+instead of each loading its own copy of the weights.
+"""
+
+import os
+import sys
+import asyncio
+import itertools
+import tempfile
+from pathlib import Path
+
+# Add the translator directory to Python path
+translator_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(translator_dir))
+
+from services import BaseTranslationService, run_async
+from ..errors import (
+    TranslationConnectionError,
+    TranslationResponseError,
+    TranslationServerError,
+    TranslationTimeoutError,
+)
+from ..local_model.generation import DEFAULT_MAX_BATCH_SIZE
+from ..local_model.service import DEFAULT_LOCAL_MODEL
+from .protocol import read_message, write_message
+
+DEFAULT_SOCKET = str(Path(tempfile.gettempdir()) / "transverse-model-worker.sock")
+
+
+class _Connection:
+    """One socket to the worker; answers are matched to requests by id."""
+
+    def __init__(self, reader, writer):
+        self.loop = asyncio.get_running_loop()
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.closed = False
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.create_task(self._read_answers())
+
+    async def _read_answers(self):
+        error = None
+        try:
+            while (message := await read_message(self.reader)) is not None:
+                future = self.pending.pop(message.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            error = e
+        finally:
+            self.closed = True
+            self.writer.close()
+            reason = f": {str(error)}" if error else ""
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(TranslationConnectionError(f"Lost connection to the model worker{reason}"))
+            self.pending.clear()
+
+    async def request(self, message, timeout):
+        future = self.loop.create_future()
+        self.pending[message['id']] = future
+        try:
+            try:
+                async with self._write_lock:
+                    await write_message(self.writer, message)
+            except (ConnectionError, OSError) as e:
+                raise TranslationConnectionError(f"Could not send to the model worker: {str(e)}")
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise TranslationTimeoutError(f"Model worker did not answer within {timeout:.0f}s")
+        finally:
+            self.pending.pop(message['id'], None)
+
+
+class ModelWorkerTranslationService(BaseTranslationService):
+    def __init__(self, socket_path=None):
+        super().__init__()
+        self.socket_path = socket_path or os.environ.get('MODEL_WORKER_SOCKET', DEFAULT_SOCKET)
+        self.service_name = f"Model worker ({self.socket_path})"
+        # Replaced by what the worker reports; until then cache keys match the in-process local backend
+        self.model = os.environ.get('LOCAL_TRANSLATION_MODEL', DEFAULT_LOCAL_MODEL)
+        self.prompt_version = "local-2"
+        self.timeout = float(os.environ.get('MODEL_WORKER_TIMEOUT', 600))
+        # Enough in flight from each web worker to help fill the worker's batches
+        self.max_concurrency = int(os.environ.get('LOCAL_MAX_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE))
+
+        self.worker_info = None
+        self._connection = None
+        self._connect_lock = None
+        self._ids = itertools.count(1)
+
+    def is_available(self):
+        """Available while the worker's socket exists; the worker creates it once its model is loaded."""
+        return os.path.exists(self.socket_path)
+
+    async def _connect(self):
+        """Get the connection for the running event loop, opening it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._connect_lock is None or self._connect_lock[0] is not loop:
+            self._connect_lock = (loop, asyncio.Lock())
+        async with self._connect_lock[1]:
+            connection = self._connection
+            if connection is None or connection.closed or connection.loop is not loop:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                except OSError as e:
+                    raise TranslationConnectionError(f"Model worker unreachable at {self.socket_path}: {str(e)}")
+                connection = self._connection = _Connection(reader, writer)
+            return connection
+
+    async def _request(self, op, **fields):
+        connection = await self._connect()
+        answer = await connection.request({'id': next(self._ids), 'op': op, **fields}, self.timeout)
+        if 'error' in answer:
+            raise TranslationServerError(f"Model worker error: {answer['error']}")
+        return answer
+
+    def load_service(self):
+        """Connect to the worker and read which model it serves."""
+        answer = run_async(self._request('info'))
+        self.model = answer['model']
+        self.prompt_version = answer['prompt_version']
+        self.worker_info = answer['info']
+        self.is_loaded = True
+        print(f"[Model Worker] Connected to {self.socket_path} ({self.model})")
+
+    def translate(self, text, target_language):
+        """
+        Translate text with the worker's model.
+
+        Args:
+            text (str): Text to translate
+            target_language (str): Target language
+
+        Returns:
+            str: Translated text
+
+        Raises:
+            TranslationError: If the worker cannot be reached, does not answer
+                in time or fails to translate
+        """
+        return run_async(self.translate_async(text, target_language))
+
+    async def translate_async(self, text, target_language):
+        """Send the text to the worker; concurrent requests share its batches."""
+        answer = await self._request('translate', text=text, target_language=target_language)
+        translation = answer['translation']
+        if not translation or translation.startswith("Translation failed"):
+            # Workers from before typed errors answered failures as text
+            raise TranslationResponseError(translation or "Empty translation from the model worker")
+        return translation
+
+    async def translate_segments_async(self, segments, target_language):
+        """Translate segments as separate prompts, as the in-process local backend does."""
+        return list(await asyncio.gather(*(
+            self.translate_async(text, target_language) if text.strip() else asyncio.sleep(0, "")
+            for text in segments
+        )))
+
+    def get_service_info(self):
+        """Get information about this translation service."""
+        info = super().get_service_info()
+        info.update({
+            'model': self.model,
+            'socket': self.socket_path,
+            'worker': self.worker_info,
+        })
+        return info
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiting for translation API calls.
+Supports an in-process backend and a SQLite backend that lets every
+worker process on a host draw from the same quota.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class LocalBucketBackend:
+    """Thread-safe token buckets held in process memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}  # name -> (tokens, last_refill)
+
+    def reserve(self, buckets, cost=1.0):
+        """
+        Take `cost` tokens from every bucket and return how long to wait.
+
+        Tokens may go negative; the caller then waits until the debt is
+        repaid, which keeps each call O(1) and serves callers in order.
+
+        Args:
+            buckets (list): (name, rate per second, capacity) tuples
+            cost (float): Tokens consumed by this request
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        now = time.monotonic()
+        wait_time = 0.0
+        with self._lock:
+            for name, rate, capacity in buckets:
+                tokens, last_refill = self._state.get(name, (capacity, now))
+                tokens = min(capacity, tokens + (now - last_refill) * rate) - cost
+                self._state[name] = (tokens, now)
+                if tokens < 0:
+                    wait_time = max(wait_time, -tokens / rate)
+        return wait_time
+
+    def available(self, buckets):
+        """Tokens currently left in the emptiest of `buckets`, without taking any."""
+        now = time.monotonic()
+        remaining = []
+        with self._lock:
+            for name, rate, capacity in buckets:
+                tokens, last_refill = self._state.get(name, (capacity, now))
+                remaining.append(min(capacity, tokens + (now - last_refill) * rate))
+        return min(remaining) if remaining else 0.0
+
+
+class SqliteBucketBackend:
+    """Token buckets stored in a SQLite file shared by all processes on a host."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        """Get this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, buckets, cost=1.0):
+        """Same contract as LocalBucketBackend.reserve(), atomic across processes."""
+        conn = self._connect()
+        wait_time = 0.0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            for name, rate, capacity in buckets:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tokens, last_refill = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - last_refill) * rate) - cost
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+                if tokens < 0:
+                    wait_time = max(wait_time, -tokens / rate)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait_time
+
+    def available(self, buckets):
+        """Same contract as LocalBucketBackend.available()."""
+        conn = self._connect()
+        now = time.time()
+        remaining = []
+        for name, rate, capacity in buckets:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_buckets WHERE name = ?", (name,)
+            ).fetchone()
+            tokens, last_refill = row if row else (capacity, now)
+            remaining.append(min(capacity, tokens + max(0.0, now - last_refill) * rate))
+        return min(remaining) if remaining else 0.0
+
+
+class TokenBucketRateLimiter:
+    """Per-second and per-minute token buckets in front of an API."""
+
+    def __init__(self, max_per_second, max_per_minute, backend=None, name="default"):
+        self.max_per_second = max_per_second
+        self.max_per_minute = max_per_minute
+        self.backend = backend or LocalBucketBackend()
+        self.name = name
+        self.buckets = [
+            (f"{name}:second", float(max_per_second), float(max_per_second)),
+            (f"{name}:minute", max_per_minute / 60.0, float(max_per_minute)),
+        ]
+
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._total_wait = 0.0
+
+    def reserve(self, cost=1.0):
+        """Reserve capacity for one request and return the seconds to wait."""
+        wait_time = self.backend.reserve(self.buckets, cost)
+        with self._stats_lock:
+            self._acquired += 1
+            if wait_time > 0:
+                self._throttled += 1
+                self._total_wait += wait_time
+        return wait_time
+
+    def acquire(self, cost=1.0):
+        """Block until a request may be sent. Returns the time waited."""
+        wait_time = self.reserve(cost)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+    def available(self):
+        """Requests that could be sent right now without waiting."""
+        return self.backend.available(self.buckets)
+
+    def get_stats(self):
+        """Get limiter counters."""
+        with self._stats_lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'max_per_second': self.max_per_second,
+                'max_per_minute': self.max_per_minute,
+                'acquired': self._acquired,
+                'throttled': self._throttled,
+                'total_wait_seconds': round(self._total_wait, 3),
+            }
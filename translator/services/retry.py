@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Retry policy for translation API calls.
+Jittered exponential backoff that honours server-provided Retry-After hints.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Either a number of seconds or an HTTP date
+
+    Returns:
+        float or None: Seconds to wait, or None if the value is unusable
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class RetryPolicy:
+    """Attempt budget and backoff schedule for a single translation call."""
+
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=20.0, max_total_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Delay before the next attempt, using full jitter.
+
+        Args:
+            attempt (int): Number of the attempt that just failed (1-based)
+            retry_after (float, optional): Server-requested minimum delay
+
+        Returns:
+            float: Seconds to sleep
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def next_delay(self, attempt, error, waited):
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed (1-based)
+            error (TranslationError): The failure
+            waited (float): Seconds already spent backing off in this call
+
+        Returns:
+            float or None: Seconds to sleep, or None to stop retrying
+        """
+        if not error.retryable or attempt >= self.max_attempts:
+            return None
+        delay = self.get_delay(attempt, error.retry_after)
+        if waited + delay > self.max_total_delay:
+            return None
+        return delay
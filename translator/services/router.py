@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Latency-aware routing across translation backends.
+Keeps rolling latency and error statistics per backend, orders the backends
+for each request according to a policy and takes failing backends out of
+rotation for a cool-down period.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+ROUTING_POLICIES = ('primary', 'latency', 'weighted', 'cheapest')
+
+
+class BackendHealth:
+    """Rolling statistics of one backend's recent calls."""
+
+    def __init__(self, window=100, ewma_alpha=0.2):
+        self.calls = deque(maxlen=window)  # (ok, latency)
+        self.ewma_alpha = ewma_alpha
+        self.ewma_latency = None
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.total_calls = 0
+        self.total_failures = 0
+
+    def record(self, ok, latency):
+        self.calls.append((ok, latency))
+        self.total_calls += 1
+        if ok:
+            self.consecutive_failures = 0
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+        else:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+
+    @property
+    def error_rate(self):
+        if not self.calls:
+            return 0.0
+        return sum(1 for ok, _ in self.calls if not ok) / len(self.calls)
+
+    def latency_percentile(self, fraction):
+        latencies = sorted(latency for ok, latency in self.calls if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+class BackendRouter:
+    """
+    Orders registered backends for each request.
+
+    Policies:
+        primary   configured order; later backends are fallbacks
+        latency   lowest recent latency, penalized by error rate
+        weighted  random choice in proportion to configured weights
+        cheapest  lowest configured cost first
+    """
+
+    def __init__(self, policy='primary', failure_threshold=3, cooldown=30.0, max_cooldown=300.0):
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy: {policy}")
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._lock = threading.Lock()
+        self._order = []
+        self._weights = {}
+        self._costs = {}
+        self._health = {}
+        self._rng = random.Random()
+
+    def add_backend(self, name, weight=1.0, cost=1.0):
+        """Register a backend; registration order is the 'primary' policy order."""
+        with self._lock:
+            if name not in self._order:
+                self._order.append(name)
+            self._weights[name] = weight
+            self._costs[name] = cost
+            self._health.setdefault(name, BackendHealth())
+
+    def set_order(self, names):
+        """Put `names` first in the 'primary' policy order, keeping the rest after them."""
+        with self._lock:
+            self._order = [n for n in names if n in self._health] + [n for n in self._order if n not in names]
+
+    def record(self, name, ok, latency):
+        """Record the outcome of one backend call."""
+        with self._lock:
+            health = self._health.setdefault(name, BackendHealth())
+            health.record(ok, latency)
+            if not ok and health.consecutive_failures >= self.failure_threshold:
+                # Open the circuit, doubling the cool-down while the backend keeps failing
+                extra = health.consecutive_failures - self.failure_threshold
+                cooldown = min(self.cooldown * (2 ** extra), self.max_cooldown)
+                health.open_until = time.monotonic() + cooldown
+                print(f"[Router] Backend {name} taken out of rotation for {cooldown:.0f}s "
+                      f"after {health.consecutive_failures} consecutive failures")
+
+    def _score(self, name):
+        """Lower is better for the 'latency' policy."""
+        health = self._health[name]
+        if health.ewma_latency is None:
+            return 0.0  # Untried backends get traffic so they can be measured
+        return health.ewma_latency * (1 + 4 * health.error_rate)
+
+    def order(self, names, preferred=None, policy=None):
+        """
+        Order candidate backends for one request.
+
+        Args:
+            names (list): Backends that are registered and available
+            preferred (str, optional): Backend to try first if it is healthy
+            policy (str, optional): Overrides the router's policy for this request
+
+        Returns:
+            list: Names to try in turn; backends in cool-down come last
+        """
+        policy = policy or self.policy
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy: {policy}")
+        now = time.monotonic()
+        with self._lock:
+            for name in names:
+                self._health.setdefault(name, BackendHealth())
+                self._weights.setdefault(name, 1.0)
+                self._costs.setdefault(name, 1.0)
+            position = {name: i for i, name in enumerate(self._order)}
+            healthy = [n for n in names if self._health[n].open_until <= now]
+            cooling = sorted((n for n in names if n not in healthy), key=lambda n: self._health[n].open_until)
+
+            if policy == 'latency':
+                healthy.sort(key=lambda n: (self._score(n), position.get(n, len(position))))
+            elif policy == 'cheapest':
+                healthy.sort(key=lambda n: (self._costs[n], self._score(n)))
+            elif policy == 'weighted':
+                remaining = list(healthy)
+                healthy = []
+                while remaining:
+                    pick = self._rng.choices(remaining, weights=[max(self._weights[n], 1e-9) for n in remaining])[0]
+                    healthy.append(pick)
+                    remaining.remove(pick)
+            else:
+                healthy.sort(key=lambda n: position.get(n, len(position)))
+
+        if preferred in healthy:
+            healthy.remove(preferred)
+            healthy.insert(0, preferred)
+        return healthy + cooling
+
+    def get_stats(self):
+        """Per-backend routing statistics."""
+        now = time.monotonic()
+        with self._lock:
+            stats = {'policy': self.policy, 'order': list(self._order), 'backends': {}}
+            for name, health in self._health.items():
+                p50 = health.latency_percentile(0.5)
+                p95 = health.latency_percentile(0.95)
+                stats['backends'][name] = {
+                    'weight': self._weights.get(name, 1.0),
+                    'cost': self._costs.get(name, 1.0),
+                    'calls': health.total_calls,
+                    'failures': health.total_failures,
+                    'error_rate': round(health.error_rate, 4),
+                    'ewma_latency': round(health.ewma_latency, 4) if health.ewma_latency is not None else None,
+                    'p50_latency': round(p50, 4) if p50 is not None else None,
+                    'p95_latency': round(p95, 4) if p95 is not None else None,
+                    'cooling_down_for': round(max(0.0, health.open_until - now), 1),
+                }
+            return stats
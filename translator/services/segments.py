@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Helpers for sending several text segments in one translation request.
+Covers the "__BLOCK_n__" marker protocol and the JSON segment protocol.
+"""
+
+import json
+import re
+
+MARKER_PATTERN = re.compile(r"__BLOCK_(\d+)__")
+
+# Gemini responseSchema for the JSON segment protocol
+SEGMENTS_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "INTEGER"},
+            "text": {"type": "STRING"},
+        },
+        "required": ["id", "text"],
+    },
+}
+
+
+def join_with_markers(segments):
+    """
+    Combine segments into one "__BLOCK_n__"-delimited payload.
+
+    Args:
+        segments (list): Segment texts
+
+    Returns:
+        str: Payload with markers numbered from 1
+    """
+    return "".join(f"__BLOCK_{idx}__\n{text}\n\n" for idx, text in enumerate(segments, 1))
+
+
+def split_by_markers(translated_text, count):
+    """
+    Split a translated marker payload back into segments in one pass.
+
+    Text is assigned by marker number, so a dropped marker only loses its
+    own segment instead of shifting every following one.
+
+    Args:
+        translated_text (str): Translated payload
+        count (int): Number of segments that were sent
+
+    Returns:
+        list: `count` strings; "" for segments whose marker was not found
+    """
+    results = [""] * count
+    parts = MARKER_PATTERN.split(translated_text)
+    # parts = [preamble, number, text, number, text, ...]
+    for i in range(1, len(parts) - 1, 2):
+        idx = int(parts[i]) - 1
+        if 0 <= idx < count and not results[idx]:
+            results[idx] = parts[i + 1].strip()
+    return results
+
+
+def segments_to_json(segments):
+    """Serialize segments as a JSON array of {"id", "text"} objects, ids from 1."""
+    return json.dumps(
+        [{"id": idx, "text": text} for idx, text in enumerate(segments, 1)],
+        ensure_ascii=False,
+    )
+
+
+def parse_segments_json(response_text, count):
+    """
+    Parse a JSON segment response in one pass.
+
+    Args:
+        response_text (str): JSON array returned by the model
+        count (int): Number of segments that were sent
+
+    Returns:
+        list: `count` entries; None for segments that are missing,
+            duplicated or malformed and need to be requested again
+    """
+    results = [None] * count
+    try:
+        items = json.loads(response_text)
+    except (TypeError, ValueError):
+        return results
+    if not isinstance(items, list):
+        return results
+
+    seen = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        idx = item.get("id")
+        text = item.get("text")
+        if not isinstance(idx, int) or not isinstance(text, str) or not 1 <= idx <= count:
+            continue
+        if idx in seen:
+            # Two answers for one id - trust neither
+            results[idx - 1] = None
+            continue
+        seen.add(idx)
+        results[idx - 1] = text.strip()
+    return results
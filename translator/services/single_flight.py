@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+In-flight request coalescing.
+Concurrent calls with the same key share one outstanding backend call, from
+both threads and coroutines, and all receive its result or its error.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; later callers wait for its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> concurrent.futures.Future
+        self._leaders = 0
+        self._coalesced = 0
+
+    def _join(self, key):
+        """Return (future, is_leader) for `key`, registering a new call if none is running."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._leaders += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """
+        Call `fn()` unless a call for `key` is already in flight, then share its outcome.
+
+        Args:
+            key (hashable): Identity of the call
+            fn (callable): Performs the call
+
+        Returns:
+            The result of the shared call
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key, coro_fn):
+        """
+        Async counterpart of do(); `coro_fn()` returns the coroutine to await.
+
+        Waiters on other threads or event loops are served by the same call.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # Shield so that one cancelled waiter does not cancel the shared call
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def get_stats(self):
+        """Get coalescing counters."""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'backend_calls': self._leaders,
+                'coalesced': self._coalesced,
+            }
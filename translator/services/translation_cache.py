@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory.
+An in-memory LRU in front of a size-bounded SQLite store, keyed by the
+normalized source text, target language, model and prompt version, with an
+optional MinHash index for near-duplicate lookups.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from .fuzzy_index import MIN_FUZZY_CHARS, band_keys, jaccard, minhash_signature, shingles
+
+_WHITESPACE = re.compile(r"\s+")
+# Candidates verified per fuzzy lookup, most shared LSH bands first
+_FUZZY_CANDIDATES = 8
+
+FuzzyMatch = namedtuple('FuzzyMatch', ['similarity', 'source', 'translation'])
+
+
+def normalize_text(text):
+    """Normalize source text so trivially different copies share one entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(text, target_language, model, prompt_version):
+    """Stable key for one (source, language, model, prompt) combination."""
+    raw = "\x1f".join([prompt_version, model, target_language.strip().lower(), normalize_text(text)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Thread-safe two-level translation cache with TTL and LRU eviction."""
+
+    def __init__(self, db_path, max_entries=200000, ttl=30 * 24 * 3600, memory_entries=10000, fuzzy=False):
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.fuzzy = fuzzy
+
+        self._memory = OrderedDict()  # key -> (translation, created)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'expired': 0,
+            'evicted': 0,
+            'fuzzy_hits': 0,
+            'fuzzy_misses': 0,
+        }
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, source TEXT NOT NULL, target_language TEXT NOT NULL, "
+            "model TEXT NOT NULL, translation TEXT NOT NULL, "
+            "created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_access ON translations (last_access)"
+        )
+        if fuzzy:
+            # LSH band key -> translations rowid; stale rows are harmless because
+            # every candidate is verified against its stored source text
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS fuzzy_bands ("
+                "band INTEGER NOT NULL, entry INTEGER NOT NULL, PRIMARY KEY (band, entry)) WITHOUT ROWID"
+            )
+
+    def _connect(self):
+        """Get this thread's SQLite connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _remember(self, key, translation, created):
+        """Put an entry in the in-memory LRU."""
+        with self._lock:
+            self._memory[key] = (translation, created)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, text, target_language, model, prompt_version):
+        """
+        Look up a stored translation.
+
+        Returns:
+            str or None: The translation, or None on a miss
+        """
+        key = make_cache_key(text, target_language, model, prompt_version)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT translation, created FROM translations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+
+        translation, created = row
+        if now - created > self.ttl:
+            conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self._count('expired')
+            self._count('misses')
+            return None
+
+        conn.execute("UPDATE translations SET last_access = ? WHERE key = ?", (now, key))
+        self._remember(key, translation, created)
+        self._count('disk_hits')
+        return translation
+
+    def put(self, text, target_language, model, prompt_version, translation):
+        """Store a translation, evicting the least recently used entries if full."""
+        self.put_many([(text, translation)], target_language, model, prompt_version)
+
+    def put_many(self, items, target_language, model, prompt_version):
+        """
+        Store several translations in one transaction.
+
+        Args:
+            items (list): (source text, translation) pairs
+        """
+        items = [(text, translation) for text, translation in items if translation and text.strip()]
+        if not items:
+            return
+        now = time.time()
+        scope = "\x1f".join([prompt_version, model, target_language.strip().lower()])
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for text, translation in items:
+                key = make_cache_key(text, target_language, model, prompt_version)
+                source = normalize_text(text)
+                # Upsert rather than replace so the rowid referenced by fuzzy_bands stays valid
+                conn.execute(
+                    "INSERT INTO translations "
+                    "(key, source, target_language, model, translation, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET translation = excluded.translation, "
+                    "created = excluded.created, last_access = excluded.last_access",
+                    (key, source, target_language, model, translation, now, now),
+                )
+                if self.fuzzy and len(source) >= MIN_FUZZY_CHARS:
+                    entry = conn.execute("SELECT rowid FROM translations WHERE key = ?", (key,)).fetchone()[0]
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO fuzzy_bands (band, entry) VALUES (?, ?)",
+                        [(band, entry) for band in band_keys(minhash_signature(shingles(source)), scope)],
+                    )
+                self._remember(key, translation, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._count('writes', len(items))
+
+        with self._lock:
+            self._writes_since_trim += len(items)
+            # Checking the table size on every write would cost a COUNT(*) each time
+            due = self._writes_since_trim >= max(1, self.max_entries // 100)
+            if due:
+                self._writes_since_trim = 0
+        if due:
+            self.trim()
+
+    def find_similar(self, text, target_language, model, prompt_version, min_similarity):
+        """
+        Find the stored translation whose source is most similar to `text`.
+
+        Similarity is the Jaccard index of character shingles, so a clause
+        that differs only by a name or a date scores close to 1.
+
+        Returns:
+            FuzzyMatch or None: Best match at or above min_similarity
+        """
+        if not self.fuzzy:
+            return None
+        source = normalize_text(text)
+        if len(source) < MIN_FUZZY_CHARS:
+            return None
+
+        query_shingles = shingles(source)
+        scope = "\x1f".join([prompt_version, model, target_language.strip().lower()])
+        bands = band_keys(minhash_signature(query_shingles), scope)
+        rows = self._connect().execute(
+            "SELECT t.source, t.translation, t.target_language, t.model, t.created "
+            "FROM fuzzy_bands b JOIN translations t ON t.rowid = b.entry "
+            f"WHERE b.band IN ({','.join('?' * len(bands))}) "
+            "GROUP BY b.entry ORDER BY COUNT(*) DESC LIMIT ?",
+            (*bands, _FUZZY_CANDIDATES),
+        ).fetchall()
+
+        best = None
+        oldest = time.time() - self.ttl
+        for candidate, translation, language, candidate_model, created in rows:
+            if created < oldest or candidate_model != model \
+                    or language.strip().lower() != target_language.strip().lower():
+                continue
+            similarity = jaccard(query_shingles, shingles(candidate))
+            if similarity >= min_similarity and (best is None or similarity > best.similarity):
+                best = FuzzyMatch(round(similarity, 4), candidate, translation)
+
+        self._count('fuzzy_hits' if best else 'fuzzy_misses')
+        return best
+
+    def trim(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        conn = self._connect()
+        expired = conn.execute(
+            "DELETE FROM translations WHERE created < ?", (time.time() - self.ttl,)
+        ).rowcount
+        self._count('expired', max(expired, 0))
+
+        total = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = total - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                "SELECT key FROM translations ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self._count('evicted', excess)
+
+        if self.fuzzy and (expired > 0 or excess > 0):
+            conn.execute(
+                "DELETE FROM fuzzy_bands WHERE entry NOT IN (SELECT rowid FROM translations)"
+            )
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._memory.clear()
+        self._connect().execute("DELETE FROM translations")
+        if self.fuzzy:
+            self._connect().execute("DELETE FROM fuzzy_bands")
+
+    def get_stats(self):
+        """Hit/miss counters and sizes."""
+        entries = self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['entries'] = entries
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
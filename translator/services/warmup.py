@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Background warm-up of translation backends.
+Loads backends on worker threads at start-up, so the first request after a
+deploy does not wait through a model load, and reports how far loading got.
+"""
+
+import threading
+import time
+
+
+class ServiceWarmup:
+    """
+    Loads registered backends at start-up, each on its own daemon thread so
+    a quick backend is not held up behind a slow model load.
+
+    Each backend goes through 'pending', 'loading', then 'ready' or 'failed'
+    ('unavailable' if it cannot be used here). Loading goes through the
+    service's own load_service(), so a request that needs a backend still
+    loading waits on that service's load instead of starting a second one.
+    """
+
+    def __init__(self, services):
+        """
+        Args:
+            services (dict): Backend name to service; read when the warm-up starts
+        """
+        self.services = services
+        self._lock = threading.Lock()
+        self._threads = []
+        self._states = {}
+
+    def start(self, service_names=None):
+        """
+        Start loading in the background. Only the first call does anything.
+
+        Args:
+            service_names (list, optional): Backends to load; all registered ones if omitted
+
+        Returns:
+            bool: True if this call started the warm-up
+        """
+        with self._lock:
+            if self._threads:
+                return False
+            names = [name for name in (self.services if service_names is None else service_names)
+                     if name in self.services]
+            self._states = {name: {'state': 'pending', 'started': None, 'finished': None, 'error': None}
+                            for name in names}
+            self._threads = [
+                threading.Thread(target=self._load, args=(name,), name=f"translation-warmup-{name}", daemon=True)
+                for name in names
+            ]
+            for thread in self._threads:
+                thread.start()
+            return bool(self._threads)
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._states[name].update(fields)
+
+    def _load(self, name):
+        service = self.services[name]
+        if not service.is_available():
+            self._set(name, state='unavailable')
+            return
+
+        started = time.monotonic()
+        self._set(name, state='loading', started=started)
+        print(f"[Warm-up] Loading {name}...")
+        try:
+            service.load_service()
+        except Exception as e:
+            self._set(name, state='failed', finished=time.monotonic(), error=str(e))
+            print(f"[Warm-up] {name} failed to load: {str(e)}")
+        else:
+            finished = time.monotonic()
+            self._set(name, state='ready', finished=finished)
+            print(f"[Warm-up] {name} ready in {finished - started:.1f}s")
+
+    @property
+    def started(self):
+        return bool(self._threads)
+
+    @property
+    def finished(self):
+        return bool(self._threads) and not any(thread.is_alive() for thread in self._threads)
+
+    def is_loading(self, name):
+        """True while the warm-up has yet to finish loading a backend."""
+        with self._lock:
+            state = self._states.get(name)
+            return state is not None and state['state'] in ('pending', 'loading')
+
+    def wait(self, timeout=None):
+        """Block until the warm-up has finished. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def get_status(self):
+        """Per-backend state, seconds spent loading, the service's load stage and any error."""
+        now = time.monotonic()
+        with self._lock:
+            backends = {}
+            for name, state in self._states.items():
+                seconds = None
+                if state['started'] is not None:
+                    seconds = round((state['finished'] or now) - state['started'], 1)
+                backends[name] = {
+                    'state': state['state'],
+                    'seconds': seconds,
+                    'stage': getattr(self.services.get(name), 'load_stage', None),
+                    'error': state['error'],
+                }
+        return {'started': self.started, 'finished': self.finished, 'backends': backends}
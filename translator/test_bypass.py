@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the segment bypass (segments copied through untranslated).
+
+Usage:
+    python3 translator/test_bypass.py
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.bypass import _FORMULA, classify_segment
+
+
+class FormulaTest(unittest.TestCase):
+    def test_formulas(self):
+        for formula in ("H2O", "C6H12O6", "Ca(OH)2", "(NH4)2SO4", "SO4^2-", "NH4+"):
+            self.assertEqual(classify_segment(formula), 'formula', formula)
+
+    def test_long_digit_run_is_fast(self):
+        # Used to backtrack for tens of seconds at this length
+        text = "A" + "1" * 20000 + "a"
+        start = time.perf_counter()
+        self.assertIsNone(_FORMULA.match(text))
+        self.assertIsNone(classify_segment(text, "French"))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+class SharedScriptTest(unittest.TestCase):
+    """Cyrillic and Devanagari are written by several languages; the script alone must not bypass."""
+
+    def test_bulgarian_is_translated_to_russian(self):
+        text = "Това е кратък текст на български език, който не бива да се бърка с руски."
+        self.assertIsNone(classify_segment(text, "Russian"))
+
+    def test_marathi_is_translated_to_hindi(self):
+        for text in ("हे मराठी भाषेतील एक वाक्य आहे.", "मी उद्या शाळेत जाणार आहे आणि माझा मित्र पण येणार आहे."):
+            self.assertIsNone(classify_segment(text, "Hindi"), text)
+
+    def test_target_language_is_still_bypassed(self):
+        self.assertEqual(classify_segment("Вчера мы ходили на рынок и купили фрукты и овощи.", "Russian"),
+                         'target_language')
+        self.assertEqual(classify_segment("मैं कल स्कूल जाऊँगा और मेरा दोस्त भी आएगा।", "Hindi"), 'target_language')
+
+
+if __name__ == "__main__":
+    unittest.main()
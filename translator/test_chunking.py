@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted chunking of translation payloads.
+
+Usage:
+    python3 translator/test_chunking.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.chunking import TokenBudgetChunker
+
+
+class RebalanceTest(unittest.TestCase):
+    def setUp(self):
+        # Every segment costs 10 + 8 overhead = 18 tokens
+        self.texts = ["x" * 40] * 12
+        self.chunker = TokenBudgetChunker(max_tokens=100, min_tokens=50)
+
+    def sizes(self, chunks):
+        return [sum(self.chunker.segment_cost(self.texts[i]) for i in chunk) for chunk in chunks]
+
+    def test_small_last_chunk_takes_segments_from_previous(self):
+        # Greedy packing gives 5 + 5 + 2 segments; the last chunk is 36 tokens
+        chunks = self.chunker.plan(self.texts)
+        self.assertEqual([index for chunk in chunks for index in chunk], list(range(12)))
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 4, 3])
+        self.assertTrue(all(size <= self.chunker.max_tokens for size in self.sizes(chunks)))
+
+    def test_last_chunk_never_outgrows_previous(self):
+        chunks = TokenBudgetChunker(max_tokens=100, min_tokens=100).plan(self.texts[:7])
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 3])
+
+    def test_large_enough_last_chunk_is_kept(self):
+        chunks = self.chunker.plan(self.texts[:8])
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 3])
+
+    def test_oversized_segment_keeps_its_own_chunk(self):
+        texts = ["x" * 1000, "short"]
+        self.assertEqual(self.chunker.plan(texts), [[0], [1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for token-bucket rate limiting, Retry-After handling and the API key pool.
+
+Usage:
+    python3 translator/test_rate_limiting.py
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.errors import TranslationRateLimitError, TranslationServerError
+from services.google_gemini.key_pool import ApiKeyPool
+from services.rate_limiter import LocalBucketBackend, SqliteBucketBackend
+from services.retry import RetryPolicy, parse_retry_after
+
+# 10 tokens per second, bursts of 2
+BUCKETS = [("test:second", 10.0, 2.0)]
+
+
+class TokenBucketTest(unittest.TestCase):
+    def check_refill(self, backend):
+        self.assertEqual(backend.reserve(BUCKETS), 0.0)
+        self.assertEqual(backend.reserve(BUCKETS), 0.0)
+        # Burst spent: the third request waits for one token at 10/s
+        self.assertAlmostEqual(backend.reserve(BUCKETS), 0.1, delta=0.02)
+        time.sleep(0.25)
+        # The debt is repaid and the bucket refills, up to its capacity
+        self.assertAlmostEqual(backend.available(BUCKETS), 1.5, delta=0.2)
+        time.sleep(0.3)
+        self.assertEqual(backend.available(BUCKETS), 2.0)
+
+    def test_local_refill(self):
+        self.check_refill(LocalBucketBackend())
+
+    def test_sqlite_refill(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.check_refill(SqliteBucketBackend(Path(tmp) / "buckets.sqlite3"))
+
+    def test_sqlite_buckets_are_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "buckets.sqlite3"
+            first, second = SqliteBucketBackend(path), SqliteBucketBackend(path)
+            first.reserve(BUCKETS)
+            first.reserve(BUCKETS)
+            self.assertGreater(second.reserve(BUCKETS), 0.0)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_parse_seconds_and_dates(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("-5"), 0.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 30, usegmt=True)), 30, delta=2)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_retry_after_is_a_minimum_delay(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, max_total_delay=60.0)
+        error = TranslationServerError("Server error (503)", 503, retry_after=5.0)
+        self.assertEqual(policy.next_delay(1, error, waited=0.0), 5.0)
+
+    def test_retry_after_beyond_budget_stops(self):
+        policy = RetryPolicy(max_total_delay=60.0)
+        error = TranslationRateLimitError("Rate limit exceeded (429)", 429, retry_after=30.0)
+        self.assertIsNone(policy.next_delay(1, error, waited=40.0))
+
+
+class KeyPoolTest(unittest.TestCase):
+    def test_rate_limited_key_is_benched_and_skipped(self):
+        pool = ApiKeyPool(["key-a", "key-b"], max_per_second=50, max_per_minute=4000)
+        first, wait = pool.acquire()
+        self.assertEqual(wait, 0.0)
+
+        error = TranslationRateLimitError("Rate limit exceeded (429)", 429, retry_after=120.0)
+        self.assertTrue(pool.report_error(first, error))
+        # Benched for the server's Retry-After
+        self.assertAlmostEqual(first.benched_until - time.monotonic(), 120.0, delta=1.0)
+
+        for _ in range(3):
+            key, wait = pool.acquire()
+            self.assertIsNot(key, first)
+            self.assertEqual(wait, 0.0)
+
+    def test_all_keys_benched_waits_for_the_first_back(self):
+        pool = ApiKeyPool(["key-a", "key-b"], max_per_second=50, max_per_minute=4000, rate_limit_bench=30.0)
+        a, b = pool.keys
+        pool.report_error(a, TranslationRateLimitError("Rate limit exceeded (429)", 429, retry_after=60.0))
+        self.assertFalse(pool.report_error(b, TranslationRateLimitError("Rate limit exceeded (429)", 429)))
+
+        key, wait = pool.acquire()
+        self.assertIs(key, b)
+        self.assertAlmostEqual(wait, 30.0, delta=1.0)
+        # Over the caller's budget: nothing is reserved
+        requests = b.requests
+        key, wait = pool.acquire(max_wait=10.0)
+        self.assertGreater(wait, 10.0)
+        self.assertEqual(b.requests, requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
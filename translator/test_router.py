@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for backend routing: policies and the per-backend circuit breaker.
+
+Usage:
+    python3 translator/test_router.py
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.router import BackendRouter
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.router = BackendRouter(failure_threshold=2, cooldown=0.1, max_cooldown=1.0)
+        self.router.add_backend('gemini')
+        self.router.add_backend('local')
+
+    def fail(self, name, times):
+        for _ in range(times):
+            self.router.record(name, False, 0.5)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail('gemini', 1)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+        self.fail('gemini', 1)
+        # Still tried, but only after the healthy backends
+        self.assertEqual(self.router.order(['gemini', 'local']), ['local', 'gemini'])
+
+    def test_success_resets_the_failure_count(self):
+        self.fail('gemini', 1)
+        self.router.record('gemini', True, 0.2)
+        self.fail('gemini', 1)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+
+    def test_half_open_recovery(self):
+        self.fail('gemini', 2)
+        time.sleep(0.15)
+        # Cool-down over: back in rotation for a trial call
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+        self.router.record('gemini', True, 0.2)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+        self.assertEqual(self.router.get_stats()['backends']['gemini']['cooling_down_for'], 0.0)
+        # Closed again: one new failure is below the threshold
+        self.fail('gemini', 1)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+
+    def test_failed_trial_reopens_with_a_longer_cooldown(self):
+        self.fail('gemini', 2)
+        time.sleep(0.15)
+        self.fail('gemini', 1)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['local', 'gemini'])
+        # Doubled to 0.2s: still open after the first cool-down's length
+        time.sleep(0.15)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['local', 'gemini'])
+        time.sleep(0.1)
+        self.assertEqual(self.router.order(['gemini', 'local']), ['gemini', 'local'])
+
+    def test_preferred_backend_is_skipped_while_open(self):
+        self.fail('local', 2)
+        self.assertEqual(self.router.order(['gemini', 'local'], preferred='local'), ['gemini', 'local'])
+
+
+class PolicyTest(unittest.TestCase):
+    def test_latency_policy_prefers_the_faster_backend(self):
+        router = BackendRouter(policy='latency')
+        router.add_backend('gemini')
+        router.add_backend('local')
+        router.record('gemini', True, 2.0)
+        router.record('local', True, 0.3)
+        self.assertEqual(router.order(['gemini', 'local']), ['local', 'gemini'])
+
+    def test_cheapest_policy_orders_by_cost(self):
+        router = BackendRouter(policy='cheapest')
+        router.add_backend('gemini', cost=1.0)
+        router.add_backend('local', cost=0.0)
+        self.assertEqual(router.order(['gemini', 'local']), ['local', 'gemini'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for in-flight request coalescing.
+
+Usage:
+    python3 translator/test_single_flight.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.errors import TranslationServerError
+from services.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def fn():
+            calls.append(1)
+            release.wait(2)
+            return "bonjour"
+
+        with ThreadPoolExecutor(5) as pool:
+            futures = [pool.submit(flight.do, "hello", fn)]
+            time.sleep(0.05)
+            futures += [pool.submit(flight.do, "hello", fn) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, ["bonjour"] * 5)
+        self.assertEqual(len(calls), 1)
+        stats = flight.get_stats()
+        self.assertEqual((stats['backend_calls'], stats['coalesced'], stats['in_flight']), (1, 4, 0))
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait(2)
+            raise TranslationServerError("Server error (503)", 503)
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(flight.do, "hello", fn)]
+            time.sleep(0.05)
+            futures += [pool.submit(flight.do, "hello", fn) for _ in range(2)]
+            time.sleep(0.05)
+            release.set()
+            for future in futures:
+                with self.assertRaises(TranslationServerError):
+                    future.result()
+
+        # A failed call is not remembered: the next caller runs its own
+        self.assertEqual(flight.do("hello", lambda: "hallo"), "hallo")
+
+    def test_different_keys_do_not_coalesce(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+        self.assertEqual(flight.do("b", lambda: 2), 2)
+        self.assertEqual(flight.get_stats()['coalesced'], 0)
+
+    def test_async_calls_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "hola"
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async("hello", call) for _ in range(4)))
+
+        self.assertEqual(asyncio.run(main()), ["hola"] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_async_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            raise TranslationServerError("Server error (502)", 502)
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async("hello", call) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, TranslationServerError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the translation memory: TTL expiry and least-recently-used eviction.
+
+Usage:
+    python3 translator/test_translation_cache.py
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.translation_cache import TranslationCache
+
+MODEL = ("gemini-2.5-flash", "v1")
+
+
+class TranslationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "memory.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_after_put(self):
+        cache = TranslationCache(self.db_path)
+        cache.put("Hello  world", "French", *MODEL, "Bonjour le monde")
+        # Keys are normalized, so whitespace differences still hit
+        self.assertEqual(cache.get("Hello world", "French", *MODEL), "Bonjour le monde")
+        self.assertIsNone(cache.get("Hello world", "German", *MODEL))
+        self.assertIsNone(cache.get("Hello world", "French", "gemini-2.0-flash", "v1"))
+
+    def test_failed_translations_are_not_stored(self):
+        cache = TranslationCache(self.db_path)
+        cache.put("Hello", "French", *MODEL, "")
+        self.assertIsNone(cache.get("Hello", "French", *MODEL))
+
+    def test_entries_expire_after_ttl(self):
+        cache = TranslationCache(self.db_path, ttl=0.1)
+        cache.put("Hello", "French", *MODEL, "Bonjour")
+        self.assertEqual(cache.get("Hello", "French", *MODEL), "Bonjour")
+        time.sleep(0.15)
+        self.assertIsNone(cache.get("Hello", "French", *MODEL))
+
+        # Expired on disk too, not only in the memory LRU
+        cache = TranslationCache(self.db_path, ttl=0.1, memory_entries=0)
+        cache.put("Hello", "French", *MODEL, "Bonjour")
+        time.sleep(0.15)
+        self.assertIsNone(cache.get("Hello", "French", *MODEL))
+        self.assertGreaterEqual(cache.get_stats()['expired'], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        # No memory LRU, so every lookup reads and touches the SQLite row
+        cache = TranslationCache(self.db_path, max_entries=3, memory_entries=0)
+        for text in ("one", "two", "three"):
+            cache.put(text, "French", *MODEL, text.upper())
+        time.sleep(0.01)
+        self.assertEqual(cache.get("one", "French", *MODEL), "ONE")
+
+        cache.put("four", "French", *MODEL, "FOUR")
+        self.assertIsNone(cache.get("two", "French", *MODEL))
+        for text in ("one", "three", "four"):
+            self.assertEqual(cache.get(text, "French", *MODEL), text.upper())
+        stats = cache.get_stats()
+        self.assertEqual((stats['entries'], stats['evicted']), (3, 1))
+
+    def test_memory_lru_is_bounded(self):
+        cache = TranslationCache(self.db_path, memory_entries=2)
+        for text in ("one", "two", "three"):
+            cache.put(text, "French", *MODEL, text.upper())
+        self.assertEqual(cache.get_stats()['memory_entries'], 2)
+        # Dropped from memory, still served from disk
+        self.assertEqual(cache.get("one", "French", *MODEL), "ONE")
+        self.assertEqual(cache.get_stats()['disk_hits'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -206,6 +206,34 @@ class FileExtractor:
             print(f"[PDF_TRANSLATOR] PDF translation error: {str(e)}")
             return {'success': False, 'error': f'PDF translation error: {str(e)}'}
     
+    def translate_pdf_pages_to_languages(self, file_path, page_numbers, target_languages, translation_service):
+        """Translate specific PDF pages into several languages, extracting the document once."""
+        try:
+            print(f"[PDF_TRANSLATOR] Using advanced PDF translator for {Path(file_path).name} "
+                  f"({len(target_languages)} languages)")
+            from .pdf_translator_advanced import advanced_pdf_translator
+
+            return advanced_pdf_translator.translate_pdf_to_languages(
+                file_path, page_numbers, target_languages, translation_service
+            )
+
+        except ImportError:
+            print("[PDF_TRANSLATOR] Advanced translator not available, falling back to basic method")
+            outputs = []
+            for target_language in target_languages:
+                result = self._translate_pdf_basic(file_path, page_numbers, target_language, translation_service)
+                if not result['success']:
+                    return result
+                outputs.append({
+                    'target_language': target_language,
+                    'output_path': result['output_path'],
+                    'filename': result['filename'],
+                })
+            return {'success': True, 'outputs': outputs, 'translated_pages': result['translated_pages']}
+        except Exception as e:
+            print(f"[PDF_TRANSLATOR] PDF translation error: {str(e)}")
+            return {'success': False, 'error': f'PDF translation error: {str(e)}'}
+
     def _translate_pdf_basic(self, file_path, page_numbers, target_language, translation_service):
         """Basic PDF translation method as fallback."""
         try:
@@ -237,7 +265,8 @@ class FileExtractor:
                 # Extract text blocks with positioning using redaction approach
                 page_dict = original_page.get_text("dict")
                 
-                # Process each text block for translation
+                # Collect each text block's text, position and formatting
+                page_blocks = []
                 for block in page_dict.get("blocks", []):
                     if "lines" in block:  # Text block
                         # Collect all text and formatting info from the block
@@ -268,88 +297,94 @@ class FileExtractor:
                                         block_bbox = block_bbox | bbox
                         
                         if block_text_parts and block_bbox:
-                            # Combine text and translate
-                            original_text = " ".join(block_text_parts).strip()
-                            
-                            try:
-                                translated_text = translation_service.translate(original_text, target_language)
-                                if not translated_text or translated_text.strip() == "":
-                                    translated_text = original_text  # Fallback
-                            except Exception as e:
-                                print(f"Translation error: {e}")
-                                translated_text = original_text  # Fallback to original
-                            
-                            # Choose appropriate font based on target language and content
-                            fontname = self._get_appropriate_font(target_language, font_info)
-                            
-                            # Determine text styling
-                            is_bold = bool(font_info['flags'] & 2**4)
-                            is_italic = bool(font_info['flags'] & 2**6)
-                            
-                            # Convert color from int to RGB tuple
-                            color = self._convert_color(font_info['color'])
-                            
-                            # Insert translated text with better error handling
-                            try:
-                                # Try insert_htmlbox first for better Unicode support
-                                font_size = max(8, min(font_info['size'], 24))  # Reasonable font size range
-                                
-                                # Create HTML with proper encoding
-                                html_content = self._create_html_content(translated_text, font_size, color, is_bold, is_italic)
-                                
-                                # Try HTML insertion first (better for Unicode)
-                                try:
-                                    insertion_result = new_page.insert_htmlbox(block_bbox, html_content)
-                                    if insertion_result[0] < 0:  # HTML insertion failed
-                                        raise Exception("HTML insertion failed")
-                                except:
-                                    # Fallback to textbox with Unicode font
+                            page_blocks.append((" ".join(block_text_parts).strip(), block_bbox, font_info))
+
+                # Translate the whole page in as few requests as possible
+                originals = [block[0] for block in page_blocks]
+                try:
+                    if hasattr(translation_service, 'translate_batch'):
+                        translations = translation_service.translate_batch(originals, target_language)
+                    else:
+                        translations = [translation_service.translate(text, target_language) for text in originals]
+                except Exception as e:
+                    print(f"Translation error: {e}")
+                    translations = originals  # Fallback to original
+
+                for (original_text, block_bbox, font_info), translated_text in zip(page_blocks, translations):
+                    if not translated_text or translated_text.strip() == "":
+                        translated_text = original_text  # Fallback
+                    
+                    # Choose appropriate font based on target language and content
+                    fontname = self._get_appropriate_font(target_language, font_info)
+
+                    # Determine text styling
+                    is_bold = bool(font_info['flags'] & 2**4)
+                    is_italic = bool(font_info['flags'] & 2**6)
+
+                    # Convert color from int to RGB tuple
+                    color = self._convert_color(font_info['color'])
+
+                    # Insert translated text with better error handling
+                    try:
+                        # Try insert_htmlbox first for better Unicode support
+                        font_size = max(8, min(font_info['size'], 24))  # Reasonable font size range
+
+                        # Create HTML with proper encoding
+                        html_content = self._create_html_content(translated_text, font_size, color, is_bold, is_italic)
+
+                        # Try HTML insertion first (better for Unicode)
+                        try:
+                            insertion_result = new_page.insert_htmlbox(block_bbox, html_content)
+                            if insertion_result[0] < 0:  # HTML insertion failed
+                                raise Exception("HTML insertion failed")
+                        except:
+                            # Fallback to textbox with Unicode font
+                            insertion_result = new_page.insert_textbox(
+                                block_bbox,
+                                translated_text,
+                                fontname=fontname,
+                                fontsize=font_size,
+                                color=color,
+                                align=0,
+                                encoding=0  # Use default encoding for better compatibility
+                            )
+
+                            # If still failing, try with smaller font
+                            if insertion_result < 0:
+                                for smaller_size in [font_size * 0.8, font_size * 0.6, font_size * 0.4]:
+                                    if smaller_size < 6:
+                                        break
                                     insertion_result = new_page.insert_textbox(
                                         block_bbox,
                                         translated_text,
                                         fontname=fontname,
-                                        fontsize=font_size,
+                                        fontsize=smaller_size,
                                         color=color,
                                         align=0,
-                                        encoding=0  # Use default encoding for better compatibility
-                                    )
-                                    
-                                    # If still failing, try with smaller font
-                                    if insertion_result < 0:
-                                        for smaller_size in [font_size * 0.8, font_size * 0.6, font_size * 0.4]:
-                                            if smaller_size < 6:
-                                                break
-                                            insertion_result = new_page.insert_textbox(
-                                                block_bbox,
-                                                translated_text,
-                                                fontname=fontname,
-                                                fontsize=smaller_size,
-                                                color=color,
-                                                align=0,
-                                                encoding=0  # Use default encoding
-                                            )
-                                            if insertion_result >= 0:
-                                                break
-                                
-                            except Exception as e:
-                                print(f"Error inserting text: {e}")
-                                # Ultimate fallback: simple text insertion
-                                try:
-                                    new_page.insert_text(
-                                        block_bbox.tl,
-                                        translated_text,
-                                        fontsize=12,
-                                        color=(0, 0, 0),
                                         encoding=0  # Use default encoding
                                     )
-                                except:
-                                    # Last resort: insert original text
-                                    new_page.insert_text(
-                                        block_bbox.tl,
-                                        original_text,
-                                        fontsize=12,
-                                        color=(0, 0, 0)
-                                    )
+                                    if insertion_result >= 0:
+                                        break
+
+                    except Exception as e:
+                        print(f"Error inserting text: {e}")
+                        # Ultimate fallback: simple text insertion
+                        try:
+                            new_page.insert_text(
+                                block_bbox.tl,
+                                translated_text,
+                                fontsize=12,
+                                color=(0, 0, 0),
+                                encoding=0  # Use default encoding
+                            )
+                        except:
+                            # Last resort: insert original text
+                            new_page.insert_text(
+                                block_bbox.tl,
+                                original_text,
+                                fontsize=12,
+                                color=(0, 0, 0)
+                            )
             
             original_doc.close()
             
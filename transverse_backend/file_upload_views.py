@@ -189,6 +189,8 @@ def translate_pdf_pages(request):
         uploaded_file = request.FILES['file']
         page_numbers = request.POST.get('pages', None)
         target_language = request.POST.get('target_language', 'English')
+        # Optional - several languages in one job, as repeated fields or comma-separated
+        target_languages = _parse_target_languages(request.POST.getlist('target_languages'))
         service_name = request.POST.get('service_name')  # Get the specific service to use
         
         # Parse page numbers
@@ -226,14 +228,14 @@ def translate_pdf_pages(request):
         try:
             from .translation_service import translation_service
             
-            # Set service if specified
-            if service_name and hasattr(translation_service, 'set_service'):
-                success = translation_service.set_service(service_name)
-                if not success:
+            # Bind the requested service to this request only
+            if service_name and hasattr(translation_service, 'for_request'):
+                if not translation_service.has_service(service_name):
                     return JsonResponse({
                         'success': False,
-                        'error': f'Failed to set translation service to {service_name}'
+                        'error': f'Translation service not available: {service_name}'
                     }, status=400)
+                translation_service = translation_service.for_request(service_name)
             
         except ImportError:
             return JsonResponse({
@@ -241,6 +243,41 @@ def translate_pdf_pages(request):
                 'error': 'Translation service not available'
             }, status=500)
         
+        if target_languages:
+            # Extract once, translate into every language together, one PDF per language
+            result = file_extractor.translate_pdf_pages_to_languages(
+                temp_filepath,
+                page_numbers,
+                target_languages,
+                translation_service
+            )
+
+            try:
+                os.remove(temp_filepath)
+            except:
+                pass
+
+            if not result['success']:
+                return JsonResponse({
+                    'success': False,
+                    'error': result['error']
+                }, status=500)
+
+            return JsonResponse({
+                'success': True,
+                'translated_pages': result['translated_pages'],
+                'outputs': [
+                    {
+                        'target_language': output['target_language'],
+                        'output_path': output['output_path'],
+                        'filename': output['filename'],
+                        'download_url': f'/api/download-pdf/{output["filename"]}'
+                    }
+                    for output in result['outputs']
+                ],
+                'service_used': service_name or 'default'
+            })
+
         # Translate PDF pages
         result = file_extractor.translate_pdf_pages(
             temp_filepath, 
@@ -276,6 +313,15 @@ def translate_pdf_pages(request):
             'error': f'Server error: {str(e)}'
         }, status=500)
 
+def _parse_target_languages(values):
+    """Flatten a list of target languages given as a JSON list, repeated fields or comma-separated strings."""
+    languages = []
+    for value in values or []:
+        for language in str(value).split(','):
+            if language.strip() and language.strip() not in languages:
+                languages.append(language.strip())
+    return languages
+
 @require_http_methods(["GET"])
 def download_translated_pdf(request, filename):
     """Download a translated PDF file."""
@@ -338,14 +384,39 @@ def get_supported_types(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def translate_text(request):
-    """Translate text using the current translation service."""
+    """Translate text using the requested or default translation service."""
     try:
         # Get JSON data from request
         data = json.loads(request.body)
         text = data.get('text', '').strip()
         target_language = data.get('target_language', 'English')
+        stream = bool(data.get('stream', False))
+        service_name = data.get('service_name')  # Optional - backend to try first for this request
+        segments = data.get('segments')  # Optional - list of texts translated together, order preserved
+        target_languages = data.get('target_languages')  # Optional - translate into several languages at once
+
+        if segments is not None and (
+            not isinstance(segments, list) or not all(isinstance(segment, str) for segment in segments)
+        ):
+            return JsonResponse({
+                'success': False,
+                'error': 'segments must be a list of strings'
+            }, status=400)
+
+        if target_languages is not None:
+            if not isinstance(target_languages, list):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'target_languages must be a list'
+                }, status=400)
+            target_languages = _parse_target_languages(target_languages)
+            if stream:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Streaming supports a single target language'
+                }, status=400)
 
-        if not text:
+        if not text and not segments:
             return JsonResponse({
                 'success': False,
                 'error': 'No text provided for translation'
@@ -358,10 +429,70 @@ def translate_text(request):
         translator_path = Path(__file__).parent.parent / "translator"
         if str(translator_path) not in sys.path:
             sys.path.insert(0, str(translator_path))
-        from services.manager import translate_text as translate_func
+        from services.manager import translate_text as translate_func, translation_manager
+        from services.errors import TranslationError
+
+        if service_name and service_name not in translation_manager.get_available_services():
+            return JsonResponse({
+                'success': False,
+                'error': f'Translation service not available: {service_name}'
+            }, status=400)
+
+        if target_languages:
+            try:
+                translations = translation_manager.translate_batch_multi(
+                    segments or [text], target_languages, service_name
+                )
+            except TranslationError as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Translation failed: {str(e)}'
+                }, status=e.http_status)
+
+            if segments:
+                return JsonResponse({
+                    'success': True,
+                    'translations': translations,
+                    'original_segments': segments,
+                    'target_languages': target_languages
+                })
+            return JsonResponse({
+                'success': True,
+                'translations': {language: translated[0] for language, translated in translations.items()},
+                'original_text': text,
+                'target_languages': target_languages
+            })
+
+        if segments:
+            try:
+                translated_segments = translation_manager.translate_batch(segments, target_language, service_name)
+            except TranslationError as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Translation failed: {str(e)}'
+                }, status=e.http_status)
+
+            return JsonResponse({
+                'success': True,
+                'translated_segments': translated_segments,
+                'original_segments': segments,
+                'target_language': target_language
+            })
+
+        if stream:
+            from services.manager import translate_text_stream
+            return _translation_event_stream(
+                translate_text_stream(text, target_language, service_name), TranslationError
+            )
 
         # Perform translation
-        translated_text = translate_func(text, target_language)
+        try:
+            translated_text = translate_func(text, target_language, service_name)
+        except TranslationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Translation failed: {str(e)}'
+            }, status=e.http_status)
 
         return JsonResponse({
             'success': True,
@@ -381,6 +512,30 @@ def translate_text(request):
             'error': f'Translation error: {str(e)}'
         }, status=500)
 
+def _translation_event_stream(chunks, error_class):
+    """
+    Relay translation chunks as a server-sent events response.
+
+    Each piece is sent as a `data: {"delta": ...}` event, followed by an
+    `event: done` message, or an `event: error` message if the backend fails.
+    """
+    from django.http import StreamingHttpResponse
+
+    def events():
+        try:
+            for delta in chunks:
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except error_class as e:
+            yield f"event: error\ndata: {json.dumps({'error': f'Translation failed: {str(e)}'})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': f'Translation error: {str(e)}'})}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
 # Translation Service Management Endpoints
 
 @require_http_methods(["GET"])
@@ -424,7 +579,13 @@ def get_translation_services(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def set_translation_service(request):
-    """Set the active translation service."""
+    """
+    Check that a translation service can be selected.
+
+    Nothing is stored: a client choosing a backend must not change it for
+    every other client. Clients pass `service_name` with each translation
+    request instead.
+    """
     try:
         data = json.loads(request.body)
         service_name = data.get('service_name')
@@ -437,17 +598,17 @@ def set_translation_service(request):
         
         from .translation_service import translation_service
         
-        if hasattr(translation_service, 'set_service'):
-            success = translation_service.set_service(service_name)
-            if success:
+        if hasattr(translation_service, 'has_service'):
+            if translation_service.has_service(service_name):
                 return JsonResponse({
                     'success': True,
-                    'message': f'Translation service set to: {service_name}'
+                    'service': service_name,
+                    'message': f'{service_name} is available; pass service_name with each request to use it'
                 })
             else:
                 return JsonResponse({
                     'success': False,
-                    'error': f'Failed to set service to: {service_name}'
+                    'error': f'Service not available: {service_name}'
                 }, status=400)
         else:
             # Legacy service only supports local_transformer
@@ -476,27 +637,28 @@ def set_translation_service(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def load_translation_service(request):
-    """Load/initialize the current translation service."""
+    """Load/initialize a translation service, or every available one."""
     try:
         data = json.loads(request.body) if request.body else {}
-        service_name = data.get('service_name')  # Optional - will use current if not specified
+        service_name = data.get('service_name')  # Optional - loads every available service if not specified
         
         from .translation_service import translation_service
         
-        if service_name and hasattr(translation_service, 'set_service'):
-            # Set service first if specified
-            success = translation_service.set_service(service_name)
-            if not success:
+        if service_name and hasattr(translation_service, 'has_service'):
+            if not translation_service.has_service(service_name):
                 return JsonResponse({
                     'success': False,
-                    'error': f'Failed to set service to: {service_name}'
+                    'error': f'Translation service not available: {service_name}'
                 }, status=400)
         
         # Load the service
         if hasattr(translation_service, 'load_model'):
-            translation_service.load_model()
+            if hasattr(translation_service, 'for_request'):
+                translation_service.load_model(service_name)
+            else:
+                translation_service.load_model()
             
-            current_service = getattr(translation_service.manager, 'current_service', 'local_transformer') if hasattr(translation_service, 'manager') else 'local_transformer'
+            current_service = service_name or (getattr(translation_service.manager, 'current_service', 'local_transformer') if hasattr(translation_service, 'manager') else 'local_transformer')
             
             return JsonResponse({
                 'success': True,
@@ -519,3 +681,49 @@ def load_translation_service(request):
             'success': False,
             'error': f'Error loading translation service: {str(e)}'
         }, status=500)
+
+@require_http_methods(["GET"])
+def readiness(request):
+    """
+    Report whether translation requests can be served without waiting for a model load.
+
+    Returns 200 once a translation service is loaded and 503 while the
+    warm-up is still loading, with per-service progress either way.
+    """
+    try:
+        from .translation_service import translation_service
+
+        readiness = translation_service.get_readiness()
+        return JsonResponse(readiness, status=200 if readiness['ready'] else 503)
+
+    except Exception as e:
+        return JsonResponse({
+            'ready': False,
+            'error': f'Error checking readiness: {str(e)}'
+        }, status=500)
+
+@require_http_methods(["GET"])
+def get_translation_stats(request):
+    """Get translation cache, request coalescing, bypass and routing counters."""
+    try:
+        from .translation_service import translation_service
+
+        if not hasattr(translation_service, 'get_cache_stats'):
+            return JsonResponse({
+                'success': True,
+                'cache': {'enabled': False}
+            })
+
+        return JsonResponse({
+            'success': True,
+            'cache': translation_service.get_cache_stats(),
+            'coalescing': translation_service.get_coalescing_stats(),
+            'bypass': translation_service.get_bypass_stats(),
+            'routing': translation_service.get_routing_stats()
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'Error getting translation stats: {str(e)}'
+        }, status=500)
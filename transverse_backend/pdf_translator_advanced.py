@@ -5,12 +5,23 @@ Based on PyMuPDF best practices from GitHub discussions.
 """
 
 import fitz  # PyMuPDF
+import sys
 from pathlib import Path
 import uuid
 import html
 import time
 import logging
 
+# Add the translator services path to Python path
+translator_path = Path(__file__).parent.parent / "translator"
+if str(translator_path) not in sys.path:
+    sys.path.insert(0, str(translator_path))
+
+from services.bypass import is_pathological_page, segment_bypass
+from services.chunking import TokenBudgetChunker, estimate_tokens
+from services.segments import join_with_markers, split_by_markers
+from services.translation_cache import normalize_text
+
 # Set up logging for debug output
 logging.basicConfig(
     level=logging.DEBUG,
@@ -24,20 +35,53 @@ class AdvancedPdfTranslator:
     def __init__(self):
         self.temp_dir = Path(__file__).parent.parent / "uploads" / "temp"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # Groups blocks from all pages into requests that fit the output token limit
+        self.chunker = TokenBudgetChunker()
     
     def translate_pdf_with_redaction(self, file_path, page_numbers, target_language, translation_service):
         """
         Translate PDF using redaction approach for better format preservation.
         This method follows PyMuPDF best practices.
         """
+        result = self.translate_pdf_to_languages(file_path, page_numbers, [target_language], translation_service)
+        if not result['success']:
+            return result
+        output = result['outputs'][0]
+        return {
+            'success': True,
+            'output_path': output['output_path'],
+            'filename': output['filename'],
+            'translated_pages': result['translated_pages']
+        }
+
+    def translate_pdf_to_languages(self, file_path, page_numbers, target_languages, translation_service):
+        """
+        Translate PDF pages into several languages in one job.
+
+        The document is opened and its text blocks extracted once; the
+        translations for all languages are requested together, and one
+        output PDF is written per language.
+
+        Args:
+            file_path (str): Source PDF
+            page_numbers (list or None): 1-based pages to translate; None for all
+            target_languages (list): Target languages
+            translation_service: Service with translate_batch_multi(), translate_batch() or translate()
+
+        Returns:
+            dict: 'success', 'translated_pages' and 'outputs' - one
+            {'target_language', 'output_path', 'filename'} per language
+        """
         try:
+            target_languages = list(dict.fromkeys(target_languages))
             logger.info("=== STARTING PDF TRANSLATION ===")
             logger.info(f"📁 Input file: {Path(file_path).name}")
-            logger.info(f"🌐 Target language: {target_language}")
+            logger.info(f"🌐 Target languages: {', '.join(target_languages)}")
             logger.info(f"🔧 Translation service: {getattr(translation_service, 'service_name', 'Unknown')}")
 
             # Open original document
-            doc = fitz.open(file_path)
+            source = Path(file_path).read_bytes()
+            doc = fitz.open("pdf", source)
             total_pages = len(doc)
             logger.info(f"📄 Total pages in document: {total_pages}")
 
@@ -47,148 +91,68 @@ class AdvancedPdfTranslator:
             else:
                 logger.info(f"📄 Processing selected pages: {page_numbers}")
 
-            # Process each specified page
+            # Pass 1: extract text blocks from every selected page, once for all languages.
+            # Text already in the target language can only be recognised up front for a single target;
+            # with several, the service copies it through per language and the block is left untouched.
+            bypass_language = target_languages[0] if len(target_languages) == 1 else None
+            page_jobs = []
             for page_idx in page_numbers:
                 if page_idx < 1 or page_idx > len(doc):
                     logger.warning(f"⚠️ Skipping invalid page {page_idx} (out of range 1-{len(doc)})")
                     continue
 
-                logger.info(f"📄 STARTING PAGE {page_idx}")
-                page_start_time = time.time()
-
                 page = doc[page_idx - 1]  # Convert to 0-based
                 page_size = f"{page.rect.width:.1f}x{page.rect.height:.1f}"
                 logger.info(f"📄 Page {page_idx} dimensions: {page_size}")
 
-                # Extract text with detailed formatting information
-                logger.info(f"📄 Page {page_idx}: Extracting text blocks...")
-                text_dict = page.get_text("dict")
-                total_blocks = len(text_dict.get("blocks", []))
-                logger.info(f"📄 Page {page_idx}: Found {total_blocks} blocks in document")
-
-                # Collect text blocks for translation
-                translation_blocks = []
-
-                for block in text_dict.get("blocks", []):
-                    if "lines" in block:  # Text block
-                        block_info = self._extract_block_info(block)
-                        if block_info and block_info['text'].strip():
-                            translation_blocks.append(block_info)
-
-                logger.info(f"📄 Page {page_idx}: Found {len(translation_blocks)} text blocks to translate")
-
-                # Batch translate all text blocks in one API call
-                logger.info(f"📄 Page {page_idx}: Batch translating {len(translation_blocks)} blocks in one request...")
-
-                if translation_blocks:
-                    try:
-                        # Combine all text blocks with markers to identify them
-                        combined_text = ""
-                        block_markers = []
-
-                        for block_idx, block_info in enumerate(translation_blocks, 1):
-                            block_marker = f"__BLOCK_{block_idx}__"
-                            combined_text += f"{block_marker}\n{block_info['text']}\n\n"
-                            block_markers.append(block_marker)
-
-                        logger.info(f"📄 Page {page_idx}: Combined text length: {len(combined_text)} characters")
-
-                        # Make single API call for entire page
-                        page_translate_start = time.time()
-                        translated_combined = translation_service.translate(
-                            combined_text,
-                            target_language
-                        )
-                        translate_time = time.time() - page_translate_start
-
-                        if not translated_combined or translated_combined.strip() == "":
-                            logger.warning(f"📄 Page {page_idx}: Empty translation received, using original texts")
-                            # Use original texts as fallback
-                            for block_info in translation_blocks:
-                                block_info['translated_text'] = block_info['text']
-                        else:
-                            logger.info(f"📄 Page {page_idx}: Batch translation completed ({len(translated_combined)} chars) in {translate_time:.2f}s")
-
-                            # Split the translated text back using markers
-                            translated_blocks = self._split_translated_text(translated_combined, block_markers)
-
-                            # Assign translated text to each block
-                            for i, block_info in enumerate(translation_blocks):
-                                if i < len(translated_blocks) and translated_blocks[i].strip():
-                                    block_info['translated_text'] = translated_blocks[i].strip()
-                                    logger.debug(f"📄 Page {page_idx}, Block {i+1}: Assigned translated text ({len(block_info['translated_text'])} chars)")
-                                else:
-                                    logger.warning(f"📄 Page {page_idx}, Block {i+1}: No translated text found, using original")
-                                    block_info['translated_text'] = block_info['text']
-
-                    except Exception as e:
-                        logger.error(f"📄 Page {page_idx}: Batch translation error: {str(e)}")
-                        # Fallback to original texts
-                        for block_info in translation_blocks:
-                            block_info['translated_text'] = block_info['text']
-
-                # Add redaction annotations for all blocks
-                logger.info(f"📄 Page {page_idx}: Adding {len(translation_blocks)} redaction annotations...")
-                for block_idx, block_info in enumerate(translation_blocks, 1):
-                    try:
-                        page.add_redact_annot(
-                            block_info['bbox'],
-                            text="",  # Remove text
-                            fill=(1, 1, 1)  # White fill
-                        )
-                        logger.debug(f"📄 Page {page_idx}, Block {block_idx}: Redaction annotation added")
-                    except Exception as e:
-                        logger.error(f"📄 Page {page_idx}, Block {block_idx}: Error adding redaction: {str(e)}")
-
-                # Apply all redactions
-                logger.info(f"📄 Page {page_idx}: Applying {len(translation_blocks)} redaction annotations...")
-                page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
-                logger.info(f"📄 Page {page_idx}: Redactions applied successfully")
-
-                # Insert translated text using HTML for better Unicode support
-                logger.info(f"📄 Page {page_idx}: Inserting {len(translation_blocks)} translated text blocks...")
-                successful_insertions = 0
-                for block_idx, block_info in enumerate(translation_blocks, 1):
-                    if 'translated_text' in block_info:
-                        try:
-                            success = self._insert_translated_text(page, block_info)
-                            if success:
-                                successful_insertions += 1
-                                logger.debug(f"📄 Page {page_idx}, Block {block_idx}: Text insertion successful")
-                            else:
-                                logger.warning(f"📄 Page {page_idx}, Block {block_idx}: Text insertion failed")
-                        except Exception as e:
-                            logger.error(f"📄 Page {page_idx}, Block {block_idx}: Text insertion error: {str(e)}")
-
-                logger.info(f"📄 Page {page_idx}: Text insertion completed ({successful_insertions}/{len(translation_blocks)} successful)")
-
-                # Calculate page processing time
-                page_time = time.time() - page_start_time
-                logger.info(f"📄 PAGE {page_idx} COMPLETED in {page_time:.2f}s")
-
-            # Save the translated document
-            logger.info("💾 Saving translated document...")
-            output_filename = f"translated_{uuid.uuid4().hex[:8]}.pdf"
-            output_path = self.temp_dir / output_filename
-
-            # Save with optimal settings
-            doc.save(
-                str(output_path),
-                garbage=4,  # Maximum garbage collection
-                clean=True,  # Clean content streams
-                deflate=True,  # Compress streams
-                ascii=False  # Allow Unicode
-            )
-            doc.close()
+                translation_blocks = self._collect_translation_blocks(page, page_idx, bypass_language)
+                page_jobs.append({
+                    'page_idx': page_idx,
+                    'blocks': translation_blocks,
+                })
+
+            # Pass 2: translate all blocks into every language, concurrently when the service supports it
+            translations = self._translate_page_jobs(page_jobs, target_languages, translation_service)
+
+            # Pass 3: per language, redact the source text and insert the translations
+            outputs = []
+            for lang_idx, target_language in enumerate(target_languages):
+                # The last language reuses the already open document; the others get a fresh copy
+                target_doc = doc if lang_idx == len(target_languages) - 1 else fitz.open("pdf", source)
+                for job in page_jobs:
+                    page_start_time = time.time()
+                    blocks = translations[target_language].get(job['page_idx'], [])
+                    self._render_page(target_doc[job['page_idx'] - 1], job['page_idx'], blocks)
+                    page_time = time.time() - page_start_time
+                    logger.info(f"📄 PAGE {job['page_idx']} ({target_language}) RENDERED in {page_time:.2f}s")
+
+                # Save the translated document
+                logger.info(f"💾 Saving {target_language} document...")
+                output_filename = f"translated_{uuid.uuid4().hex[:8]}.pdf"
+                output_path = self.temp_dir / output_filename
+
+                # Save with optimal settings
+                target_doc.save(
+                    str(output_path),
+                    garbage=4,  # Maximum garbage collection
+                    clean=True,  # Clean content streams
+                    deflate=True,  # Compress streams
+                    ascii=False  # Allow Unicode
+                )
+                target_doc.close()
+                logger.info(f"💾 Output file ({target_language}): {output_filename}")
+                outputs.append({
+                    'target_language': target_language,
+                    'output_path': str(output_path),
+                    'filename': output_filename,
+                })
 
             logger.info("✅ PDF TRANSLATION COMPLETED SUCCESSFULLY")
             logger.info(f"📄 Total pages processed: {len(page_numbers)}")
-            logger.info(f"💾 Output file: {output_filename}")
 
             return {
                 'success': True,
-                'output_path': str(output_path),
-                'filename': output_filename,
+                'outputs': outputs,
                 'translated_pages': len(page_numbers)
             }
 
@@ -196,6 +160,171 @@ class AdvancedPdfTranslator:
             logger.error(f"❌ PDF TRANSLATION FAILED: {str(e)}")
             return {'success': False, 'error': f'Advanced PDF translation error: {str(e)}'}
     
+    def _collect_translation_blocks(self, page, page_idx, target_language):
+        """
+        Extract the text blocks of a page that need translation, with their formatting.
+
+        Blocks that need no translation (page numbers, figures, URLs, code, text
+        already in the target language, ...) are left untouched on the page, as
+        are pages made of thousands of tiny spans such as maps and diagrams.
+        """
+        logger.info(f"📄 Page {page_idx}: Extracting text blocks...")
+        text_dict = page.get_text("dict")
+        total_blocks = len(text_dict.get("blocks", []))
+        logger.info(f"📄 Page {page_idx}: Found {total_blocks} blocks in document")
+
+        spans = [
+            span["text"]
+            for block in text_dict.get("blocks", []) if "lines" in block
+            for line in block["lines"]
+            for span in line["spans"] if span["text"].strip()
+        ]
+        char_count = sum(len(text) for text in spans)
+        if is_pathological_page(len(spans), char_count):
+            segment_bypass.record_skipped_page(char_count)
+            logger.info(f"⏭️ Page {page_idx}: {len(spans)} spans averaging {char_count / len(spans):.1f} chars - looks like a map or diagram, leaving it untranslated")
+            return []
+
+        translation_blocks = []
+        bypassed = 0
+        saved_tokens = 0
+        for block in text_dict.get("blocks", []):
+            if "lines" in block:  # Text block
+                block_info = self._extract_block_info(block)
+                if block_info and block_info['text'].strip():
+                    if segment_bypass.check(block_info['text'], target_language):
+                        bypassed += 1
+                        saved_tokens += estimate_tokens(block_info['text'])
+                        continue
+                    translation_blocks.append(block_info)
+
+        if bypassed:
+            logger.info(f"⏭️ Page {page_idx}: {bypassed} blocks need no translation (~{saved_tokens} tokens saved)")
+        logger.info(f"📄 Page {page_idx}: Found {len(translation_blocks)} text blocks to translate")
+        return translation_blocks
+
+    def _translate_page_jobs(self, page_jobs, target_languages, translation_service):
+        """
+        Translate the blocks of every page into each target language.
+
+        Returns:
+            dict: Target language -> {page_idx: blocks to render, each with 'translated_text'}
+        """
+        entries = [
+            (job['page_idx'], block_idx, block_info)
+            for job in page_jobs
+            for block_idx, block_info in enumerate(job['blocks'], 1)
+        ]
+        results = {language: {} for language in target_languages}
+        if not entries:
+            return results
+
+        # Running headers, footers and repeated labels are translated once and
+        # applied to every occurrence
+        occurrences = {}
+        for entry in entries:
+            occurrences.setdefault(normalize_text(entry[2]['text']), []).append(entry)
+        unique = list(occurrences.values())
+        unique_texts = [group[0][2]['text'] for group in unique]
+
+        if len(unique) < len(entries):
+            saved_tokens = sum(
+                estimate_tokens(group[0][2]['text']) * (len(group) - 1) for group in unique
+            )
+            logger.info(f"🔁 {len(entries) - len(unique)} repeated blocks deduplicated (~{saved_tokens} tokens saved)")
+
+        logger.info(f"🌐 Translating {len(unique)} unique of {len(entries)} blocks from {len(page_jobs)} pages "
+                    f"into {len(target_languages)} languages...")
+        translate_start = time.time()
+
+        # Errors that survive the service's retries fail the whole job rather than
+        # leaving untranslated or error text in the output PDF
+        if hasattr(translation_service, 'translate_batch_multi'):
+            # All languages in flight together; the service packs blocks into as few requests as it can
+            translated = translation_service.translate_batch_multi(unique_texts, target_languages)
+        else:
+            translated = {
+                language: self._translate_texts(unique_texts, language, translation_service)
+                for language in target_languages
+            }
+
+        logger.info(f"🌐 Translated {len(unique)} blocks in {time.time() - translate_start:.2f}s")
+
+        # Reassemble in document order, copying each translation to every occurrence
+        for language in target_languages:
+            for group, text in zip(unique, translated[language]):
+                self._assign_translations(group, text, results[language])
+        return results
+
+    def _translate_texts(self, texts, target_language, translation_service):
+        """Translate unique block texts into one language with whatever the service offers."""
+        if hasattr(translation_service, 'translate_batch'):
+            # The service packs blocks into as few requests as its token budget allows
+            return translation_service.translate_batch(texts, target_language)
+
+        # Split on block boundaries: large pages span several requests, small pages share one
+        chunks = self.chunker.plan(texts)
+        groups = [[texts[i] for i in chunk] for chunk in chunks]
+        joined_texts = [join_with_markers(group) for group in groups]
+        if hasattr(translation_service, 'translate_many'):
+            joined = translation_service.translate_many(joined_texts, target_language)
+        else:
+            joined = [translation_service.translate(text, target_language) for text in joined_texts]
+        translated = [""] * len(texts)
+        for chunk, text in zip(chunks, joined):
+            for unique_idx, segment in zip(chunk, split_by_markers(text or "", len(chunk))):
+                translated[unique_idx] = segment
+        return translated
+
+    def _assign_translations(self, occurrences, translated, pages):
+        """Add one translated segment to every block that shares its source text."""
+        for page_idx, block_idx, block_info in occurrences:
+            if not translated or not translated.strip() or translated.startswith("Translation failed"):
+                logger.warning(f"📄 Page {page_idx}, Block {block_idx}: No translated text found, leaving original")
+                continue
+            if translated.strip() == block_info['text'].strip():
+                # Copied through unchanged (e.g. already in the target language): leave it on the page
+                continue
+            pages.setdefault(page_idx, []).append(dict(block_info, translated_text=translated.strip()))
+            logger.debug(f"📄 Page {page_idx}, Block {block_idx}: Assigned translated text ({len(translated.strip())} chars)")
+
+    def _render_page(self, page, page_idx, translation_blocks):
+        """Redact the original blocks of a page and insert their translations."""
+        # Add redaction annotations for all blocks
+        logger.info(f"📄 Page {page_idx}: Adding {len(translation_blocks)} redaction annotations...")
+        for block_idx, block_info in enumerate(translation_blocks, 1):
+            try:
+                page.add_redact_annot(
+                    block_info['bbox'],
+                    text="",  # Remove text
+                    fill=(1, 1, 1)  # White fill
+                )
+                logger.debug(f"📄 Page {page_idx}, Block {block_idx}: Redaction annotation added")
+            except Exception as e:
+                logger.error(f"📄 Page {page_idx}, Block {block_idx}: Error adding redaction: {str(e)}")
+
+        # Apply all redactions
+        logger.info(f"📄 Page {page_idx}: Applying {len(translation_blocks)} redaction annotations...")
+        page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+        logger.info(f"📄 Page {page_idx}: Redactions applied successfully")
+
+        # Insert translated text using HTML for better Unicode support
+        logger.info(f"📄 Page {page_idx}: Inserting {len(translation_blocks)} translated text blocks...")
+        successful_insertions = 0
+        for block_idx, block_info in enumerate(translation_blocks, 1):
+            if 'translated_text' in block_info:
+                try:
+                    success = self._insert_translated_text(page, block_info)
+                    if success:
+                        successful_insertions += 1
+                        logger.debug(f"📄 Page {page_idx}, Block {block_idx}: Text insertion successful")
+                    else:
+                        logger.warning(f"📄 Page {page_idx}, Block {block_idx}: Text insertion failed")
+                except Exception as e:
+                    logger.error(f"📄 Page {page_idx}, Block {block_idx}: Text insertion error: {str(e)}")
+
+        logger.info(f"📄 Page {page_idx}: Text insertion completed ({successful_insertions}/{len(translation_blocks)} successful)")
+
     def _extract_block_info(self, block):
         """Extract comprehensive information from a text block."""
         block_text = []
@@ -245,35 +374,6 @@ class AdvancedPdfTranslator:
             'is_italic': bool(avg_flags & 2**6)
         }
     
-    def _split_translated_text(self, translated_text, block_markers):
-        """Split translated text back into individual blocks using markers."""
-        translated_blocks = []
-        current_text = translated_text
-
-        for marker in block_markers:
-            if marker in current_text:
-                # Split at the marker
-                parts = current_text.split(marker, 1)
-                if len(parts) > 1:
-                    # Everything before the marker is the previous block's text
-                    if parts[0].strip():
-                        translated_blocks.append(parts[0].strip())
-                    # Continue with the rest
-                    current_text = parts[1]
-                else:
-                    # Marker not found, add empty text
-                    translated_blocks.append("")
-            else:
-                # Marker not found, add empty text
-                translated_blocks.append("")
-
-        # Add any remaining text after the last marker
-        if current_text.strip():
-            translated_blocks.append(current_text.strip())
-
-        logger.debug(f"Split {len(translated_blocks)} blocks from translated text")
-        return translated_blocks
-
     def _insert_translated_text(self, page, block_info):
         """Insert translated text with proper formatting."""
         translated_text = block_info['translated_text']
@@ -6,6 +6,7 @@ Uses the new modular translation service architecture.
 
 import os
 import sys
+import threading
 from pathlib import Path
 
 # Add the translator services path to Python path
@@ -18,25 +19,75 @@ try:
     
     # Backwards compatibility interface
     class TranslationService:
-        def __init__(self):
+        def __init__(self, service_name=None):
             self.manager = translation_manager
-            
+            # Backend this instance asks for first; None leaves the choice to the router
+            self.service_name = service_name
+
+        def for_request(self, service_name=None):
+            """
+            Get a translation service bound to one request's backend choice.
+
+            The choice travels with each call instead of changing the shared
+            manager, so concurrent requests cannot switch each other's backend.
+
+            Args:
+                service_name (str, optional): Backend to try first
+
+            Returns:
+                TranslationService: A view sharing this instance's manager
+            """
+            return TranslationService(service_name or self.service_name)
+
+        def _service(self, service_name):
+            return service_name or self.service_name
+
         @property
         def model_loaded(self):
             """Check if any translation service is loaded."""
             current_service = self.manager.get_current_service()
             return current_service is not None and current_service.is_loaded
             
-        def load_model(self):
-            """Load the current translation service."""
-            return self.manager.load_service()
+        def load_model(self, service_name=None):
+            """Load the requested translation service, or every available one."""
+            return self.manager.load_service(self._service(service_name))
             
-        def translate(self, text, target_language):
-            """Translate text using the current service."""
-            return self.manager.translate(text, target_language)
+        def translate(self, text, target_language, service_name=None):
+            """Translate text, trying the requested service first."""
+            return self.manager.translate(text, target_language, self._service(service_name))
+
+        def translate_stream(self, text, target_language, service_name=None):
+            """Stream a translation, trying the requested service first."""
+            return self.manager.translate_stream(text, target_language, self._service(service_name))
+
+        async def translate_async(self, text, target_language, service_name=None):
+            """Translate text asynchronously, trying the requested service first."""
+            return await self.manager.translate_async(text, target_language, self._service(service_name))
+
+        def translate_many(self, texts, target_language, max_concurrency=None, service_name=None):
+            """Translate several independent texts concurrently, preserving order."""
+            return self.manager.translate_many(
+                texts, target_language, self._service(service_name), max_concurrency=max_concurrency
+            )
+
+        def translate_segment_groups(self, groups, target_language, service_name=None):
+            """Translate groups of segments concurrently, one request per group."""
+            return self.manager.translate_segment_groups(groups, target_language, self._service(service_name))
+
+        def translate_batch(self, segments, target_language, service_name=None):
+            """Translate a list of segments in as few requests as possible, preserving order."""
+            return self.manager.translate_batch(segments, target_language, self._service(service_name))
+
+        def translate_batch_multi(self, segments, target_languages, service_name=None):
+            """Translate the same segments into several languages concurrently."""
+            return self.manager.translate_batch_multi(segments, target_languages, self._service(service_name))
+
+        def has_service(self, service_name):
+            """Check that a service is registered and available."""
+            return service_name in self.manager.get_available_services()
         
         def set_service(self, service_name):
-            """Set the active translation service."""
+            """Set the process-wide default service (admin use only; requests pass service_name instead)."""
             return self.manager.set_service(service_name)
         
         def get_available_services(self):
@@ -49,6 +100,30 @@ try:
                 return self.manager.get_service_info(service_name)
             else:
                 return self.manager.get_all_services_info()
+
+        def get_cache_stats(self):
+            """Get translation cache hit/miss counters."""
+            return self.manager.get_cache_stats()
+
+        def get_coalescing_stats(self):
+            """Get counters of backend calls shared by identical concurrent requests."""
+            return self.manager.get_coalescing_stats()
+
+        def get_bypass_stats(self):
+            """Get counters of segments copied through without translation."""
+            return self.manager.get_bypass_stats()
+
+        def get_routing_stats(self):
+            """Get per-backend latency, error and cool-down statistics."""
+            return self.manager.get_routing_stats()
+
+        def start_warmup(self, service_names=None):
+            """Load services (by default the primary one) in the background instead of on the first request."""
+            return self.manager.start_warmup(service_names)
+
+        def get_readiness(self):
+            """Get whether requests can be served yet, with per-service load progress."""
+            return self.manager.get_readiness()
     
     # Create global instance
     translation_service = TranslationService()
@@ -59,13 +134,18 @@ except ImportError as e:
     
     # Fallback to the legacy implementation if new services aren't available
     import torch
-    import shutil
     
     class LegacyTranslationService:
         def __init__(self):
             self.model = None
             self.tokenizer = None
+            self.generator = None
             self.model_loaded = False
+            # Concurrent first requests wait for one load instead of each starting their own
+            self._load_lock = threading.Lock()
+            self._warmup_thread = None
+            self.load_stage = None
+            self.load_error = None
             self.model_name = "JungZoona/T3Q-qwen2.5-14b-v1.0-e3"
             self.local_model_path = Path(__file__).parent.parent / "translator" / "models" / self.model_name.replace("/", "_")
             
@@ -97,8 +177,43 @@ except ImportError as e:
             
             return cache_paths
         
-        def copy_model_from_cache(self):
-            """Copy model from cache to local model folder if available."""
+        @staticmethod
+        def link_tree(source, target):
+            """
+            Hardlink every file under source into target, symlinking where a hardlink is not possible.
+
+            Files already in target are left alone. No file contents are copied.
+
+            Returns:
+                int: Number of files linked
+            """
+            linked = 0
+            for item in source.iterdir():
+                destination = target / item.name
+                if item.is_dir():
+                    destination.mkdir(exist_ok=True)
+                    linked += LegacyTranslationService.link_tree(item, destination)
+                    continue
+                if destination.exists() or destination.is_symlink():
+                    continue
+                # Snapshot entries are symlinks into the cache's blobs/ folder; link the blob itself
+                blob = item.resolve()
+                try:
+                    os.link(blob, destination)
+                except OSError:
+                    # Cache on another filesystem, or hardlinks not permitted
+                    destination.symlink_to(blob)
+                linked += 1
+            return linked
+
+        def link_model_from_cache(self):
+            """
+            Make the cached model available in the local model folder without copying it.
+
+            Snapshot files are hardlinked (or symlinked) into the folder, so the
+            weights are stored on disk once. Memory is not shared: the 4-bit
+            load quantizes into a private copy in every process.
+            """
             cache_paths = self.get_cache_paths()
             
             if not cache_paths:
@@ -117,35 +232,34 @@ except ImportError as e:
                         print(f"Model already exists locally at: {self.local_model_path}")
                         return True
                     
-                    # Copy model files from cache
-                    print(f"Copying model from cache to: {self.local_model_path}")
-                    
-                    # Copy all files from cache to local path
-                    for item in cache_path.iterdir():
-                        if item.is_file():
-                            shutil.copy2(item, self.local_model_path / item.name)
-                            print(f"Copied: {item.name}")
-                        elif item.is_dir():
-                            shutil.copytree(item, self.local_model_path / item.name, dirs_exist_ok=True)
-                            print(f"Copied directory: {item.name}")
+                    print(f"Linking model from cache into: {self.local_model_path}")
+                    linked = self.link_tree(cache_path, self.local_model_path)
+                    print(f"Linked {linked} file(s)")
                     
-                    # Verify the copy was successful
-                    print(f"Verifying copied model at: {self.local_model_path}")
+                    # Verify the links are complete
+                    print(f"Verifying linked model at: {self.local_model_path}")
                     if self.is_model_complete(self.local_model_path):
-                        print("✓ Model successfully copied from cache!")
+                        print("✓ Model successfully linked from cache!")
                         return True
                     else:
-                        print("⚠ Copied model appears incomplete")
+                        print("⚠ Linked model appears incomplete")
                         # List what files we actually have
                         actual_files = [f.name for f in self.local_model_path.iterdir() if f.is_file()]
                         print(f"Actual files in local model dir: {actual_files}")
                         return False
                         
                 except Exception as e:
-                    print(f"Error copying from cache {cache_path}: {str(e)}")
+                    print(f"Error linking from cache {cache_path}: {str(e)}")
                     continue
                     
             return False
+
+        def find_cached_snapshot(self):
+            """Get a complete cache snapshot to load in place, or None."""
+            for cache_path in self.get_cache_paths():
+                if self.is_model_complete(cache_path):
+                    return cache_path
+            return None
         
         def is_model_complete(self, model_path):
             """Check if model files are complete in the given path."""
@@ -215,10 +329,19 @@ except ImportError as e:
             """Load the translation model with priority: local models folder -> cache -> download."""
             if self.model_loaded:
                 return
-                
+
+            with self._load_lock:
+                # Another caller may have finished loading while this one waited
+                if self.model_loaded:
+                    return
+                self._load_model()
+
+        def _load_model(self):
             try:
                 print("Loading translation model...")
                 from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+                self.load_stage = "locating model files"
+                self.load_error = None
                 
                 # Priority 1: Check local models folder first
                 model_path_to_use = self.model_name
@@ -229,10 +352,13 @@ except ImportError as e:
                 else:
                     print(f"✗ No complete model found in local folder: {self.local_model_path}")
                     
-                    # Priority 2: Check cache and copy if available
-                    if self.copy_model_from_cache():
-                        print(f"✓ Successfully copied model from cache to: {self.local_model_path}")
+                    # Priority 2: Check cache and link it into the local folder, or load it in place
+                    if self.link_model_from_cache():
+                        print(f"✓ Successfully linked model from cache to: {self.local_model_path}")
                         model_path_to_use = str(self.local_model_path)
+                    elif (cached_snapshot := self.find_cached_snapshot()) is not None:
+                        print(f"✓ Loading cached model in place: {cached_snapshot}")
+                        model_path_to_use = str(cached_snapshot)
                     else:
                         print("✗ No cached model found")
                         # Priority 3: Download from HuggingFace (will cache automatically)
@@ -248,10 +374,12 @@ except ImportError as e:
                 )
                 
                 # Load tokenizer
+                self.load_stage = "loading tokenizer"
                 print(f"Loading tokenizer from: {model_path_to_use}")
                 self.tokenizer = AutoTokenizer.from_pretrained(model_path_to_use, trust_remote_code=True)
                 
                 # Load model with aggressive optimizations
+                self.load_stage = "loading weights"
                 print(f"Loading model from: {model_path_to_use}")
                 self.model = AutoModelForCausalLM.from_pretrained(
                     model_path_to_use,
@@ -262,20 +390,64 @@ except ImportError as e:
                     low_cpu_mem_usage=True,
                 )
                 
-                # If we downloaded the model, copy it to local folder for future use
+                # If we downloaded the model, link it into the local folder for future use
                 if model_path_to_use == self.model_name:
-                    print("Attempting to copy newly downloaded model to local folder...")
-                    if self.copy_model_from_cache():
-                        print(f"✓ Model cached locally for faster future loading: {self.local_model_path}")
+                    print("Attempting to link newly downloaded model into local folder...")
+                    if self.link_model_from_cache():
+                        print(f"✓ Model linked locally for faster future loading: {self.local_model_path}")
                     else:
                         print("⚠ Could not cache model locally (this is not an error)")
                 
+                # Concurrent requests are grouped into padded batches
+                from services.local_model import BatchedGenerator
+                # Each request gets a budget sized from its input, up to the 8192-token limit
+                self.generator = BatchedGenerator(self.model, self.tokenizer, max_new_tokens=8192)
+                
                 self.model_loaded = True
                 print("✓ Translation model loaded successfully!")
                 
             except Exception as e:
                 print(f"✗ Error loading model: {str(e)}")
+                self.load_error = str(e)
                 raise e
+            finally:
+                self.load_stage = None
+
+        def start_warmup(self, service_names=None):
+            """Load the model on a background thread instead of on the first request."""
+            with self._load_lock:
+                if self._warmup_thread is not None or self.model_loaded:
+                    return False
+                self._warmup_thread = threading.Thread(target=self._warmup, name="translation-warmup", daemon=True)
+                self._warmup_thread.start()
+                return True
+
+        def _warmup(self):
+            try:
+                self.load_model()
+            except Exception:
+                pass  # Recorded in load_error; the next request tries again
+
+        def get_readiness(self):
+            """Get whether requests can be served yet, with load progress."""
+            if self.model_loaded:
+                state = 'ready'
+            elif self.load_stage is not None:
+                state = 'loading'
+            elif self.load_error is not None:
+                state = 'failed'
+            else:
+                state = 'pending'
+            return {
+                'ready': self.model_loaded,
+                'warmup': {
+                    'started': self._warmup_thread is not None,
+                    'finished': self._warmup_thread is not None and not self._warmup_thread.is_alive(),
+                    'backends': {
+                        'legacy': {'state': state, 'stage': self.load_stage, 'error': self.load_error},
+                    },
+                },
+            }
         
         def translate(self, text, target_language):
             """
@@ -292,45 +464,8 @@ except ImportError as e:
                 self.load_model()
             
             try:
-                # Create prompt with the specific format you requested
-                prompt = f'Only output the translated words. Translate "{text}" to {target_language}'
-                
-                messages = [{"role": "user", "content": prompt}]
-                
-                # Apply chat template
-                inputs = self.tokenizer.apply_chat_template(
-                    messages,
-                    add_generation_prompt=True,
-                    tokenize=True,
-                    return_dict=True,
-                    return_tensors="pt",
-                ).to(self.model.device)
-                
-                # Generate with optimized settings
-                with torch.no_grad():
-                    outputs = self.model.generate(
-                        **inputs,
-                        max_new_tokens=8192,  # Max token length for longer translations
-                        do_sample=False,
-                        temperature=0.1,
-                        pad_token_id=self.tokenizer.eos_token_id,
-                        use_cache=True,
-                    )
-                
-                # Decode only the new tokens
-                generated_text = self.tokenizer.decode(
-                    outputs[0][inputs["input_ids"].shape[-1]:], 
-                    skip_special_tokens=True
-                )
-                
-                # Clean up the output - only return the translated text
-                translated_text = generated_text.strip()
-                
-                # Remove any extra explanations or formatting
-                if translated_text.startswith('"') and translated_text.endswith('"'):
-                    translated_text = translated_text[1:-1]
-                
-                return translated_text
+                # Shares a generate() call with requests arriving in the same batching window
+                return self.generator.translate(text, target_language)
                 
             except Exception as e:
                 print(f"Translation error: {str(e)}")
@@ -339,5 +474,16 @@ except ImportError as e:
     # Create legacy instance
     translation_service = LegacyTranslationService()
 
-# Note: Services are loaded on-demand when first requested
-# This prevents unnecessary model loading on server startup
+
+def start_warmup():
+    """
+    Start loading translation services in the background (server start-up).
+
+    Only the backend the router tries first is loaded, unless
+    TRANSLATION_WARMUP_SERVICES names a comma-separated list;
+    TRANSLATION_WARMUP=0 leaves every service to load on first use.
+    """
+    if os.environ.get('TRANSLATION_WARMUP', '1') == '0':
+        return False
+    names = [name.strip() for name in os.environ.get('TRANSLATION_WARMUP_SERVICES', '').split(',') if name.strip()]
+    return translation_service.start_warmup(names or None)
@@ -6,8 +6,7 @@ from django.contrib import admin
 from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
-from .file_upload_views import upload_file, translate_pdf_pages, translate_text, download_translated_pdf
+from .file_upload_views import upload_file, translate_pdf_pages, translate_text, download_translated_pdf, get_translation_services, get_translation_stats, readiness
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,7 +14,9 @@ urlpatterns = [
     path('api/translate-pdf/', translate_pdf_pages, name='translate_pdf'),
     path('api/translate/', translate_text, name='translate_text'),
     path('api/download-pdf/<str:filename>', download_translated_pdf, name='download_pdf'),
-    path('api/translation-services/', lambda request: JsonResponse({'services': ['gemini']}), name='translation_services'),
+    path('api/translation-services/', get_translation_services, name='translation_services'),
+    path('api/translation-stats/', get_translation_stats, name='translation_stats'),
+    path('api/ready', readiness, name='ready'),
 ]
 
 # Serve static files in development
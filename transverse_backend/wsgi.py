@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'transverse_backend.settings')
 
 application = get_wsgi_application()
+
+# Load translation models in the background so the first request does not wait for them
+from .translation_service import start_warmup  # noqa: E402
+
+start_warmup()